@@ -0,0 +1,84 @@
+# bench_driver_pool.py
+# 상세 페이지 처리량(items/min): 매번 Chrome 새로 실행 vs DriverPool 재사용
+# 로컬 HTTP 서버가 Uiverse 상세 페이지 비슷한 HTML(HTML/CSS textarea)을 돌려줌 → 네트워크 영향 없이 브라우저 비용만 비교
+# 사용법: python bench_driver_pool.py --items 60 --workers 6 --max-uses 50
+# (Chrome 필요. chromedriver 는 driver_pool.chromedriver_path() 로 한 번만 설치)
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from selenium.webdriver.common.by import By
+
+from button_crwal import make_driver, use_driver
+from driver_pool import DriverPool, chromedriver_path
+
+PAGE = """<!DOCTYPE html><html><head><title>{slug}</title></head><body>
+<div class="card__nickname">@bench</div>
+<textarea id="codeArea2" class="npm__react-simple-code-editor__textarea">&lt;button class="btn"&gt;Hi&lt;/button&gt;</textarea>
+<textarea id="codeArea1" class="npm__react-simple-code-editor__textarea">.btn {{ color: red; }}</textarea>
+</body></html>"""
+
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = PAGE.format(slug=self.path.strip("/")).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def visit(url, pool):
+    with use_driver(pool, headless=True) as d:
+        d.get(url)
+        return d.find_element(By.ID, "codeArea1").get_attribute("value")
+
+
+def run(urls, workers, pool):
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        ok = sum(1 for v in ex.map(lambda u: visit(u, pool), urls) if v)
+    return ok, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=60)
+    ap.add_argument("--workers", type=int, default=6)
+    ap.add_argument("--max-uses", type=int, default=50)
+    args = ap.parse_args()
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{srv.server_port}/bench/item-{i}" for i in range(args.items)]
+
+    chromedriver_path()  # 설치 시간은 양쪽 모두에서 제외
+
+    ok_fresh, fresh_s = run(urls, args.workers, None)
+
+    pool = DriverPool(lambda: make_driver(headless=True), size=args.workers, max_uses=args.max_uses, name="bench")
+    t0 = time.perf_counter()
+    pool.start()
+    warm_s = time.perf_counter() - t0
+    ok_pool, pool_s = run(urls, args.workers, pool)
+    pool.close()
+
+    print(f"📏 items={args.items} workers={args.workers} max_uses={args.max_uses}")
+    print(f"{'mode':>8} | {'ok':>4} | {'seconds':>8} | {'items/min':>9}")
+    print(f"{'fresh':>8} | {ok_fresh:>4} | {fresh_s:>8.2f} | {ok_fresh / fresh_s * 60:>9.1f}")
+    print(f"{'pool':>8} | {ok_pool:>4} | {pool_s:>8.2f} | {ok_pool / pool_s * 60:>9.1f}"
+          f"  (+ 사전 실행 {warm_s:.2f}s)")
+    print(f"🚀 speedup x{fresh_s / pool_s:.1f}")
+    pool.report()
+    srv.shutdown()
+
+
+if __name__ == "__main__":
+    main()
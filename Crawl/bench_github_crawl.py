@@ -0,0 +1,156 @@
+# bench_github_crawl.py
+# 로컬 mock GitHub 서버로 순차 크롤러(github_get) vs async 엔진(github_client) 비교
+# 실제 GitHub/DB 는 안 씀. 순차 쪽은 run() 의 고정 sleep(0.4/0.8) 을 뺀 순수 요청 시간만 잼.
+# 사용법: python bench_github_crawl.py --repos 40 --files 12 --latency-ms 40
+#   (ARCHIVE_MIN_FILES=5 로 주면 tarball 모드까지 같이 비교)
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import tarfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CSS_BODY = ".box{animation:spin 2s linear infinite}@keyframes spin{to{transform:rotate(1turn)}}\n" * 20
+
+
+def make_tarball(files_per_repo):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for i in range(files_per_repo):
+            data = CSS_BODY.encode()
+            info = tarfile.TarInfo(f"bench-repo-abc123/styles/art_{i}.css")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def make_handler(latency, files_per_repo):
+    tarball = make_tarball(files_per_repo)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        remaining = [5000]
+        lock = threading.Lock()
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body, content_type="application/json"):
+            data = body.encode() if isinstance(body, str) else body
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            with self.lock:
+                self.remaining[0] = max(0, self.remaining[0] - 1)
+                rem = self.remaining[0]
+            self.send_header("X-RateLimit-Remaining", str(rem))
+            self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            time.sleep(latency)
+            parts = [p for p in self.path.split("?")[0].split("/") if p]
+            # raw: /{owner}/{repo}/{branch}/{path...}
+            if self.server.role == "raw":
+                return self._send(200, CSS_BODY, "text/plain")
+            # api: /repos/{o}/{r}[/branches/{b} | /git/trees/{b} | /tarball/{b}]
+            if len(parts) == 3 and parts[0] == "repos":
+                return self._send(200, json.dumps({"default_branch": "main"}))
+            if len(parts) == 5 and parts[3] == "branches":
+                return self._send(200 if parts[4] == "main" else 404, "{}")
+            if len(parts) == 6 and parts[3] == "git" and parts[4] == "trees":
+                tree = [{"path": f"styles/art_{i}.css", "type": "blob"} for i in range(files_per_repo)]
+                tree.append({"path": "README.md", "type": "blob"})
+                return self._send(200, json.dumps({"tree": tree}))
+            if len(parts) == 5 and parts[3] == "tarball":
+                return self._send(200, tarball, "application/x-gzip")
+            return self._send(404, "{}")
+
+    return Handler
+
+
+class MockServer(ThreadingHTTPServer):
+    request_queue_size = 256  # 기본 5 면 동시 접속 시 SYN 재전송(1s) 때문에 async 쪽이 불리해짐
+    daemon_threads = True
+
+
+def start_server(role, handler):
+    srv = MockServer(("127.0.0.1", 0), handler)
+    srv.role = role
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repos", type=int, default=40)
+    ap.add_argument("--files", type=int, default=12)
+    ap.add_argument("--latency-ms", type=float, default=40)
+    ap.add_argument("--probe", action="store_true", help="검색 메타데이터 없이 브랜치 probing (예전 경로)")
+    args = ap.parse_args()
+
+    handler = make_handler(args.latency_ms / 1000.0, args.files)
+    api = start_server("api", handler)
+    raw = start_server("raw", handler)
+
+    # git_api / github_client 가 import 시점에 읽는 값들
+    os.environ["GITHUB_API_BASE"] = f"http://127.0.0.1:{api.server_port}"
+    os.environ["GITHUB_RAW_BASE"] = f"http://127.0.0.1:{raw.server_port}"
+    os.environ.setdefault("GITHUB_TOKEN", "bench")
+    os.environ.setdefault("PG_DSN", "dbname=bench")
+    os.environ["GITHUB_CACHE_PATH"] = ""  # 순수 요청 속도 비교 → 디스크 캐시 끔
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import git_api
+    from github_client import AsyncGitHubClient
+
+    repos = [("bench", f"repo{i}") for i in range(args.repos)]
+    default_branch = None if args.probe else "main"  # 검색 응답의 default_branch
+    lookup = 3 if args.probe else 1  # repo info + branches probe + tree  vs  tree 만
+    per_repo = lookup + (1 if args.files >= git_api.ARCHIVE_MIN_FILES else args.files)
+    expected_requests = args.repos * per_repo
+    print(f"📏 repos={args.repos} files/repo={args.files} latency={args.latency_ms}ms "
+          f"(레포당 요청 {per_repo}회, 총 {expected_requests}회)")
+
+    # --- 순차 (github_get) ---
+    t0 = time.perf_counter()
+    sync_files = 0
+    for owner, name in repos:
+        branch, _, tree = git_api.resolve_branch_and_tree(owner, name, default_branch)
+        for path, code in git_api.fetch_repo_files(owner, name, branch, tree):
+            if git_api.is_artistic(code):
+                sync_files += 1
+    sync_s = time.perf_counter() - t0
+
+    # --- async 엔진 ---
+    async def run_async():
+        sem = asyncio.Semaphore(git_api.REPO_CONCURRENCY)
+        async with AsyncGitHubClient("bench") as gh:
+            async def one(owner, name):
+                async with sem:
+                    _, files = await git_api.crawl_repo_async(gh, owner, name, default_branch)
+                    return len(files)
+            counts = await asyncio.gather(*(one(o, n) for o, n in repos))
+            return sum(counts), gh.stats()
+
+    t0 = time.perf_counter()
+    async_files, st = asyncio.run(run_async())
+    async_s = time.perf_counter() - t0
+
+    print(f"{'mode':>8} | {'files':>6} | {'seconds':>8} | {'req/s':>8}")
+    print(f"{'sync':>8} | {sync_files:>6} | {sync_s:>8.2f} | {expected_requests / sync_s:>8.1f}")
+    print(f"{'async':>8} | {async_files:>6} | {async_s:>8.2f} | {st['requests'] / async_s:>8.1f}")
+    print(f"🚀 speedup x{sync_s / async_s:.1f} (REPO_CONCURRENCY={git_api.REPO_CONCURRENCY})")
+    print(f"📦 다운로드 모드: tarball {git_api.FETCH_MODES['archive']} · 파일별 {git_api.FETCH_MODES['per_file']}")
+
+    api.shutdown()
+    raw.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# bench_keyword_match.py
+# is_artistic / is_pure_ui 필터: 기존 (파일 전체 lower() 복사 + 키워드마다 `in`)
+#   vs 정규식 하나 (re.I, 한 번에 훑기) vs KeywordMatcher (청크 단위 소문자화 + 조기 종료)
+# 합성 CSS 코퍼스: 작은 손글씨 CSS 다수 + 수 MB 짜리 minified 번들 (키워드 없음 = 최악 / 끝에 있음 / 앞에 있음)
+# 사용법: python bench_keyword_match.py --bundle-mb 4 --files 2000 --repeat 5
+
+import argparse
+import random
+import re
+import time
+from collections import Counter
+
+from keyword_match import KeywordMatcher
+
+ART_KEYWORDS = [
+    "@keyframes", "clip-path", "gradient", "filter", "shadow",
+    "transform", "translate", "rotate", "scale", "mask",
+    "skew", "animation", "perspective"
+]
+FORBIDDEN_TERMS = ["tailwind", "bootstrap", "react", "vue", "svelte", "<script", "@apply"]
+
+PLAIN_PROPS = ["color", "margin", "padding", "display", "width", "height", "border", "font-size", "top", "left"]
+
+
+def plain_rule(rng):
+    sel = "." + "".join(rng.choice("abcdefghijklmnop") for _ in range(rng.randint(3, 10)))
+    body = ";".join(f"{rng.choice(PLAIN_PROPS)}:{rng.randint(0, 999)}px" for _ in range(rng.randint(2, 6)))
+    return f"{sel}{{{body}}}"
+
+
+def bundle(rng, mb, keyword_at=None):
+    parts, size = [], 0
+    while size < mb * 1024 * 1024:
+        r = plain_rule(rng)
+        parts.append(r)
+        size += len(r)
+    css = "".join(parts)
+    if keyword_at == "start":
+        css = ".hero{background:linear-gradient(red,blue)}" + css
+    elif keyword_at == "end":
+        css += ".spin{animation:spin 1s linear infinite}"
+    return css
+
+
+def small_file(rng):
+    rules = [plain_rule(rng) for _ in range(rng.randint(5, 40))]
+    if rng.random() < 0.5:
+        rules.append(".card{box-shadow:0 2px 4px #0003;transform:translateY(-2px)}")
+    return "\n".join(rules).upper() if rng.random() < 0.1 else "\n".join(rules)
+
+
+# --- 기존 구현 ---
+def old_any(text, keywords):
+    lower = text.lower()
+    return any(k in lower for k in keywords)
+
+
+def old_counts(text, keywords):
+    lower = text.lower()
+    return {k: lower.count(k) for k in keywords if k in lower}
+
+
+def regex_for(keywords):
+    return re.compile("|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)), re.IGNORECASE)
+
+
+def timeit(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--bundle-mb", type=float, default=4)
+    ap.add_argument("--files", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    rng = random.Random(7)
+    art = KeywordMatcher(ART_KEYWORDS)
+    forbidden = KeywordMatcher(FORBIDDEN_TERMS)
+    art_re, forbidden_re = regex_for(ART_KEYWORDS), regex_for(FORBIDDEN_TERMS)
+    corpora = {
+        "bundle/no-keyword": [bundle(rng, args.bundle_mb)],
+        "bundle/keyword-end": [bundle(rng, args.bundle_mb, "end")],
+        "bundle/keyword-start": [bundle(rng, args.bundle_mb, "start")],
+        f"{args.files} small files": [small_file(rng) for _ in range(args.files)],
+    }
+
+    print(f"{'corpus':>24} | {'check':>16} | {'old ms':>9} | {'regex ms':>9} | {'new ms':>9} | {'x old':>6}")
+    for name, texts in corpora.items():
+        mb = sum(map(len, texts)) / 1024 / 1024
+        checks = [
+            ("is_artistic", lambda t: old_any(t, ART_KEYWORDS), lambda t: art_re.search(t) is not None,
+             lambda t: art.search(t) is not None),
+            ("is_pure_ui", lambda t: not old_any(t, FORBIDDEN_TERMS), lambda t: forbidden_re.search(t) is None,
+             lambda t: forbidden.search(t) is None),
+            ("keyword counts", lambda t: old_counts(t, ART_KEYWORDS),
+             lambda t: dict(Counter(m.lower() for m in art_re.findall(t))), lambda t: dict(art.counts(t))),
+        ]
+        for label, old_fn, re_fn, new_fn in checks:
+            old_s, old_out = timeit(lambda: [old_fn(t) for t in texts], args.repeat)
+            re_s, _ = timeit(lambda: [re_fn(t) for t in texts], args.repeat)
+            new_s, new_out = timeit(lambda: [new_fn(t) for t in texts], args.repeat)
+            assert old_out == new_out, f"{name}/{label}: 결과 불일치"
+            print(f"{name:>24} | {label:>16} | {old_s * 1000:>9.1f} | {re_s * 1000:>9.1f} | {new_s * 1000:>9.1f}"
+                  f" | {old_s / new_s:>6.1f}")
+        print(f"{'':>24}   ({mb:.1f} MB)")
+
+    # 스트리밍: 64KB 청크로 읽으면서 첫 매치에서 종료
+    text = corpora["bundle/keyword-start"][0]
+    chunks = lambda: (text[i:i + 65536] for i in range(0, len(text), 65536))
+    s, found = timeit(lambda: art.search_chunks(chunks()), args.repeat)
+    print(f"🌊 stream (keyword-start, 64KB chunks): {s * 1000:.2f} ms → {found}")
+    assert art.counts_chunks(chunks()) == art.counts(text), "청크 경계 카운트 불일치"
+
+
+if __name__ == "__main__":
+    main()
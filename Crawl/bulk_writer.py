@@ -0,0 +1,175 @@
+# bulk_writer.py
+# 크롤러 공용 버퍼 writer: 행을 모았다가 multi-row VALUES / COPY 한 번으로 insert
+# - max_rows 개 모이거나 max_seconds 지나면 flush (flush = insert + conn.commit)
+# - ON CONFLICT 가 필요하면 multi-row VALUES, 아니면 COPY
+# - 배치가 실패하면 SAVEPOINT 로 되돌리고 한 행씩 다시 넣어서 문제 행만 버림
+#   (같은 트랜잭션의 다른 문장 — 예: crawl_state upsert — 은 그대로 같이 commit)
+# - flush 마다 지연시간 기록 → report() 에 avg/p95/max
+# - on_flush: commit 직후 호출 (예: 유사 중복 서명을 방금 commit 된 행 기준으로 같이 저장)
+# - on_failed(cur, rows): 한 행씩 재시도에서도 버려진 행, commit 전에 같은 트랜잭션에서 호출
+#   (예: crawl_state 에서 그 파일의 blob SHA 를 빼서 다음 실행에 다시 받게)
+# psycopg2 / psycopg(3) 커넥션 모두 사용 가능, add() 는 여러 스레드에서 호출해도 됨
+
+import io
+import threading
+import time
+
+SAVEPOINT = "bulk_writer_sp"
+
+
+def _copy_field(value) -> str:
+    # COPY ... (FORMAT csv): 따옴표 없는 빈 칸 = NULL, "" = 빈 문자열
+    if value is None:
+        return ""
+    if isinstance(value, (int, float)):
+        return str(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+class BulkWriter:
+    """
+    writer = BulkWriter(conn, "css_art_tbl", ("art_name", "art_css", ...), on_conflict="ON CONFLICT DO NOTHING")
+    writer.add((name, css, ...))      # 버퍼에 추가, 임계치 넘으면 자동 flush
+    writer.maybe_flush()              # 시간 임계치만 확인 (add 없이 다른 문장만 실행한 경우)
+    writer.close()                    # 남은 행 flush
+    """
+
+    def __init__(self, conn, table, columns, *, on_conflict=None, max_rows=500, max_seconds=2.0,
+                 lock=None, name=None, verbose=False, on_flush=None, on_failed=None):
+        self.conn = conn
+        self.table = table
+        self.columns = tuple(columns)
+        self.on_conflict = on_conflict
+        self.max_rows = max_rows
+        self.max_seconds = max_seconds
+        self.name = name or table
+        self.verbose = verbose
+        self.on_flush = on_flush
+        self.on_failed = on_failed
+        # 같은 커넥션을 다른 코드와 공유하면 그쪽 lock 을 넘겨받음 (재진입 가능해야 함)
+        self._lock = lock or threading.RLock()
+        self._rows = []
+        self._last_flush = time.perf_counter()
+
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.flushes = 0
+        self.latencies_ms = []
+
+    @property
+    def method(self) -> str:
+        return "values" if self.on_conflict else "copy"
+
+    def add(self, row):
+        with self._lock:
+            self._rows.append(tuple(row))
+            if len(self._rows) >= self.max_rows or self._due():
+                self.flush()
+
+    def maybe_flush(self):
+        with self._lock:
+            if self._due():
+                self.flush()
+
+    def _due(self) -> bool:
+        return time.perf_counter() - self._last_flush >= self.max_seconds
+
+    def flush(self) -> int:
+        """버퍼를 DB 에 쓰고 commit. 반환: 이번에 들어간 행 수"""
+        with self._lock:
+            rows, self._rows = self._rows, []
+            started = time.perf_counter()
+            failed = []
+            with self.conn.cursor() as cur:
+                if rows:
+                    cur.execute(f"SAVEPOINT {SAVEPOINT};")
+                    try:
+                        if self.method == "copy":
+                            self._copy(cur, rows)
+                        else:
+                            self._insert_values(cur, rows)
+                    except Exception as e:
+                        cur.execute(f"ROLLBACK TO SAVEPOINT {SAVEPOINT};")
+                        print(f"⚠️ [{self.name}] 배치 insert 실패 ({len(rows)}행) → 한 행씩 재시도: {e}")
+                        failed = self._insert_one_by_one(cur, rows)
+                    cur.execute(f"RELEASE SAVEPOINT {SAVEPOINT};")
+                if failed and self.on_failed is not None:
+                    self.on_failed(cur, failed)
+            self.conn.commit()
+            written = len(rows) - len(failed)
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._last_flush = time.perf_counter()
+            if rows:
+                self.flushes += 1
+                self.rows_written += written
+                self.rows_failed += len(rows) - written
+                self.latencies_ms.append(elapsed_ms)
+                if self.verbose:
+                    print(f"🧱 [{self.name}] flush {written}/{len(rows)}행 ({self.method}) {elapsed_ms:.1f}ms")
+            if self.on_flush is not None:
+                self.on_flush()
+            return written
+
+    def _column_list(self) -> str:
+        return ", ".join(self.columns)
+
+    def _insert_values(self, cur, rows):
+        one = "(" + ", ".join(["%s"] * len(self.columns)) + ")"
+        sql = (f"INSERT INTO {self.table} ({self._column_list()}) VALUES "
+               + ", ".join([one] * len(rows))
+               + (f" {self.on_conflict}" if self.on_conflict else ""))
+        cur.execute(sql, [v for row in rows for v in row])
+
+    def _copy(self, cur, rows):
+        sql = f"COPY {self.table} ({self._column_list()}) FROM STDIN"
+        if hasattr(cur, "copy_expert"):  # psycopg2: CSV 로 직렬화해서 한 번에
+            buf = io.StringIO()
+            for row in rows:
+                buf.write(",".join(_copy_field(v) for v in row))
+                buf.write("\n")
+            buf.seek(0)
+            cur.copy_expert(sql + " WITH (FORMAT csv)", buf)
+        else:  # psycopg 3: 드라이버가 행 단위로 직렬화
+            with cur.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+
+    def _insert_one_by_one(self, cur, rows) -> list:
+        """반환: 버린 행"""
+        failed = []
+        for row in rows:
+            cur.execute(f"SAVEPOINT {SAVEPOINT}_row;")
+            try:
+                self._insert_values(cur, [row])
+                cur.execute(f"RELEASE SAVEPOINT {SAVEPOINT}_row;")
+            except Exception as e:
+                cur.execute(f"ROLLBACK TO SAVEPOINT {SAVEPOINT}_row;")
+                failed.append(row)
+                print(f"❌ [{self.name}] insert 실패, 행 스킵: {e}")
+        return failed
+
+    def close(self):
+        self.flush()
+
+    def stats(self) -> dict:
+        lat = sorted(self.latencies_ms)
+        return {
+            "method": self.method,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "rows_failed": self.rows_failed,
+            "pending": len(self._rows),
+            "avg_rows_per_flush": round(self.rows_written / self.flushes, 1) if self.flushes else 0.0,
+            "flush_avg_ms": round(sum(lat) / len(lat), 1) if lat else 0.0,
+            "flush_p95_ms": round(lat[min(len(lat) - 1, int(len(lat) * 0.95))], 1) if lat else 0.0,
+            "flush_max_ms": round(lat[-1], 1) if lat else 0.0,
+        }
+
+    def report(self):
+        st = self.stats()
+        print(
+            f"🧱 [{self.name}] {st['method']} flush {st['flushes']}회 · 저장 {st['rows_written']}행"
+            f" (실패 {st['rows_failed']}) · 평균 {st['avg_rows_per_flush']}행/flush"
+            f" · 지연 avg {st['flush_avg_ms']}ms / p95 {st['flush_p95_ms']}ms / max {st['flush_max_ms']}ms"
+        )
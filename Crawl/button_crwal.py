@@ -1,13 +1,17 @@
 # mini_crawl_uiverse_buttons_to_db.py
 # Author DOM 추출 + tqdm 진행률 + logging 요약 출력 + DB insert (근본 해결 적용)
+# 목록 → 상세 추출 → 합본 → DB 를 bounded queue 로 잇는 단계별 파이프라인
 # pip install tqdm selenium webdriver-manager psycopg[binary]
 
 import re
 import time
 import html as htmlmod
 import logging
-from typing import List, Tuple, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from queue import Empty, Queue
+from threading import Thread
+from typing import List, Optional
 
 from tqdm import tqdm
 import psycopg
@@ -15,12 +19,19 @@ from psycopg.rows import dict_row
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
+from bulk_writer import BulkWriter
+from dedupe import UrlIndex
+from near_dupe import NearDupIndex
+from preview_builder import build_preview, ensure_preview_columns
+from driver_pool import DriverPool, chromedriver_path
+from pipeline import STOP, ProgressMonitor, Stage
+from uiverse_http import ModeStats, fetch_component, fetch_list_links
+
 # ===================== 로깅 설정 =====================
 logging.basicConfig(
     level=logging.INFO,
@@ -38,6 +49,14 @@ HEADLESS_LIST   = False   # 목록(윈도우 뜸)
 HEADLESS_DETAIL = True    # 상세(윈도우 안 뜸)
 
 MAX_WORKERS   = 6
+DRIVER_MAX_USES = 50      # 드라이버 하나로 이만큼 페이지 처리 후 재시작
+
+# 브라우저 없이 HTTP 로 먼저 시도 → 실패할 때만 Selenium
+HTTP_FIRST_DETAIL = True
+# 목록은 스크롤 지연 로딩이라 SSR 에 전부 실렸는지 확인 전까지 기본 off
+# (켜면 LIST_MIN_LINKS 이상 찾았을 때만 HTTP 결과 사용)
+HTTP_FIRST_LIST = False
+LIST_MIN_LINKS = 12
 SCROLL_STEPS  = 18
 SCROLL_DY     = 1800
 SCROLL_PAUSE  = 0.35
@@ -73,7 +92,7 @@ def make_driver(headless: bool = True):
     opt.add_experimental_option("useAutomationExtension", False)
     opt.add_argument("--disable-blink-features=AutomationControlled")
 
-    driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=opt)
+    driver = webdriver.Chrome(service=ChromeService(chromedriver_path()), options=opt)
     driver.set_page_load_timeout(60)
     driver.implicitly_wait(2)
     try:
@@ -84,6 +103,19 @@ def make_driver(headless: bool = True):
         pass
     return driver
 
+@contextmanager
+def use_driver(pool: Optional[DriverPool], headless: bool):
+    """풀이 있으면 빌려 쓰고(반납 시 초기화), 없으면 예전처럼 새로 띄웠다가 종료"""
+    if pool is not None:
+        with pool.lease() as d:
+            yield d
+        return
+    d = make_driver(headless=headless)
+    try:
+        yield d
+    finally:
+        d.quit()
+
 def slug(url: str) -> str:
     return re.sub(r"[^A-Za-z0-9_-]+", "-", url.strip("/").split("/")[-1]).strip("-").lower() or "component"
 
@@ -122,10 +154,29 @@ def _clean_piece(s: str) -> str:
     s = s.replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
     return s.strip()
 
+# 추출 모드별 성공률/소요시간 (http / selenium)
+MODE_STATS = ModeStats()
+LIST_STATS = ModeStats()
+
 # ===================== 목록: 링크 수집 =====================
-def collect_links(page_num: int) -> List[str]:
-    d = make_driver(headless=HEADLESS_LIST)
-    try:
+def collect_links(page_num: int, pool: Optional[DriverPool] = None) -> List[str]:
+    if HTTP_FIRST_LIST:
+        with LIST_STATS.timed("http") as t:
+            try:
+                links = fetch_list_links(LIST_URL.format(page=page_num), PAT, BASE)
+            except Exception as e:
+                log.debug("  list http error: %s", e)
+                links = []
+            t.ok = len(links) >= LIST_MIN_LINKS
+        if t.ok:
+            return links
+    with LIST_STATS.timed("selenium") as t:
+        links = _collect_links_selenium(page_num, pool)
+        t.ok = bool(links)
+    return links
+
+def _collect_links_selenium(page_num: int, pool: Optional[DriverPool]) -> List[str]:
+    with use_driver(pool, HEADLESS_LIST) as d:
         d.get(LIST_URL.format(page=page_num))
 
         # 메인 도착 대기
@@ -184,8 +235,6 @@ def collect_links(page_num: int) -> List[str]:
                     links.add(BASE + rel)
 
         return sorted(links)
-    finally:
-        d.quit()
 
 # ===================== 상세: 탭 활성화 → 패널 범위에서 코드 읽기 =====================
 def _click_tab_and_get_panel(d, tab_key: str, wait: WebDriverWait):
@@ -301,12 +350,63 @@ def _extract_author_dom_first(d) -> Optional[str]:
             pass
     return None
 
-def read_codes(detail_url: str) -> Tuple[str, str, str, str]:
+@dataclass(slots=True)
+class DetailResult:
+    """상세 페이지 추출 결과. 원 URL 을 같이 들고 다니므로 slug → URL 역매핑 불필요"""
+    source_url: str
+    slug: str
+    html: str
+    css: str
+    author: str
+    mode: str = ""  # 추출 경로 (http / selenium)
+
+    @property
+    def has_code(self) -> bool:
+        return bool(self.html or self.css)
+
+    @property
+    def name(self) -> str:
+        return humanize_slug(self.slug)
+
+def _finalize_codes(detail_url: str, html_raw: str, css: str, author: Optional[str], mode: str) -> DetailResult:
+    # ========= (A) 1차 정리: 엔티티/이스케이프 정리 + CSS-only 판별 보정 =========
+    html = _clean_piece(html_raw or "")
+    css  = _clean_piece(css or "")
+
+    # HTML 탭이 사실상 CSS 텍스트였던 경우 → CSS로 합치고 HTML 비우기
+    if _looks_css_only(html):
+        css = f"{html}\n{css}".strip()
+        html = ""
+
+    return DetailResult(detail_url, slug(detail_url), html, css,
+                        author or parse_author_from_url(detail_url) or "", mode)
+
+def read_codes(detail_url: str, pool: Optional[DriverPool] = None) -> DetailResult:
     """
-    returns: (slug, html, css, author)
+    returns: DetailResult (source_url, slug, html, css, author, mode)
+    pool: 상세용 DriverPool (없으면 호출마다 Chrome 새로 실행)
+    HTTP(SSR HTML/JSON) 로 먼저 시도하고 코드가 없을 때만 브라우저 사용
     """
-    d = make_driver(headless=HEADLESS_DETAIL)
-    try:
+    if HTTP_FIRST_DETAIL:
+        with MODE_STATS.timed("http") as t:
+            try:
+                found = fetch_component(detail_url)
+            except Exception as e:
+                log.debug("  http extract error: %s -> %s", detail_url, e)
+                found = None
+            if found:
+                result = _finalize_codes(detail_url, *found, mode="http")
+                t.ok = result.has_code
+        if t.ok:
+            return result
+
+    with MODE_STATS.timed("selenium") as t:
+        result = _read_codes_selenium(detail_url, pool)
+        t.ok = result.has_code
+    return result
+
+def _read_codes_selenium(detail_url: str, pool: Optional[DriverPool]) -> DetailResult:
+    with use_driver(pool, HEADLESS_DETAIL) as d:
         d.get(detail_url)
         wait = WebDriverWait(d, 15)
         time.sleep(0.6)
@@ -359,18 +459,7 @@ def read_codes(detail_url: str) -> Tuple[str, str, str, str]:
                     if html_raw and css:
                         break
 
-        # ========= (A) 1차 정리: 엔티티/이스케이프 정리 + CSS-only 판별 보정 =========
-        html = _clean_piece(html_raw or "")
-        css  = _clean_piece(css or "")
-
-        # HTML 탭이 사실상 CSS 텍스트였던 경우 → CSS로 합치고 HTML 비우기
-        if _looks_css_only(html):
-            css = f"{html}\n{css}".strip()
-            html = ""
-
-        return slug(detail_url), html, css, (author or "")
-    finally:
-        d.quit()
+        return _finalize_codes(detail_url, html_raw, css, author, mode="selenium")
 
 # ===================== 합본 빌더(강화판) =====================
 DOCT_RE = re.compile(r"<!doctype", re.I)
@@ -436,113 +525,195 @@ html, body {{ margin:0; padding:16px; }}
 </html>"""
 
 # ===================== DB 저장 =====================
-def insert_component(cur, *, name: str, description: Optional[str], preview_html: Optional[str],
+COMPONENT_COLUMNS = (
+    "components_name", "components_description", "components_preview_html",
+    "components_code", "components_library", "components_source_url",
+    "components_author", "components_category", "components_needs_tailwind", "components_is_button",
+)
+
+def insert_component(writer: BulkWriter, *, name: str, description: Optional[str], preview_html: Optional[str],
                      combined_code: str, library: str, source_url: str,
-                     author: Optional[str], category: str):
-    sql = f"""
-    INSERT INTO {TABLE}
-      (components_name, components_description, components_preview_html,
-       components_code, components_library, components_source_url,
-       components_author, components_category)
-    VALUES (%(name)s, %(desc)s, %(preview)s, %(code)s, %(lib)s, %(src)s, %(author)s, %(cat)s)
-    """
-    cur.execute(sql, {
-        "name": name,
-        "desc": description,
-        "preview": preview_html,     # 정책상 NULL 저장
-        "code": combined_code,       # 완전 HTML 합본
-        "lib": library,
-        "src": source_url,
-        "author": author,
-        "cat": category,
-    })
-
-# ===================== 실행 루프 (수집 → 파싱 → DB) =====================
-def crawl_to_db(p_from=1, stop_after_two_empty=True, max_workers=MAX_WORKERS):
+                     author: Optional[str], category: str, needs_tailwind: bool = False,
+                     is_button: bool = False):
+    # 버퍼에 추가 → 페이지 끝(또는 임계치)에서 COPY 로 일괄 저장
+    writer.add((
+        name,
+        description,
+        preview_html,     # 미리 만든 iframe 문서 (preview_builder)
+        combined_code,    # 완전 HTML 합본
+        library,
+        source_url,
+        author,
+        category,
+        needs_tailwind,
+        is_button,        # 카드 목록 필터 (preview_builder.looks_like_button)
+    ))
+
+# ===================== 실행 파이프라인 (목록 → 상세 추출 → 합본 → DB) =====================
+# 단계마다 스레드 + bounded queue → 다음 목록 페이지가 느린 상세 페이지를 기다리지 않음
+QUEUE_SIZE = 64            # 단계 사이 큐 크기 (앞 단계가 너무 앞서가면 여기서 대기)
+PROGRESS_EVERY = 5.0       # 진행 상황(큐 깊이/처리량) 갱신 주기(초)
+
+def _list_stage(p_from, stop_after_two_empty, list_pool, dedupe, out_q, stage, n_consumers):
+    """목록 페이지를 넘기며 처음 보는(DB 에도 없는) 상세 URL 을 out_q 로. 끝나면 STOP 을 소비자 수만큼"""
     page = p_from
     empty_streak = 0
-    total_saved = 0
-
-    with psycopg.connect(**PG_DSN, row_factory=dict_row) as conn:
-        conn.autocommit = False
-
+    try:
         while True:
-            log.info("🌍 page %s", page)
-            links = collect_links(page)
-            log.info("  links: %d", len(links))
-
+            try:
+                links = collect_links(page, list_pool)
+            except Exception as e:
+                log.error("  ⚠️ list error (page %s): %s", page, e)
+                links = []
+            log.info("🌍 page %s links: %d", page, len(links))
             if not links:
                 empty_streak += 1
                 if stop_after_two_empty and empty_streak >= 2:
                     break
                 page += 1
                 continue
-
             empty_streak = 0
-            page_ok = page_skip = page_err = 0
-
-            # 상세 파싱은 병렬, DB는 메인 스레드에서 순차 커밋
-            with ThreadPoolExecutor(max_workers=max_workers) as ex:
-                futures = [ex.submit(read_codes, u) for u in links]
-                with tqdm(total=len(links), desc=f"page {page} details", unit="item") as pbar:
-                    for fut in as_completed(futures):
-                        try:
-                            slug_, html, css, author = fut.result()
-                        except Exception as e:
-                            log.error("  ⚠️ detail error: %s", e)
-                            page_err += 1
-                            pbar.update(1)
-                            continue
-
-                        if not (html or css):
-                            log.warning("  ⚠️ skip(no code): %s", slug_)
-                            page_skip += 1
-                            pbar.update(1)
-                            continue
-
-                        # slug만으로는 원 URL을 정확히 역매핑하기 어려움 → best-effort
-                        source_url = ""
-                        for u in links:
-                            if slug(u) == slug_:
-                                source_url = u
-                                break
-
-                        name = humanize_slug(slug_)
-                        library = "universe"   # 기존 데이터와 호환 위해 유지
-                        category = CATEGORY
-                        description = None
-
-                        # ★ HTML+CSS 합본(완전 문서) — 강화판 빌더 사용
-                        combined_doc = build_combined_document(html or "", css or "")
-
-                        try:
-                            with conn.cursor() as cur:
-                                insert_component(
-                                    cur,
-                                    name=name,
-                                    description=description,
-                                    preview_html=None,          # ← NULL
-                                    combined_code=combined_doc, # ← 합본을 code에
-                                    library=library,
-                                    source_url=source_url,
-                                    author=(author or None),
-                                    category=category,
-                                )
-                            conn.commit()
-                            total_saved += 1
-                            page_ok += 1
-                            log.info("  ✅ inserted: %s (author: %s)", name, author or "unknown")
-                        except Exception as e:
-                            conn.rollback()
-                            page_err += 1
-                            log.error("  ❌ insert failed: %s -> %s", name, e)
-
-                        pbar.update(1)
-
-            log.info("page %s summary -> ok:%d skip:%d err:%d", page, page_ok, page_skip, page_err)
+            for u in links:
+                if dedupe.claim(u):
+                    out_q.put(u)
+            stage.tick()
             page += 1
+    finally:
+        for _ in range(n_consumers):
+            out_q.put(STOP)
+
+def _extract_stage(detail_pool, dedupe, in_q, out_q, stage):
+    """상세 URL → DetailResult"""
+    while True:
+        url = in_q.get()
+        if url is STOP:
+            out_q.put(STOP)
+            return
+        try:
+            out_q.put(read_codes(url, detail_pool))
+            stage.tick()
+        except Exception as e:
+            log.error("  ⚠️ detail error: %s -> %s", url, e)
+            dedupe.discard(url)
+            stage.tick(ok=False)
+
+def _combine_stage(dedupe, near, in_q, out_q, stage, n_producers):
+    """코드 → DB 행 (HTML+CSS 합본 문서). 코드 없는 항목 / 유사 중복은 skip 으로 집계"""
+    remaining = n_producers
+    try:
+        while remaining:
+            res = in_q.get()
+            if res is STOP:
+                remaining -= 1
+                continue
+            try:
+                if not res.has_code:
+                    log.warning("  ⚠️ skip(no code): %s", res.source_url)
+                    dedupe.discard(res.source_url)
+                    stage.tick(ok=False)
+                    continue
+                combined = build_combined_document(res.html, res.css)
+                preview = build_preview(combined)  # 렌더링마다 프론트에서 다시 만들지 않도록 저장 시점에 한 번
+                # 유사 중복 등록은 마지막에 (앞에서 실패하면 시그니처가 남지 않게)
+                # 서명은 컴포넌트 원본으로 — 합본은 모든 행이 같은 doctype/head/reset 을 가져서
+                # 짧은 버튼끼리는 boilerplate shingle 만으로 threshold 에 가까워짐
+                dup = near.claim(res.source_url, res.html + "\n" + res.css)
+                if dup is not None:
+                    log.info("  ♻️ skip(near-duplicate): %s ≈ %s", res.source_url, dup)
+                    stage.tick(ok=False)
+                    continue
+            except Exception as e:
+                log.error("  ⚠️ combine error: %s -> %s", res.source_url, e)
+                dedupe.discard(res.source_url)
+                stage.tick(ok=False)
+                continue
+            out_q.put(dict(
+                name=res.name,
+                description=None,
+                preview_html=preview.html,
+                needs_tailwind=preview.needs_tailwind,
+                is_button=preview.is_button,
+                combined_code=combined, # ★ 합본을 code에
+                library="universe",   # 기존 데이터와 호환 위해 유지
+                source_url=res.source_url,
+                author=(res.author or None),
+                category=CATEGORY,
+            ))
+            stage.tick()
+    finally:
+        # 예외로 빠져나가도 쓰기 루프가 끝날 수 있게
+        out_q.put(STOP)
 
-    log.info("🎉 done. total inserted: %d", total_saved)
+def crawl_to_db(p_from=1, stop_after_two_empty=True, max_workers=MAX_WORKERS):
+    # 목록용 1개(창 보임) + 상세용 max_workers 개(headless) 를 미리 띄워두고 재사용
+    list_pool = DriverPool(lambda: make_driver(headless=HEADLESS_LIST), size=1,
+                           max_uses=DRIVER_MAX_USES, name="uiverse-list")
+    detail_pool = DriverPool(lambda: make_driver(headless=HEADLESS_DETAIL), size=max_workers,
+                             max_uses=DRIVER_MAX_USES, name="uiverse-detail")
+    if not HTTP_FIRST_DETAIL:
+        detail_pool.start()  # HTTP 경로가 먼저면 폴백이 필요할 때만 띄움 (lease 시 지연 생성)
+
+    url_q, code_q, row_q = Queue(QUEUE_SIZE), Queue(QUEUE_SIZE), Queue(QUEUE_SIZE)
+    st_list = Stage("list(pages)")
+    st_extract = Stage("extract", url_q)
+    st_combine = Stage("combine", code_q)
+    st_write = Stage("write", row_q)
+
+    with psycopg.connect(**PG_DSN, row_factory=dict_row) as conn:
+        conn.autocommit = False
+        ensure_preview_columns(conn)
+        writer = BulkWriter(conn, TABLE, COMPONENT_COLUMNS, max_rows=100, max_seconds=30, name="uiverse")
+        # 이미 저장된 source URL → 목록 단계에서 바로 스킵 (상세 페이지를 열지 않음)
+        dedupe = UrlIndex.from_db(conn, "components")
+        near = NearDupIndex.load(conn, "components").follow(writer)  # Tailwind 크롤러와 공유, 행 flush 때 서명도 저장
+
+        threads = [Thread(target=_list_stage, daemon=True,
+                          args=(p_from, stop_after_two_empty, list_pool, dedupe, url_q, st_list, max_workers))]
+        threads += [Thread(target=_extract_stage, daemon=True,
+                           args=(detail_pool, dedupe, url_q, code_q, st_extract))
+                    for _ in range(max_workers)]
+        threads.append(Thread(target=_combine_stage, daemon=True,
+                              args=(dedupe, near, code_q, row_q, st_combine, max_workers)))
+
+        with tqdm(desc="uiverse", unit="item") as pbar:
+            monitor = ProgressMonitor([st_list, st_extract, st_combine, st_write], PROGRESS_EVERY,
+                                      emit=lambda line: pbar.set_postfix_str(line, refresh=True))
+            for t in threads:
+                t.start()
+            monitor.start()
+
+            # 쓰기 단계는 메인 스레드 (커넥션 하나를 한 스레드에서만)
+            while True:
+                try:
+                    row = row_q.get(timeout=1.0)
+                except Empty:
+                    row = None
+                if row is STOP:
+                    break
+                if row is not None:
+                    insert_component(writer, **row)
+                    near.saved(row["source_url"])
+                    st_write.tick()
+                    pbar.update(1)
+                writer.maybe_flush()  # 카테고리 카운트는 DB 트리거가 insert 마다 갱신 + 백엔드에 NOTIFY
+
+            writer.close()
+            near.close()
+            monitor.stop()
+
+        for t in threads:
+            t.join()
+        writer.report()
+
+    list_pool.close()
+    detail_pool.close()
+    detail_pool.report()
+    dedupe.report()
+    near.report()
+    log.info("📈 stages -> %s", monitor.line())
+    log.info("📊 detail extract modes -> %s", MODE_STATS.summary())
+    log.info("📊 list modes -> %s", LIST_STATS.summary())
+    log.info("🎉 done. total inserted: %d (failed %d)", writer.rows_written, writer.rows_failed)
 
 # ===================== 엔트리포인트 =====================
 if __name__ == "__main__":
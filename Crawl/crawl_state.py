@@ -0,0 +1,170 @@
+# crawl_state.py
+# GitHub 크롤러 증분 재크롤 상태 (레포별 마지막 tree SHA / pushed_at / 파일별 blob SHA)
+# - 검색 결과의 pushed_at 이 지난번과 같으면 API 호출 없이 skip
+# - tree SHA 가 같으면 skip, 바뀌었으면 blob SHA 가 달라진 파일만 다시 받음
+# - author 단위로 영구 skip 하던 load_processed_authors 대체
+# psycopg2 커넥션 사용 (상태 기록은 insert 와 같은 트랜잭션에서 → commit 되면 같이 반영)
+
+import json
+from collections import defaultdict
+from datetime import datetime
+
+SQL_CREATE_CRAWL_STATE = """
+CREATE TABLE IF NOT EXISTS public.github_crawl_state (
+    crawler     TEXT NOT NULL,                        -- 'css_art' / 'ui' (FILE_EXTS 가 달라서 따로)
+    owner       TEXT NOT NULL,
+    repo        TEXT NOT NULL,
+    branch      TEXT,
+    tree_sha    TEXT,
+    pushed_at   TIMESTAMPTZ,
+    blobs       JSONB NOT NULL DEFAULT '{}'::jsonb,   -- {path: blob sha} (FILE_EXTS 매칭분)
+    files_kept  INTEGER NOT NULL DEFAULT 0,
+    crawled_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (crawler, owner, repo)
+);
+"""
+
+SQL_LOAD_CRAWL_STATE = """
+SELECT owner, repo, tree_sha, pushed_at, blobs
+FROM public.github_crawl_state
+WHERE crawler = %s;
+"""
+
+SQL_UPSERT_CRAWL_STATE = """
+INSERT INTO public.github_crawl_state
+    (crawler, owner, repo, branch, tree_sha, pushed_at, blobs, files_kept, crawled_at)
+VALUES (%s, %s, %s, %s, %s, %s, %s::jsonb, %s, now())
+ON CONFLICT (crawler, owner, repo) DO UPDATE SET
+    branch = EXCLUDED.branch,
+    tree_sha = EXCLUDED.tree_sha,
+    pushed_at = EXCLUDED.pushed_at,
+    blobs = EXCLUDED.blobs,
+    files_kept = github_crawl_state.files_kept + EXCLUDED.files_kept,
+    crawled_at = now();
+"""
+
+
+# insert 에 실패한 파일: blob 기록에서 빼고 tree_sha/pushed_at 도 비워서 다음 실행에 다시 받게
+SQL_FORGET_BLOBS = """
+UPDATE public.github_crawl_state
+SET blobs = blobs - %s::text[], tree_sha = NULL, pushed_at = NULL
+WHERE crawler = %s AND owner = %s AND repo = %s;
+"""
+
+
+def parse_pushed_at(value):
+    """GitHub 의 '2024-05-01T12:34:56Z' → aware datetime (없으면 None)"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def seen_blobs(entries, known, fetched_paths):
+    """
+    이번 크롤 후 기록할 {path: sha}: 받아서 처리한 파일 + 지난번과 SHA 가 같은 파일.
+    다운로드 실패한 파일은 빼서 다음 실행에 다시 시도.
+    """
+    known = known or {}
+    return {path: sha for path, sha in entries if path in fetched_paths or known.get(path) == sha}
+
+
+class CrawlState:
+    """
+    state = CrawlState(conn, "css_art")
+    if state.unchanged_push(owner, name, repo["pushed_at"]): skip (API 0회)
+    branch, tree_sha, tree = resolve...
+    if state.unchanged_tree(owner, name, tree_sha): state.record(...) 후 skip
+    files = fetch_repo_files(..., known=state.known_blobs(owner, name))
+    state.record(cur, ...); conn.commit()
+    writer.on_failed = state.forget_rows   # insert 실패한 파일은 blob 기록에서 빠짐
+    """
+
+    def __init__(self, conn, crawler: str):
+        self.crawler = crawler
+        with conn.cursor() as cur:
+            cur.execute(SQL_CREATE_CRAWL_STATE)
+            cur.execute(SQL_LOAD_CRAWL_STATE, (crawler,))
+            rows = cur.fetchall()
+        conn.commit()
+        self.repos = {
+            (owner, repo): {"tree_sha": tree_sha, "pushed_at": pushed_at, "blobs": blobs or {}}
+            for owner, repo, tree_sha, pushed_at, blobs in rows
+        }
+        self._failed = defaultdict(set)  # (owner, repo) → 이번 실행에서 insert 실패한 경로
+        self.counts = {"new": 0, "changed": 0, "skip_pushed": 0, "skip_tree": 0, "blobs_reused": 0,
+                       "blobs_failed": 0}
+
+    def unchanged_push(self, owner, repo, pushed_at) -> bool:
+        prev = self.repos.get((owner, repo))
+        pushed = parse_pushed_at(pushed_at)
+        if prev is None or pushed is None or prev["pushed_at"] is None:
+            return False
+        if pushed <= prev["pushed_at"]:
+            self.counts["skip_pushed"] += 1
+            return True
+        return False
+
+    def unchanged_tree(self, owner, repo, tree_sha) -> bool:
+        prev = self.repos.get((owner, repo))
+        if prev is not None and tree_sha and prev["tree_sha"] == tree_sha:
+            self.counts["skip_tree"] += 1
+            return True
+        return False
+
+    def known_blobs(self, owner, repo) -> dict:
+        """지난 크롤에서 본 {path: sha}. 새 레포면 빈 dict"""
+        prev = self.repos.get((owner, repo))
+        self.counts["changed" if prev is not None else "new"] += 1
+        return prev["blobs"] if prev is not None else {}
+
+    def count_reused(self, n: int):
+        self.counts["blobs_reused"] += n
+
+    def record(self, cur, owner, repo, branch, tree_sha, pushed_at, blobs, kept=0, complete=True):
+        # insert 가 이미 실패한 파일(이 레포 행이 record 전에 flush 된 경우)은 기록하지 않음
+        failed = self._failed.get((owner, repo))
+        if failed:
+            blobs = {path: sha for path, sha in blobs.items() if path not in failed}
+            complete = False
+        # 일부 파일 다운로드가 실패했으면 tree_sha/pushed_at 을 비워서 다음 실행에 다시 보게
+        if not complete:
+            tree_sha, pushed_at = None, None
+        cur.execute(SQL_UPSERT_CRAWL_STATE, (
+            self.crawler, owner, repo, branch, tree_sha, pushed_at, json.dumps(blobs), kept,
+        ))
+        self.repos[(owner, repo)] = {
+            "tree_sha": tree_sha, "pushed_at": parse_pushed_at(pushed_at), "blobs": blobs,
+        }
+
+    def forget(self, cur, owner, repo, paths):
+        """insert 에 실패한 파일 → blob 기록에서 빼서 다음 실행에 다시 받기 (record 전이든 후든)"""
+        paths = list(paths)
+        failed = self._failed[(owner, repo)]
+        failed.update(paths)
+        self.counts["blobs_failed"] += len(paths)
+        cur.execute(SQL_FORGET_BLOBS, (paths, self.crawler, owner, repo))
+        prev = self.repos.get((owner, repo))
+        if prev is not None:
+            prev["tree_sha"] = prev["pushed_at"] = None
+            prev["blobs"] = {path: sha for path, sha in prev["blobs"].items() if path not in failed}
+
+    def forget_rows(self, cur, rows):
+        """
+        BulkWriter.on_failed 용. GitHub 크롤러 행 모양 (경로, 코드, owner, 레포 URL, ...) 기준
+        (git_api.CSS_ART_COLUMNS / ui_git_api.UI_COLUMNS)
+        """
+        by_repo = defaultdict(list)
+        for path, _, owner, repo_url, *_ in rows:
+            by_repo[(owner, repo_url.rstrip("/").rsplit("/", 1)[-1])].append(path)
+        for (owner, repo), paths in by_repo.items():
+            self.forget(cur, owner, repo, paths)
+
+    def report(self):
+        c = self.counts
+        print(
+            f"🔁 증분 크롤 ({self.crawler}): 신규 {c['new']} · 변경 {c['changed']}"
+            f" · skip(pushed_at) {c['skip_pushed']} · skip(tree) {c['skip_tree']}"
+            f" · 재사용 blob {c['blobs_reused']} · insert 실패(다음에 재시도) {c['blobs_failed']}"
+        )
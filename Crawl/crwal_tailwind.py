@@ -5,7 +5,12 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+
+from bulk_writer import BulkWriter
+from dedupe import UrlIndex
+from near_dupe import NearDupIndex
+from preview_builder import build_preview, ensure_preview_columns
+from driver_pool import DriverPool, chromedriver_path
 
 # --- DB 연결 ---
 conn = psycopg2.connect(
@@ -15,8 +20,22 @@ conn = psycopg2.connect(
     password="qwe123",
     port="5432"
 )
-cur = conn.cursor()
-lock = threading.Lock()
+lock = threading.RLock()  # writer flush 도 같은 lock 사용 (add → flush 재진입)
+
+# 상세 스레드들이 넣은 행을 모아서 COPY 로 한 번에 (페이지 끝에 flush)
+COMPONENT_COLUMNS = (
+    "components_name", "components_description", "components_preview_html", "components_code",
+    "components_library", "components_source_url", "components_author", "components_category",
+    "components_needs_tailwind", "components_is_button",
+)
+ensure_preview_columns(conn)
+writer = BulkWriter(conn, "components_tbl_test", COMPONENT_COLUMNS, lock=lock, max_rows=100, max_seconds=30)
+
+# 이미 저장된 source URL 을 시작할 때 한 번에 읽어둠 → 링크마다 lock 잡고 SELECT 하지 않음
+dedupe = UrlIndex.from_db(conn, "components")
+# 코드가 거의 같은(공백/클래스명/색상만 다른) 컴포넌트 — Uiverse 크롤러와 같은 namespace
+# writer 가 flush 할 때마다 그때까지 저장된 행의 서명도 같이 저장 (중간에 죽어도 남음)
+near = NearDupIndex.load(conn, "components").follow(writer)
 
 # --- 크롬 옵션 ---
 def get_driver():
@@ -24,7 +43,11 @@ def get_driver():
     options.add_argument("--headless")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    return webdriver.Chrome(service=Service(chromedriver_path()), options=options)
+
+MAX_WORKERS = 6
+# 상세 스레드 수 + 목록 페이지용 1개. 페이지마다 Chrome 을 새로 띄우지 않고 빌려 씀
+driver_pool = DriverPool(get_driver, size=MAX_WORKERS + 1, name="tailwind")
 
 BASE_URL = "https://www.creative-tim.com/twcomponents/components"
 PROGRESS_FILE = "progress.txt"
@@ -41,71 +64,108 @@ def log_output(msg):
         f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {msg}\n")
 
 def is_duplicate(link):
-    with lock:
-        cur.execute("SELECT 1 FROM components_tbl_test WHERE components_source_url = %s LIMIT 1;", (link,))
-        return cur.fetchone() is not None
+    # 처음 보는 링크면 이 스레드가 가져감 (다른 스레드/카테고리에서 같은 링크는 스킵)
+    return not dedupe.claim(link)
 
 # --- 카테고리 수집 ---
+CATEGORY_SELECTOR = "a.px-3.py-1\\.5.text-gray-500.dark\\:text-gray-400.rounded-lg.capitalize.hover\\:bg-gray-100.dark\\:hover\\:bg-gray-800"
+
 def get_categories():
-    driver = get_driver()
-    driver.get(BASE_URL)
+    with driver_pool.lease() as driver:
+        driver.get(BASE_URL)
 
-    # 카테고리 로드될 때까지 대기
-    try:
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_all_elements_located((
-                By.CSS_SELECTOR,
-                "a.px-3.py-1\\.5.text-gray-500.dark\\:text-gray-400.rounded-lg.capitalize.hover\\:bg-gray-100.dark\\:hover\\:bg-gray-800"
-            ))
-        )
-    except Exception as e:
-        print("⚠️ 카테고리 로드 실패:", e)
-        driver.quit()
-        return []
+        # 카테고리 로드될 때까지 대기
+        try:
+            WebDriverWait(driver, 15).until(
+                EC.presence_of_all_elements_located((By.CSS_SELECTOR, CATEGORY_SELECTOR))
+            )
+        except Exception as e:
+            print("⚠️ 카테고리 로드 실패:", e)
+            return []
 
-    # 카테고리 추출
-    cat_elems = driver.find_elements(
-        By.CSS_SELECTOR,
-        "a.px-3.py-1\\.5.text-gray-500.dark\\:text-gray-400.rounded-lg.capitalize.hover\\:bg-gray-100.dark\\:hover\\:bg-gray-800"
-    )
+        # 카테고리 추출
+        cat_elems = driver.find_elements(By.CSS_SELECTOR, CATEGORY_SELECTOR)
 
-    categories = []
-    for elem in cat_elems:
-        name = elem.text.strip()
-        href = elem.get_attribute("href")
+        categories = []
+        for elem in cat_elems:
+            name = elem.text.strip()
+            href = elem.get_attribute("href")
 
-        # All만 제외
-        if name.lower() == "all":
-            continue
+            # All만 제외
+            if name.lower() == "all":
+                continue
 
-        if href and name:
-            categories.append((name, href))
+            if href and name:
+                categories.append((name, href))
 
     print(f"📚 총 {len(categories)}개 카테고리 발견!")
     for i, (n, h) in enumerate(categories, 1):
         print(f"   {i}. {n} → {h}")
 
-    driver.quit()
     return categories
 
 
 # --- 페이지 단위 링크 수집 ---
 def crawl_page(url):
     try:
-        driver = get_driver()
-        driver.get(url)
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a[href*='/component/']"))
-        )
-        cards = driver.find_elements(By.CSS_SELECTOR, "a[href*='/component/']")
-        links = list({c.get_attribute("href") for c in cards if c.get_attribute("href")})
-        driver.quit()
-        return links
+        with driver_pool.lease() as driver:
+            driver.get(url)
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a[href*='/component/']"))
+            )
+            cards = driver.find_elements(By.CSS_SELECTOR, "a[href*='/component/']")
+            return list({c.get_attribute("href") for c in cards if c.get_attribute("href")})
     except Exception as e:
         log_error(f"페이지 로드 실패: {url} - {e}")
         return []
 
 # --- 상세 페이지 크롤링 ---
+def read_detail(driver, link):
+    """상세 페이지 → (name, description, author, full_code)"""
+    driver.get(link)
+
+    # 이름
+    try:
+        name_elem = WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located(
+                (By.CSS_SELECTOR, "h1.text-2xl.font-semibold.text-gray-800.dark\\:text-gray-200")
+            )
+        )
+        name = name_elem.text.strip()
+    except:
+        name = link.split("/")[-1]
+
+    # 설명
+    try:
+        desc_elem = driver.find_element(
+            By.CSS_SELECTOR,
+            "p.mt-2.text-gray-500.dark\\:text-gray-400.lg\\:max-w-xl.description-link"
+        )
+        description = desc_elem.text.strip()
+    except:
+        description = None
+
+    # 작성자
+    try:
+        author_elem = driver.find_element(
+            By.CSS_SELECTOR,
+            "a.text-gray-400.hover\\:underline"
+        )
+        author_text = author_elem.text.strip()
+        author = re.sub(r"^\s*by[:\s]+", "", author_text, flags=re.IGNORECASE).strip()
+    except:
+        author = "Creative Tim"
+
+    # 코드 추출
+    WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Show Code')]"))
+    ).click()
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, ".view-lines.monaco-mouse-cursor-text"))
+    )
+    full_code = driver.execute_script("return monaco.editor.getModels()[0].getValue();")
+    return name, description, author, full_code
+
 def crawl_detail(link, category):
     start = time.time()
     try:
@@ -114,72 +174,30 @@ def crawl_detail(link, category):
             log_output(msg)
             return msg
 
-        driver = get_driver()
-        driver.get(link)
-
-        # 이름
-        try:
-            name_elem = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "h1.text-2xl.font-semibold.text-gray-800.dark\\:text-gray-200")
-                )
-            )
-            name = name_elem.text.strip()
-        except:
-            name = link.split("/")[-1]
-
-        # 설명
-        try:
-            desc_elem = driver.find_element(
-                By.CSS_SELECTOR,
-                "p.mt-2.text-gray-500.dark\\:text-gray-400.lg\\:max-w-xl.description-link"
-            )
-            description = desc_elem.text.strip()
-        except:
-            description = None
-
-        # 작성자
-        try:
-            author_elem = driver.find_element(
-                By.CSS_SELECTOR,
-                "a.text-gray-400.hover\\:underline"
-            )
-            author_text = author_elem.text.strip()
-            author = re.sub(r"^\s*by[:\s]+", "", author_text, flags=re.IGNORECASE).strip()
-        except:
-            author = "Creative Tim"
-
-        # 코드 추출
-        WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Show Code')]"))
-        ).click()
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".view-lines.monaco-mouse-cursor-text"))
-        )
-        full_code = driver.execute_script("return monaco.editor.getModels()[0].getValue();")
-        driver.quit()
+        # 풀에서 빌린 드라이버 사용 (반납 시 초기화, 죽었으면 풀이 교체)
+        with driver_pool.lease() as driver:
+            name, description, author, full_code = read_detail(driver, link)
 
         if not full_code or len(full_code.strip()) == 0:
+            dedupe.discard(link)
             msg = f"⚠️ 코드 없음: {link}"
             log_output(msg)
             return msg
 
-        # DB 저장
-        with lock:
-            cur.execute("""
-                INSERT INTO components_tbl_test (
-                    components_name,
-                    components_description,
-                    components_preview_html,
-                    components_code,
-                    components_library,
-                    components_source_url,
-                    components_author,
-                    components_category
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, (name, description, None, full_code, "Tailwind", link, author, category))
-            conn.commit()
+        dup = near.claim(link, full_code)
+        if dup is not None:
+            msg = f"♻️ 유사 중복 스킵: {link} ≈ {dup}"
+            log_output(msg)
+            return msg
+
+        # 미리보기 문서는 저장 시점에 한 번 만들어 둠 (프론트가 렌더링마다 다시 만들지 않게)
+        preview = build_preview(full_code)
+
+        # DB 저장 (버퍼에 추가 → 페이지 끝 또는 임계치에서 일괄 저장)
+        with lock:  # 행 add 와 서명 표시를 flush 사이에 끼지 않게
+            writer.add((name, description, preview.html, full_code, "Tailwind", link, author, category,
+                        preview.needs_tailwind, preview.is_button))
+            near.saved(link)
 
         elapsed = round(time.time() - start, 1)
         msg = f"✅ [{category}] 저장 완료: {name} (작성자: {author}) ⏱ {elapsed}s"
@@ -187,9 +205,8 @@ def crawl_detail(link, category):
         return msg
 
     except Exception as e:
+        dedupe.discard(link)
         log_error(f"{link} - {e}")
-        try: driver.quit()
-        except: pass
         return f"❌ 오류: {link} ({e})"
 
 # --- 카테고리 단위 크롤링 ---
@@ -210,7 +227,7 @@ def crawl_category(category_name, category_url, category_index, total_categories
             break
 
         page_start = time.time()
-        with concurrent.futures.ThreadPoolExecutor(max_workers=6) as executor:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
             futures = [executor.submit(crawl_detail, link, category_name) for link in links]
             for future in concurrent.futures.as_completed(futures):
                 msg = future.result()
@@ -219,6 +236,10 @@ def crawl_category(category_name, category_url, category_index, total_categories
                     total_saved_local += 1
                     total_saved_global[0] += 1  # 리스트 참조로 전역 카운트 증가
 
+        # 페이지 단위 flush → 버퍼가 한 페이지 분량 이상 쌓이지 않고, 중단돼도 끝난 페이지까지는 DB 에 남음
+        # (중복 판정은 메모리의 UrlIndex 라 flush 와 무관)
+        writer.flush()
+
         # ETA 계산
         elapsed = time.time() - start_time
         progress = category_index / total_categories * 100
@@ -242,10 +263,17 @@ if __name__ == "__main__":
     total_saved_global = [0]  # 리스트로 감싸면 참조 가능 (thread-safe)
 
     print(f"\n📚 총 {len(categories)}개 카테고리 발견!\n")
+    driver_pool.start()  # 상세 크롤 전에 드라이버 N 개 미리 실행
 
     for i, (category_name, category_url) in enumerate(categories, start=1):
         crawl_category(category_name, category_url, i, len(categories), total_saved_global)
 
-    cur.close()
+    writer.close()
+    near.close()
+    driver_pool.close()
     conn.close()
     print(f"\n🎉 전체 크롤링 완료! 총 {total_saved_global[0]}개 저장됨 🚀")
+    writer.report()
+    driver_pool.report()
+    dedupe.report()
+    near.report()
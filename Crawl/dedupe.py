@@ -0,0 +1,127 @@
+# dedupe.py
+# 크롤러 공용 중복 인덱스 (Tailwind / Uiverse / GitHub)
+# - 링크마다 SELECT 1 ... (전역 lock 잡고) 하던 것 대신, 시작할 때 이미 저장된 키를 한 번에 읽어 메모리에서 확인
+# - 키는 64bit 해시(blake2b)로만 보관: 미리 읽은 것 = 정렬된 array('Q') (항목당 8바이트, 이진 탐색),
+#   실행 중 추가된 것 = set
+# - 조회(in)는 lock 없음. claim() (확인+추가) 만 짧은 메모리 lock → 같은 URL 을 두 스레드가 동시에 잡지 않음
+# - 해시 충돌 확률은 키 수천만 개에서도 ~1e-5 수준 → 사실상 정확한 집합
+# psycopg2 / psycopg(3) 커넥션 모두 사용 가능
+
+import threading
+from array import array
+from bisect import bisect_left
+from hashlib import blake2b
+
+# 크롤러별 중복 키 (테이블, 키 SQL). GitHub 크롤러는 레포 URL + 파일 경로
+SOURCES = {
+    "components": ("components_tbl_test", "components_source_url"),
+    "css_art": ("css_art_tbl", "art_source_url || '#' || art_name"),
+    "ui": ("ui_tbl", "ui_source_url || '#' || ui_name"),
+}
+
+
+def file_key(repo_url: str, path: str) -> str:
+    """
+    GitHub 크롤러용 키 (SOURCES 의 art_source_url || '#' || art_name 과 같은 모양).
+    증분 재크롤은 blob SHA 가 바뀐 파일만 받으므로, 받은 파일의 키가 이미 있으면 "중복" 이 아니라
+    "기존 행의 새 버전" → 크롤러가 UPDATE (git_api.update_css / ui_git_api.update_ui)
+    """
+    return f"{repo_url}#{path}"
+
+
+def _h(key: str) -> int:
+    return int.from_bytes(blake2b(key.strip().encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class UrlIndex:
+    """
+    index = UrlIndex.from_db(conn, "components")   # 저장된 source URL 미리 읽기
+    if index.claim(url):                           # 처음 보는 URL 이면 True (+ 표시)
+        ...크롤/저장...
+        (실패하면) index.discard(url)              # 이번 실행에서 다시 시도할 수 있게
+    """
+
+    def __init__(self, name="urls"):
+        self.name = name
+        self._base = array("Q")   # 미리 읽은 키 (정렬)
+        self._added = set()       # 실행 중 추가된 키
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_db(cls, conn, source, *, batch=50_000):
+        table, key_sql = SOURCES[source]
+        index = cls(source)
+        index.load(conn, table, key_sql, batch=batch)
+        return index
+
+    def load(self, conn, table, key_sql, *, batch=50_000):
+        """서버 사이드 커서로 batch 씩 읽음 (테이블이 없으면 빈 인덱스)"""
+        hashes = set()
+        try:
+            with conn.cursor(name=f"dedupe_{self.name}") as cur:
+                cur.itersize = batch
+                cur.execute(f"SELECT {key_sql} FROM {table} WHERE {key_sql} IS NOT NULL")
+                for row in cur:
+                    key = next(iter(row.values())) if isinstance(row, dict) else row[0]
+                    hashes.add(_h(key))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"⚠️ [{self.name}] 중복 인덱스 로드 실패 (빈 인덱스로 시작): {e}")
+        self._base = array("Q", sorted(hashes))
+        return self
+
+    # --- 조회/추가 ---
+    def _has(self, h) -> bool:
+        if h in self._added:
+            return True
+        i = bisect_left(self._base, h)
+        return i < len(self._base) and self._base[i] == h
+
+    def __contains__(self, key) -> bool:
+        return self._has(_h(key))
+
+    def __len__(self) -> int:
+        return len(self._base) + len(self._added)
+
+    def add(self, key):
+        self._added.add(_h(key))
+
+    def claim(self, key) -> bool:
+        """처음 보는 키면 추가하고 True, 이미 있으면 False"""
+        h = _h(key)
+        with self._lock:
+            if self._has(h):
+                self.hits += 1
+                return False
+            self._added.add(h)
+            self.misses += 1
+            return True
+
+    def discard(self, key):
+        """claim 했지만 저장 못 한 키 (미리 읽은 키는 그대로)"""
+        with self._lock:
+            self._added.discard(_h(key))
+
+    # --- 리포트 ---
+    def memory_bytes(self) -> int:
+        # array 는 항목당 8바이트, set 은 슬롯 + int 객체 ≈ 항목당 ~70바이트
+        return self._base.itemsize * len(self._base) + 70 * len(self._added)
+
+    def stats(self) -> dict:
+        return {
+            "preloaded": len(self._base),
+            "added": len(self._added),
+            "duplicates": self.hits,
+            "new": self.misses,
+            "memory_kb": round(self.memory_bytes() / 1024, 1),
+        }
+
+    def report(self):
+        st = self.stats()
+        print(
+            f"🧮 [{self.name}] 중복 인덱스: 기존 {st['preloaded']} + 신규 {st['added']} 키"
+            f" · 중복 스킵 {st['duplicates']} · 메모리 ~{st['memory_kb']}KB"
+        )
@@ -0,0 +1,196 @@
+# driver_pool.py
+# Selenium 드라이버 풀 (Tailwind / Uiverse 크롤러 공용)
+# - 상세 페이지마다 Chrome 을 새로 띄우던 것 대신 N 개를 미리 띄워두고 빌려 씀
+# - 반납할 때 쿠키/스토리지/여분 탭 정리 + about:blank 로 초기화
+# - K 페이지 쓰면 재시작 (메모리 누수 방지), 응답 없으면(크래시) 즉시 교체
+# - chromedriver 설치(ChromeDriverManager().install())는 프로세스당 한 번만
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+
+DEFAULT_MAX_USES = 50  # 이만큼 페이지를 처리한 드라이버는 재시작
+
+
+@lru_cache(maxsize=1)
+def chromedriver_path() -> str:
+    """ChromeDriverManager().install() 은 매번 버전 확인(네트워크)까지 하므로 한 번만"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class _Slot:
+    __slots__ = ("driver", "uses")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class DriverPool:
+    """
+    pool = DriverPool(lambda: make_driver(headless=True), size=6)
+    pool.start()                      # N 개 미리 띄우기 (안 불러도 lease 때 필요한 만큼 생성)
+    with pool.lease() as d:
+        d.get(url)
+    pool.close()
+    """
+
+    def __init__(self, factory, size, max_uses=DEFAULT_MAX_USES, name="chrome"):
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.name = name
+        self._idle = []
+        self._created = 0          # 살아있는(빌려준 것 포함) 드라이버 수
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.launches = 0
+        self.recycled_uses = 0
+        self.recycled_crash = 0
+        self.leases = 0
+        self.wait_s = 0.0
+        self.launch_s = 0.0
+
+    # --- 생성/정리 ---
+    def _launch(self):
+        t0 = time.perf_counter()
+        driver = self.factory()
+        with self._cond:
+            self.launches += 1
+            self.launch_s += time.perf_counter() - t0
+        return _Slot(driver)
+
+    def start(self):
+        """남은 자리만큼 병렬로 미리 띄움"""
+        with self._cond:
+            n = self.size - self._created
+            self._created += n
+        if n <= 0:
+            return
+        with ThreadPoolExecutor(max_workers=n) as ex:
+            futures = [ex.submit(self._launch) for _ in range(n)]
+        for fut in futures:
+            with self._cond:
+                try:
+                    self._idle.append(fut.result())
+                except Exception as e:
+                    self._created -= 1
+                    print(f"⚠️ [{self.name}] 드라이버 시작 실패: {e}")
+                self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+        for slot in idle:
+            _quit(slot.driver)
+
+    # --- 대여/반납 ---
+    @contextmanager
+    def lease(self):
+        slot = self._acquire()
+        try:
+            yield slot.driver
+        finally:
+            self._release(slot)
+
+    def _acquire(self):
+        t0 = time.perf_counter()
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError(f"DriverPool[{self.name}] is closed")
+                if self._idle:
+                    slot = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    self._created += 1
+                    slot = None
+                    break
+                self._cond.wait()
+            self.leases += 1
+            self.wait_s += time.perf_counter() - t0
+        if slot is None:
+            try:
+                slot = self._launch()
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                raise
+        return slot
+
+    def _release(self, slot):
+        slot.uses += 1
+        healthy = self._reset(slot.driver)
+        if not healthy or slot.uses >= self.max_uses:
+            _quit(slot.driver)
+            with self._cond:
+                if healthy:
+                    self.recycled_uses += 1
+                else:
+                    self.recycled_crash += 1
+                self._created -= 1
+                self._cond.notify()
+            return
+        with self._cond:
+            if self._closed:
+                self._created -= 1
+                _quit(slot.driver)
+                return
+            self._idle.append(slot)
+            self._cond.notify()
+
+    @staticmethod
+    def _reset(driver) -> bool:
+        """다음 페이지를 위해 상태 초기화. 드라이버가 죽었으면 False"""
+        try:
+            handles = driver.window_handles
+            for h in handles[1:]:
+                driver.switch_to.window(h)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            try:
+                driver.execute_script("try{localStorage.clear();sessionStorage.clear();}catch(e){}")
+            except Exception:
+                pass
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+
+    # --- 리포트 ---
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self.size,
+                "alive": self._created,
+                "idle": len(self._idle),
+                "leases": self.leases,
+                "launches": self.launches,
+                "recycled_uses": self.recycled_uses,
+                "recycled_crash": self.recycled_crash,
+                "avg_launch_s": round(self.launch_s / self.launches, 2) if self.launches else 0.0,
+                "avg_wait_s": round(self.wait_s / self.leases, 3) if self.leases else 0.0,
+            }
+
+    def report(self):
+        st = self.stats()
+        print(
+            f"🚗 [{self.name}] 드라이버 풀 size={st['size']} · 대여 {st['leases']}회 · 실행 {st['launches']}회"
+            f" (평균 {st['avg_launch_s']}s) · 재시작 {st['recycled_uses']} / 크래시 교체 {st['recycled_crash']}"
+            f" · 평균 대기 {st['avg_wait_s']}s"
+        )
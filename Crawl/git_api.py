@@ -1,7 +1,16 @@
-import os, time, requests, psycopg2
+import io, os, sys, time, tarfile, asyncio, requests, psycopg2
 from datetime import datetime
 from dotenv import load_dotenv
 
+from bulk_writer import BulkWriter
+from crawl_state import CrawlState, seen_blobs
+from dedupe import UrlIndex, file_key
+from near_dupe import NearDupIndex
+from github_archive import FETCH_MODES, changed_entries, code_entries, read_archive, should_use_archive
+from github_client import API_BASE, RAW_BASE, AsyncGitHubClient
+from keyword_match import KeywordMatcher
+from http_cache import cache_key, open_default_cache, requests_response_from_cache
+
 # ========= 환경설정 =========
 load_dotenv()
 
@@ -33,12 +42,22 @@ ART_KEYWORDS = [
 
 BRANCH_CANDIDATES = ["main", "master", "gh-pages", "source"]
 
+# 디스크 HTTP 캐시 (ETag 조건부 요청 + blob SHA 별 raw 본문)
+HTTP_CACHE = open_default_cache()
+
+# async 모드: 동시에 처리할 레포 수 (호스트별 요청 수 제한은 github_client 에서)
+REPO_CONCURRENCY = int(os.getenv("REPO_CONCURRENCY", "8"))
+
 # ========= 공통: 안전한 GET (retry/backoff + rate-limit 대기) =========
-def github_get(url, params=None, max_retries=5, timeout=20):
+def github_get(url, params=None, max_retries=5, timeout=20, stream=False):
     retries = 0
+    # API 응답만 조건부 요청 (raw 는 blob SHA 로 따로 캐시, tarball 스트림은 캐시 안 함)
+    key = cache_key(url, params)
+    use_cache = HTTP_CACHE is not None and url.startswith(API_BASE) and not stream
+    cond = HTTP_CACHE.conditional_headers(key) if use_cache else {}
     while True:
         try:
-            r = requests.get(url, headers=HEADERS, params=params, timeout=timeout)
+            r = requests.get(url, headers={**HEADERS, **cond}, params=params, timeout=timeout, stream=stream)
         except requests.exceptions.ConnectionError as e:
             retries += 1
             if retries > max_retries:
@@ -69,28 +88,44 @@ def github_get(url, params=None, max_retries=5, timeout=20):
             time.sleep(wait)
             continue
 
+        if use_cache:
+            if r.status_code == 304:
+                cached = HTTP_CACHE.load(key)
+                if cached is not None:
+                    return requests_response_from_cache(url, *cached)
+                cond = {}  # 캐시 항목이 없어졌으면 조건 없이 다시
+                continue
+            if r.status_code == 200:
+                HTTP_CACHE.store(key, r.headers, r.content, bool(cond))
+
         return r
 
 # ========= DB =========
 def db():
     return psycopg2.connect(PG_DSN)
 
-def load_processed_authors(cur):
-    # 이미 한 번이라도 저장된 author(=owner)는 skip → 이어받기
-    cur.execute("SELECT DISTINCT art_author FROM css_art_tbl;")
-    return {row[0] for row in cur.fetchall()}
+CSS_ART_COLUMNS = ("art_name", "art_css", "art_author", "art_source_url", "license_type")
+
+def css_writer(conn):
+    # 레포마다 commit 하지 않고 모아서 multi-row INSERT (flush 가 crawl_state upsert 까지 같이 commit)
+    return BulkWriter(conn, "css_art_tbl", CSS_ART_COLUMNS, on_conflict="ON CONFLICT DO NOTHING")
+
+def save_css(writer, path, css, owner, url, lic):
+    writer.add((path, css, owner, url, lic))
+
+SQL_UPDATE_CSS = """
+UPDATE css_art_tbl SET art_css = %s, art_author = %s, license_type = %s
+WHERE art_source_url = %s AND art_name = %s;
+"""
 
-def save_css(cur, path, css, owner, url, lic):
-    cur.execute("""
-        INSERT INTO css_art_tbl (art_name, art_css, art_author, art_source_url, license_type)
-        VALUES (%s, %s, %s, %s, %s)
-        ON CONFLICT DO NOTHING;
-    """, (path, css, owner, url, lic))
+def update_css(cur, path, css, owner, url, lic):
+    # 재크롤에서 blob 이 바뀐 기존 파일 → 행을 새 버전으로 (insert 와 같은 트랜잭션, writer flush 때 commit)
+    cur.execute(SQL_UPDATE_CSS, (css, owner, lic, url, path))
 
 # ========= 탐색/다운로드 =========
 def get_default_or_fallback_branch(owner, repo):
     # 1) repo info default_branch 우선
-    info = github_get(f"https://api.github.com/repos/{owner}/{repo}")
+    info = github_get(f"{API_BASE}/repos/{owner}/{repo}")
     if info and info.status_code == 200:
         default_branch = info.json().get("default_branch")
         candidates = [default_branch] + BRANCH_CANDIDATES
@@ -102,35 +137,102 @@ def get_default_or_fallback_branch(owner, repo):
         if not b or b in seen: 
             continue
         seen.add(b)
-        resp = github_get(f"https://api.github.com/repos/{owner}/{repo}/branches/{b}")
+        resp = github_get(f"{API_BASE}/repos/{owner}/{repo}/branches/{b}")
         if resp and resp.status_code == 200:
             return b
     return None
 
-def list_code_paths(owner, repo, branch):
-    # git tree 재귀로 .css/.scss/.sass 경로 전부 추출
-    r = github_get(f"https://api.github.com/repos/{owner}/{repo}/git/trees/{branch}?recursive=1")
+def fetch_tree(owner, repo, branch):
+    # git tree 재귀 (path/sha/size) — 파일 목록 + tarball 모드 판단에 같이 씀
+    # 반환: (tree sha, tree) / 브랜치가 없으면 None
+    r = github_get(f"{API_BASE}/repos/{owner}/{repo}/git/trees/{branch}?recursive=1")
     if not r or r.status_code != 200:
-        return []
-    tree = r.json().get("tree", [])
-    return [item["path"] for item in tree if item.get("path","").endswith(FILE_EXTS)]
+        return None
+    data = r.json()
+    return data.get("sha"), data.get("tree", [])
+
+def get_tree(owner, repo, branch):
+    found = fetch_tree(owner, repo, branch)
+    return found[1] if found else []
+
+def resolve_branch_and_tree(owner, repo, default_branch=None):
+    # 검색 결과의 default_branch 로 트리를 바로 조회 (요청 1회). 실패할 때만 브랜치 probing
+    # 반환: (branch, tree sha, tree)
+    if default_branch:
+        found = fetch_tree(owner, repo, default_branch)
+        if found is not None:
+            return (default_branch,) + found
+    branch = get_default_or_fallback_branch(owner, repo)
+    if not branch:
+        return None, None, []
+    found = fetch_tree(owner, repo, branch)
+    return (branch,) + found if found else (branch, None, [])
+
+def list_code_entries(owner, repo, branch):
+    # .css/.scss/.sass 경로 + blob SHA
+    return code_entries(get_tree(owner, repo, branch), FILE_EXTS)
 
-def download_raw(owner, repo, branch, path):
-    raw = f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/{path}"
+def list_code_paths(owner, repo, branch):
+    return [path for path, _ in list_code_entries(owner, repo, branch)]
+
+def download_raw(owner, repo, branch, path, sha=None):
+    # 같은 blob SHA 를 이미 받아둔 적 있으면 다운로드 생략
+    if sha and HTTP_CACHE is not None:
+        cached = HTTP_CACHE.get_blob(sha)
+        if cached is not None:
+            return cached
+    raw = f"{RAW_BASE}/{owner}/{repo}/{branch}/{path}"
     r = github_get(raw)
     if not r or r.status_code != 200:
         return None
     try:
-        return r.text
+        text = r.text
     except Exception:
         return None
+    if sha and HTTP_CACHE is not None:
+        HTTP_CACHE.put_blob(sha, text)
+    return text
+
+def download_archive(owner, repo, branch, entries):
+    # tarball 한 번 받아서 entries 경로만 스트리밍으로 풀기. 실패하면 None → 파일별로 폴백
+    r = github_get(f"{API_BASE}/repos/{owner}/{repo}/tarball/{branch}", stream=True)
+    if not r or r.status_code != 200:
+        return None
+    try:
+        with r:
+            return read_archive(r.raw, entries, HTTP_CACHE)
+    except (tarfile.TarError, OSError, EOFError) as e:
+        print(f"⚠️ tarball 읽기 실패 ({owner}/{repo}): {e} — 파일별 다운로드로 전환")
+        return None
+
+def fetch_repo_files(owner, repo, branch, tree, known=None):
+    """
+    매칭 파일이 많으면 tarball 1회, 적으면 파일별 raw. 반환: [(path, code), ...]
+    known: 지난 크롤의 {path: blob sha} → SHA 가 그대로인 파일은 안 받음
+    """
+    entries = changed_entries(code_entries(tree, FILE_EXTS), known)
+    if should_use_archive(tree, len(entries)):
+        files = download_archive(owner, repo, branch, entries)
+        if files is not None:
+            FETCH_MODES["archive"] += 1
+            return files
+    FETCH_MODES["per_file"] += 1
+    files = []
+    for path, sha in entries:
+        code = download_raw(owner, repo, branch, path, sha)
+        if code:
+            files.append((path, code))
+    return files
+
+ART_MATCHER = KeywordMatcher(ART_KEYWORDS)
 
 def is_artistic(css_text):
-    if not css_text:
-        return False
-    lower = css_text.lower()
-    # 완화: 키워드 1개만 있어도 통과 (수집량 극대화)
-    return any(k in lower for k in ART_KEYWORDS)
+    # 완화: 키워드 1개만 있어도 통과 (수집량 극대화) — 첫 키워드에서 종료, 큰 번들도 청크 단위로
+    return ART_MATCHER.search(css_text) is not None
+
+def art_keyword_counts(css_text):
+    # 키워드별 등장 횟수 (품질 점수용)
+    return ART_MATCHER.counts(css_text)
 
 # ========= 레포 검색 (그대로 사용하거나, 이미 모아둔 리스트 사용) =========
 def search_repositories(queries, pages=10):
@@ -138,7 +240,7 @@ def search_repositories(queries, pages=10):
     for q in queries:
         for page in range(1, pages + 1):
             params = {"q": q, "sort": "stars", "order": "desc", "per_page": 100, "page": page}
-            r = github_get("https://api.github.com/search/repositories", params=params)
+            r = github_get(f"{API_BASE}/search/repositories", params=params)
             if not r or r.status_code != 200:
                 break
             items = r.json().get("items", [])
@@ -151,36 +253,169 @@ def search_repositories(queries, pages=10):
                     "owner": repo["owner"]["login"],
                     "name": repo["name"],
                     "url": repo["html_url"],
-                    "license": lic
+                    "license": lic,
+                    # 검색 응답에 이미 있는 메타데이터 — 브랜치 probing/증분 크롤에 씀
+                    "default_branch": repo.get("default_branch"),
+                    "pushed_at": repo.get("pushed_at"),
+                    "size": repo.get("size"),
                 }
             print(f"🔎 {q} p{page}: 누적 레포 {len(repos)}")
             time.sleep(0.8)
     return list(repos.values())
 
+# ========= async 엔진 (동시 요청 + 공유 rate-limit 버킷) =========
+async def get_default_or_fallback_branch_async(gh, owner, repo):
+    info = await gh.get(f"{API_BASE}/repos/{owner}/{repo}")
+    if info is not None and info.status_code == 200:
+        candidates = [info.json().get("default_branch")] + BRANCH_CANDIDATES
+    else:
+        candidates = BRANCH_CANDIDATES
+
+    seen = set()
+    for b in candidates:
+        if not b or b in seen:
+            continue
+        seen.add(b)
+        resp = await gh.get(f"{API_BASE}/repos/{owner}/{repo}/branches/{b}")
+        if resp is not None and resp.status_code == 200:
+            return b
+    return None
+
+async def fetch_tree_async(gh, owner, repo, branch):
+    r = await gh.get(f"{API_BASE}/repos/{owner}/{repo}/git/trees/{branch}?recursive=1")
+    if r is None or r.status_code != 200:
+        return None
+    data = r.json()
+    return data.get("sha"), data.get("tree", [])
+
+async def get_tree_async(gh, owner, repo, branch):
+    found = await fetch_tree_async(gh, owner, repo, branch)
+    return found[1] if found else []
+
+async def resolve_branch_and_tree_async(gh, owner, repo, default_branch=None):
+    if default_branch:
+        found = await fetch_tree_async(gh, owner, repo, default_branch)
+        if found is not None:
+            return (default_branch,) + found
+    branch = await get_default_or_fallback_branch_async(gh, owner, repo)
+    if not branch:
+        return None, None, []
+    found = await fetch_tree_async(gh, owner, repo, branch)
+    return (branch,) + found if found else (branch, None, [])
+
+async def list_code_entries_async(gh, owner, repo, branch):
+    return code_entries(await get_tree_async(gh, owner, repo, branch), FILE_EXTS)
+
+async def download_raw_async(gh, owner, repo, branch, path, sha=None):
+    if sha and gh.cache is not None:
+        cached = gh.cache.get_blob(sha)
+        if cached is not None:
+            return cached
+    r = await gh.get(f"{RAW_BASE}/{owner}/{repo}/{branch}/{path}")
+    if r is None or r.status_code != 200:
+        return None
+    try:
+        text = r.text
+    except Exception:
+        return None
+    if sha and gh.cache is not None:
+        gh.cache.put_blob(sha, text)
+    return text
+
+async def download_archive_async(gh, owner, repo, branch, entries):
+    # httpx 응답 본문은 메모리에 받고, tar 해제는 스레드에서 (이벤트 루프 안 막게)
+    r = await gh.get(f"{API_BASE}/repos/{owner}/{repo}/tarball/{branch}", cache=False)
+    if r is None or r.status_code != 200:
+        return None
+    try:
+        return await asyncio.to_thread(read_archive, io.BytesIO(r.content), entries, gh.cache)
+    except (tarfile.TarError, OSError, EOFError) as e:
+        print(f"⚠️ tarball 읽기 실패 ({owner}/{repo}): {e} — 파일별 다운로드로 전환")
+        return None
+
+async def fetch_repo_files_async(gh, owner, name, branch, tree, known=None):
+    # fetch_repo_files 의 async 판: tarball 또는 파일 동시 다운로드 → [(path, code), ...]
+    entries = changed_entries(code_entries(tree, FILE_EXTS), known)
+    if should_use_archive(tree, len(entries)):
+        files = await download_archive_async(gh, owner, name, branch, entries)
+        if files is not None:
+            FETCH_MODES["archive"] += 1
+            return files
+    FETCH_MODES["per_file"] += 1
+    codes = await asyncio.gather(*(download_raw_async(gh, owner, name, branch, p, sha) for p, sha in entries))
+    return [(p, c) for (p, _), c in zip(entries, codes) if c]
+
+async def crawl_repo_async(gh, owner, name, default_branch=None, known=None):
+    """
+    레포 하나: 트리(검색 때 받은 default_branch 로 바로) → tarball 또는 파일 동시 다운로드 → is_artistic 필터.
+    반환: (branch, [(path, css), ...]) — DB 저장은 호출 측에서
+    """
+    branch, _, tree = await resolve_branch_and_tree_async(gh, owner, name, default_branch)
+    if not branch:
+        return None, []
+    files = await fetch_repo_files_async(gh, owner, name, branch, tree, known)
+    return branch, [(p, c) for p, c in files if is_artistic(c)]
+
+async def search_repositories_async(gh, queries, pages=10):
+    repos = {}
+
+    async def one_query(q):
+        for page in range(1, pages + 1):
+            params = {"q": q, "sort": "stars", "order": "desc", "per_page": 100, "page": page}
+            r = await gh.get(f"{API_BASE}/search/repositories", params=params)
+            if r is None or r.status_code != 200:
+                break
+            items = r.json().get("items", [])
+            if not items:
+                break
+            for repo in items:
+                key = f"{repo['owner']['login']}/{repo['name']}"
+                lic = (repo.get("license") or {}).get("spdx_id") or "Unknown"
+                repos[key] = {
+                    "owner": repo["owner"]["login"],
+                    "name": repo["name"],
+                    "url": repo["html_url"],
+                    "license": lic,
+                    # 검색 응답에 이미 있는 메타데이터 — 브랜치 probing/증분 크롤에 씀
+                    "default_branch": repo.get("default_branch"),
+                    "pushed_at": repo.get("pushed_at"),
+                    "size": repo.get("size"),
+                }
+            print(f"🔎 {q} p{page}: 누적 레포 {len(repos)}")
+
+    await asyncio.gather(*(one_query(q) for q in queries))
+    return list(repos.values())
+
 # ========= 메인 =========
+SEARCH_QUERIES = [
+    "css art language:css stars:>5", "pure css art language:css stars:>5",
+    "css animation language:css stars:>5", "css experiment language:css",
+    "css illustration language:css", "single div art language:css",
+    "css 3d art language:css", "neon css language:css",
+    "css optical illusion language:css", "css gradient art language:css",
+    "css morph animation language:css", "css glassmorphism language:css",
+    "css particle animation language:css", "css creative design language:css",
+    "css challenge language:css", "css typography art language:css",
+    "css shader effect language:css", "css line art language:css",
+    "css landscape language:css", "css motion experiment language:css"
+]
+
 def run():
-    queries = [
-        "css art language:css stars:>5", "pure css art language:css stars:>5",
-        "css animation language:css stars:>5", "css experiment language:css",
-        "css illustration language:css", "single div art language:css",
-        "css 3d art language:css", "neon css language:css",
-        "css optical illusion language:css", "css gradient art language:css",
-        "css morph animation language:css", "css glassmorphism language:css",
-        "css particle animation language:css", "css creative design language:css",
-        "css challenge language:css", "css typography art language:css",
-        "css shader effect language:css", "css line art language:css",
-        "css landscape language:css", "css motion experiment language:css"
-    ]
+    queries = SEARCH_QUERIES
 
     # 1) 레포 목록
     repos = search_repositories(queries, pages=10)
     print(f"✅ Unique repos: {len(repos)}")
 
-    # 2) DB 연결 & 이어받기 준비
+    # 2) DB 연결 & 이어받기 준비 (레포별 pushed_at / tree SHA / blob SHA)
     conn = db()
     cur = conn.cursor()
-    processed_authors = load_processed_authors(cur)
-    print(f"↪️ 이어받기: 이미 처리된 author {len(processed_authors)}명 skip")
+    state = CrawlState(conn, "css_art")
+    writer = css_writer(conn)
+    writer.on_failed = state.forget_rows  # insert 실패한 파일은 blob 기록에서 빼서 다음 실행에 재시도
+    dedupe = UrlIndex.from_db(conn, "css_art")  # 이미 저장된 (레포 URL, 경로)
+    near = NearDupIndex.load(conn, "css_art").follow(writer)  # 포크/복사본 (공백·클래스명·색상만 다른 CSS)
+    print(f"↪️ 이어받기: 지난 크롤 상태 {len(state.repos)}개 레포")
 
     saved_total = 0
     processed = 0
@@ -188,8 +423,8 @@ def run():
     for repo in repos:
         owner, name, url, lic = repo["owner"], repo["name"], repo["url"], repo["license"]
 
-        # 이어받기: 이미 수집한 author면 통과
-        if owner in processed_authors:
+        # 이어받기: 지난 크롤 이후 push 가 없으면 API 호출 없이 통과
+        if state.unchanged_push(owner, name, repo.get("pushed_at")):
             continue
 
         # 라이선스 필터
@@ -197,45 +432,168 @@ def run():
             print(f"⛔ 라이선스 제외: {owner}/{name} ({lic})")
             continue
 
-        # 브랜치 결정
-        branch = get_default_or_fallback_branch(owner, name)
-        if not branch:
+        # 브랜치 + 트리 (검색 때 받은 default_branch 로 바로, 실패 시에만 probing)
+        branch, tree_sha, tree = resolve_branch_and_tree(owner, name, repo.get("default_branch"))
+        if not branch or tree_sha is None:
             print(f"⚪ 브랜치 확인 실패: {owner}/{name}")
             continue
 
-        # 파일 경로 추출
-        paths = list_code_paths(owner, name, branch)
-        if not paths:
+        entries = code_entries(tree, FILE_EXTS)
+        blobs = dict(entries)
+        if state.unchanged_tree(owner, name, tree_sha):
+            # push 는 있었지만 트리가 그대로 (다른 브랜치 push 등) → pushed_at 만 갱신
+            state.record(cur, owner, name, branch, tree_sha, repo.get("pushed_at"), blobs)
+            writer.maybe_flush()
+            continue
+
+        # 파일 경로 추출 → tarball / 파일별 다운로드 (blob SHA 가 바뀐 파일만)
+        if not entries:
             print(f"⚪ CSS 없음: {owner}/{name}")
+            state.record(cur, owner, name, branch, tree_sha, repo.get("pushed_at"), blobs)
+            writer.maybe_flush()
             continue
+        known = state.known_blobs(owner, name)
+        files = fetch_repo_files(owner, name, branch, tree, known)
+        state.count_reused(len(entries) - len(changed_entries(entries, known)))
+        blobs = seen_blobs(entries, known, {p for p, _ in files})
 
         kept = 0
-        for path in paths:
-            code = download_raw(owner, name, branch, path)
-            if not code:
-                continue
+        for path, code in files:
+            key = file_key(url, path)
             if not is_artistic(code):
                 continue
-            try:
-                save_css(cur, path, code, owner, url, lic)
-                kept += 1
-                saved_total += 1
-            except Exception as e:
-                # 스키마/인코딩 이슈는 건너뛴다
-                print(f"DB insert error ({owner}/{name}:{path}): {e}")
-
-        conn.commit()
+            # 이미 저장된 경로인데 다시 받았다 = blob SHA 가 바뀐 새 버전 → 유사 중복 검사 없이 항상 UPDATE
+            # (건너뛰면 blob SHA 는 기록되는데 행은 옛 내용 그대로 남음)
+            if not dedupe.claim(key):
+                near.update(key, code)
+                update_css(cur, path, code, owner, url, lic)
+            elif near.claim(key, code) is not None:
+                continue
+            else:
+                # 스키마/인코딩 이슈 행은 writer 가 flush 때 건너뛴다
+                save_css(writer, path, code, owner, url, lic)
+            near.saved(key)
+            kept += 1
+            saved_total += 1
+
+        # 상태는 insert 와 같은 트랜잭션 (writer flush 때 같이 commit)
+        # → flush 전에 죽으면 이 레포는 다음 실행에 다시
+        state.record(cur, owner, name, branch, tree_sha, repo.get("pushed_at"), blobs, kept,
+                     complete=len(blobs) == len(entries))
+        writer.maybe_flush()
         processed += 1
-        if kept > 0:
-            # 이 author는 처리된 것으로 마킹 (다음 실행부터 skip)
-            processed_authors.add(owner)
 
         print(f"💾 {owner}/{name}@{branch} → kept {kept} css (total saved: {saved_total})")
         time.sleep(0.4)
 
+    writer.close()
+    near.close()
     cur.close()
     conn.close()
     print(f"🎉 완료! 처리 레포 {processed}, 저장 파일 {saved_total}")
+    writer.report()
+    state.report()
+    dedupe.report()
+    near.report()
+    print(f"📦 다운로드 모드: tarball {FETCH_MODES['archive']} · 파일별 {FETCH_MODES['per_file']}")
+    if HTTP_CACHE is not None:
+        HTTP_CACHE.report()
+
+async def run_async():
+    # 1) 레포 목록 (쿼리들 동시 검색, search 한도는 공유 버킷이 관리)
+    async with AsyncGitHubClient(GITHUB_TOKEN, cache=HTTP_CACHE) as gh:
+        repos = await search_repositories_async(gh, SEARCH_QUERIES, pages=10)
+        print(f"✅ Unique repos: {len(repos)}")
+
+        # 2) DB 연결 & 이어받기 준비 (레포별 pushed_at / tree SHA / blob SHA)
+        conn = db()
+        cur = conn.cursor()
+        state = CrawlState(conn, "css_art")
+        writer = css_writer(conn)
+        writer.on_failed = state.forget_rows  # insert 실패한 파일은 blob 기록에서 빼서 다음 실행에 재시도
+        dedupe = UrlIndex.from_db(conn, "css_art")
+        near = NearDupIndex.load(conn, "css_art").follow(writer)
+        print(f"↪️ 이어받기: 지난 크롤 상태 {len(state.repos)}개 레포")
+
+        repo_sem = asyncio.Semaphore(REPO_CONCURRENCY)
+        db_lock = asyncio.Lock()  # psycopg2 커서는 한 번에 하나씩
+        totals = {"saved": 0, "processed": 0}
+        started = time.perf_counter()
+
+        def save_repo(repo, branch, tree_sha, blobs, kept_files, complete):
+            owner, url, lic = repo["owner"], repo["url"], repo["license"]
+            for path, code, stored in kept_files:
+                if stored:
+                    update_css(cur, path, code, owner, url, lic)
+                else:
+                    save_css(writer, path, code, owner, url, lic)
+                near.saved(file_key(url, path))
+            state.record(cur, owner, repo["name"], branch, tree_sha, repo.get("pushed_at"), blobs,
+                         len(kept_files), complete)
+            writer.maybe_flush()
+            return len(kept_files)
+
+        async def handle(repo):
+            owner, name, url, lic = repo["owner"], repo["name"], repo["url"], repo["license"]
+            if state.unchanged_push(owner, name, repo.get("pushed_at")):
+                return
+            if lic not in ALLOWED_LICENSES:
+                print(f"⛔ 라이선스 제외: {owner}/{name} ({lic})")
+                return
+
+            async with repo_sem:
+                branch, tree_sha, tree = await resolve_branch_and_tree_async(gh, owner, name, repo.get("default_branch"))
+                if not branch or tree_sha is None:
+                    print(f"⚪ 브랜치 확인 실패: {owner}/{name}")
+                    return
+                entries = code_entries(tree, FILE_EXTS)
+                blobs = dict(entries)
+                files = []
+                if entries and not state.unchanged_tree(owner, name, tree_sha):
+                    known = state.known_blobs(owner, name)
+                    files = await fetch_repo_files_async(gh, owner, name, branch, tree, known)
+                    state.count_reused(len(entries) - len(changed_entries(entries, known)))
+                    blobs = seen_blobs(entries, known, {p for p, _ in files})
+                    # (path, code, 이미 저장된 경로인지) — 저장된 경로면 blob 이 바뀐 새 버전 → 항상 UPDATE
+                    # 유사 중복 검사는 새로 insert 할 파일만
+                    files = [(p, c, not dedupe.claim(file_key(url, p))) for p, c in files if is_artistic(c)]
+                    for p, c, stored in files:
+                        if stored:
+                            near.update(file_key(url, p), c)
+                    files = [f for f in files if f[2] or near.claim(file_key(url, f[0]), f[1]) is None]
+
+            # 변경 없음 / CSS 없음도 상태는 기록 (다음 실행에서 pushed_at 으로 skip)
+            async with db_lock:
+                kept = await asyncio.to_thread(save_repo, repo, branch, tree_sha, blobs, files,
+                                               len(blobs) == len(entries))
+            if not files:
+                return
+            totals["saved"] += kept
+            totals["processed"] += 1
+            print(f"💾 {owner}/{name}@{branch} → kept {kept} css (total saved: {totals['saved']})")
+
+        await asyncio.gather(*(handle(r) for r in repos))
+
+        writer.close()
+        near.close()
+        cur.close()
+        conn.close()
+        elapsed = time.perf_counter() - started
+        st = gh.stats()
+        print(f"🎉 완료! 처리 레포 {totals['processed']}, 저장 파일 {totals['saved']}")
+        writer.report()
+        state.report()
+        dedupe.report()
+        near.report()
+        print(f"📊 요청 {st['requests']}회 / {elapsed:.1f}s ({st['requests'] / max(elapsed, 1e-9):.1f} req/s), "
+              f"core 남은 한도 {st['core_remaining']}")
+        print(f"📦 다운로드 모드: tarball {FETCH_MODES['archive']} · 파일별 {FETCH_MODES['per_file']}")
+        if HTTP_CACHE is not None:
+            HTTP_CACHE.report()
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    # 기본은 async 엔진, --sync 로 기존 순차 크롤러
+    if "--sync" in sys.argv:
+        run()
+    else:
+        asyncio.run(run_async())
@@ -0,0 +1,62 @@
+# github_archive.py
+# 레포 tarball 한 번으로 필요한 파일만 골라내기 (파일별 raw 다운로드 대체)
+# - tar.gz 스트림을 메모리에서 바로 풀면서 FILE_EXTS 에 맞는 항목만 읽음 (디스크 추출 없음)
+# - 트리에서 필요한 경로를 다 찾으면 나머지 스트림은 읽지 않고 중단
+# - 매칭 파일 수/레포 크기로 tarball vs 파일별 모드를 고름
+
+import os
+import tarfile
+from collections import Counter
+
+ARCHIVE_MIN_FILES = int(os.getenv("ARCHIVE_MIN_FILES", "15"))   # 이 이상이면 tarball
+ARCHIVE_MAX_MB = float(os.getenv("ARCHIVE_MAX_MB", "50"))       # 트리 전체가 이보다 크면 파일별
+
+# 실행 끝에 모드별 레포 수 리포트용
+FETCH_MODES = Counter()
+
+
+def code_entries(tree, exts):
+    """git tree → [(path, blob sha), ...] (확장자 필터)"""
+    return [(item["path"], item.get("sha")) for item in tree if item.get("path", "").endswith(exts)]
+
+
+def changed_entries(entries, known):
+    """증분 크롤: 지난번과 blob SHA 가 같은 경로는 제외 (known = {path: sha})"""
+    if not known:
+        return entries
+    return [(path, sha) for path, sha in entries if not sha or known.get(path) != sha]
+
+
+def should_use_archive(tree, n_matching):
+    if n_matching < ARCHIVE_MIN_FILES:
+        return False
+    total = sum(item.get("size", 0) for item in tree if item.get("type") == "blob")
+    return total <= ARCHIVE_MAX_MB * 1024 * 1024
+
+
+def read_archive(fileobj, entries, cache=None):
+    """
+    fileobj: tar.gz 바이트 스트림 (requests 의 r.raw, BytesIO 등)
+    entries: [(path, sha)] — 여기 있는 경로만 읽어서 [(path, text)] 반환
+    cache: http_cache.HttpCache 면 blob SHA 로 같이 저장 (다음엔 파일별 모드에서도 재사용)
+    """
+    wanted = dict(entries)
+    files = []
+    # "r|gz" = 스트리밍 모드: 앞에서부터 한 번만 읽음 (seek 없음)
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            # GitHub tarball 경로는 "{owner}-{repo}-{sha}/..." → 첫 디렉터리 제거
+            path = member.name.split("/", 1)[1] if "/" in member.name else member.name
+            if path not in wanted:
+                continue
+            data = tar.extractfile(member).read()
+            text = data.decode("utf-8", errors="replace")
+            files.append((path, text))
+            sha = wanted.pop(path)
+            if sha and cache is not None:
+                cache.put_blob(sha, text)
+            if not wanted:
+                break
+    return files
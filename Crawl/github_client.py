@@ -0,0 +1,202 @@
+# github_client.py
+# asyncio + httpx 기반 GitHub 클라이언트
+# - 호스트별 동시 요청 수 제한 (api.github.com / raw.githubusercontent.com)
+# - X-RateLimit-Remaining/Reset 을 모든 in-flight 요청이 공유하는 토큰 버킷으로 관리
+# - github_get 과 같은 retry/backoff 규칙 (연결 끊김, 5xx, rate limit)
+# pip install httpx
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from http_cache import cache_key
+
+# 로컬 mock 서버로 벤치마크할 때 바꿔 끼움
+API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com")
+RAW_BASE = os.getenv("GITHUB_RAW_BASE", "https://raw.githubusercontent.com")
+
+DEFAULT_HOST_LIMITS = {
+    urlsplit(API_BASE).netloc: 8,
+    urlsplit(RAW_BASE).netloc: 16,
+}
+
+
+class RateLimitBudget:
+    """
+    GitHub rate-limit 리소스(core/search) 하나에 대한 공유 토큰 버킷.
+    - 요청 전에 acquire() 로 토큰 1개 선점 → 동시에 날아가는 요청들이 남은 한도를 초과하지 않음
+    - 응답 헤더로 update() → 서버가 알려준 remaining/reset 으로 동기화
+    - 토큰이 바닥나면 reset 시각까지 모두 대기 (리셋 시점에 한 번에 다시 채워짐)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.remaining: Optional[int] = None  # 첫 응답 전에는 모름 → 제한 없이 진행
+        self.reset_at = 0.0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            while True:
+                now = time.time()
+                if self.remaining is None or self.remaining > 0:
+                    if self.remaining is not None:
+                        self.remaining -= 1
+                    return
+                if now >= self.reset_at:
+                    # 리셋 시각이 지났으면 다음 응답이 실제 값을 알려줄 때까지 열어둠
+                    self.remaining = None
+                    continue
+                wait = self.reset_at - now + 1
+                reset_time = datetime.fromtimestamp(self.reset_at).strftime("%H:%M:%S")
+                print(f"⏳ [{self.name}] rate limit 소진, {wait:.0f}s 대기 (reset @{reset_time})")
+                try:
+                    await asyncio.wait_for(self._cond.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def update(self, headers):
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        async with self._cond:
+            reset = float(reset)
+            remaining = int(remaining)
+            if reset > self.reset_at:
+                # 새 윈도우: 서버 값을 그대로 (이미 선점된 in-flight 는 곧 반영됨)
+                self.reset_at = reset
+                self.remaining = remaining
+            elif self.remaining is None or remaining < self.remaining:
+                self.remaining = remaining
+            self._cond.notify_all()
+
+    async def exhaust(self, reset: float):
+        """403/429 로 한도 초과를 통보받았을 때"""
+        async with self._cond:
+            self.remaining = 0
+            self.reset_at = max(self.reset_at, reset)
+
+
+class AsyncGitHubClient:
+    """
+    async with AsyncGitHubClient(token) as gh:
+        r = await gh.get(f"{API_BASE}/repos/{owner}/{repo}")
+    실패(재시도 초과)하면 None — github_get 과 동일한 계약.
+    """
+
+    def __init__(self, token: Optional[str], host_limits: Optional[Dict[str, int]] = None,
+                 max_retries: int = 5, timeout: float = 20, cache=None):
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        limits = host_limits or DEFAULT_HOST_LIMITS
+        self._client = httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=sum(limits.values()) + 4),
+        )
+        self._host_sems = {host: asyncio.Semaphore(n) for host, n in limits.items()}
+        self._default_sem = asyncio.Semaphore(4)
+        self.budgets = {"core": RateLimitBudget("core"), "search": RateLimitBudget("search")}
+        self.max_retries = max_retries
+        self.cache = cache  # http_cache.HttpCache (API 응답 ETag + raw blob)
+        self.requests = 0
+        self.status_counts: Dict[int, int] = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+
+    def _budget_for(self, url: str) -> Optional[RateLimitBudget]:
+        parts = urlsplit(url)
+        if parts.netloc != urlsplit(API_BASE).netloc:
+            return None  # raw 다운로드는 API 한도에 안 잡힘
+        return self.budgets["search"] if parts.path.startswith("/search/") else self.budgets["core"]
+
+    async def get(self, url: str, params=None, headers=None, cache: bool = True) -> Optional[httpx.Response]:
+        sem = self._host_sems.get(urlsplit(url).netloc, self._default_sem)
+        budget = self._budget_for(url)
+        retries = 0
+        # API 응답만 조건부 요청 (304 는 rate limit 에 안 잡힘). tarball 같은 큰 본문은 cache=False
+        key = cache_key(url, params)
+        use_cache = cache and self.cache is not None and budget is not None
+        cond = self.cache.conditional_headers(key) if use_cache else {}
+        while True:
+            if budget is not None:
+                await budget.acquire()
+            try:
+                async with sem:
+                    r = await self._client.get(url, params=params, headers={**(headers or {}), **cond})
+            except (httpx.ConnectError, httpx.ReadError, httpx.RemoteProtocolError, httpx.TimeoutException) as e:
+                retries += 1
+                if retries > self.max_retries:
+                    print(f"🚫 {type(e).__name__} — 재시도 초과, 스킵: {url}")
+                    return None
+                wait = 3 * retries
+                print(f"⚠️ 연결 끊김... {wait}s 대기 후 재시도 ({retries}/{self.max_retries})")
+                await asyncio.sleep(wait)
+                continue
+
+            self.requests += 1
+            self.status_counts[r.status_code] = self.status_counts.get(r.status_code, 0) + 1
+            if budget is not None:
+                await budget.update(r.headers)
+
+            # rate limit (primary: 403 + remaining 0, secondary: 429/403 + Retry-After)
+            if r.status_code in (403, 429):
+                retry_after = r.headers.get("Retry-After")
+                if r.headers.get("X-RateLimit-Remaining") == "0":
+                    reset = float(r.headers.get("X-RateLimit-Reset", "0") or 0)
+                    if budget is not None:
+                        await budget.exhaust(reset)
+                    else:
+                        await asyncio.sleep(max(0.0, reset - time.time() + 3))
+                    continue
+                if retry_after:
+                    print(f"⏳ secondary rate limit, {retry_after}s 대기")
+                    await asyncio.sleep(float(retry_after))
+                    continue
+
+            # 서버 일시 오류
+            if r.status_code in (502, 503, 504):
+                retries += 1
+                if retries > self.max_retries:
+                    print(f"🚫 GitHub {r.status_code} — 재시도 초과, 스킵: {url}")
+                    return None
+                wait = 2 * retries
+                print(f"⚠️ GitHub {r.status_code} — {wait}s 후 재시도")
+                await asyncio.sleep(wait)
+                continue
+
+            if use_cache:
+                if r.status_code == 304:
+                    cached = self.cache.load(key)
+                    if cached is not None:
+                        cached_headers, body = cached
+                        return httpx.Response(200, headers=cached_headers, content=body, request=r.request)
+                    cond = {}  # 캐시 항목이 없어졌으면 조건 없이 다시
+                    continue
+                if r.status_code == 200:
+                    self.cache.store(key, r.headers, r.content, bool(cond))
+
+            return r
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "status": dict(sorted(self.status_counts.items())),
+            "core_remaining": self.budgets["core"].remaining,
+            "search_remaining": self.budgets["search"].remaining,
+        }
@@ -0,0 +1,151 @@
+# http_cache.py
+# GitHub 크롤러용 디스크 HTTP 캐시 (sqlite)
+# - API 응답: ETag/Last-Modified 저장 → 재실행 시 If-None-Match 로 조건부 요청
+#   (304 응답은 GitHub rate limit 에 안 잡힘)
+# - raw 파일 본문: git tree 의 blob SHA 로 저장 → 내용이 같으면 다운로드 자체를 생략
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlencode
+
+GITHUB_CACHE_PATH = os.getenv("GITHUB_CACHE_PATH", ".github_cache.sqlite")
+
+
+def cache_key(url, params=None) -> str:
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+
+class HttpCache:
+    def __init__(self, path: str = GITHUB_CACHE_PATH):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL;")
+        self._db.execute("PRAGMA synchronous=NORMAL;")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,"
+            " headers TEXT NOT NULL, body BLOB NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS blobs (sha TEXT PRIMARY KEY, body BLOB NOT NULL)")
+        self._lock = threading.Lock()
+
+        self.revalidated = 0   # 304 → 캐시 본문 사용
+        self.refetched = 0     # 캐시는 있었지만 200 으로 새 본문
+        self.uncached = 0      # 캐시에 없던 요청
+        self.blob_hits = 0
+        self.blob_misses = 0
+
+    # --- API 응답 (조건부 요청) ---
+    def conditional_headers(self, key: str) -> dict:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return {}
+        etag, last_modified = row
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def load(self, key: str) -> Optional[tuple]:
+        """304 받았을 때 → (headers dict, body bytes)"""
+        with self._lock:
+            row = self._db.execute("SELECT headers, body FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.revalidated += 1
+        return json.loads(row[0]), row[1]
+
+    def store(self, key: str, headers, body: bytes, had_validator: bool):
+        """200 응답 저장. ETag/Last-Modified 없으면 조건부 요청을 못 하니 저장 안 함."""
+        if had_validator:
+            self.refetched += 1
+        else:
+            self.uncached += 1
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return
+        keep = {k: v for k, v in headers.items() if k.lower() in ("content-type", "etag", "last-modified", "link")}
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, last_modified, headers, body, stored_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, json.dumps(keep), body, time.time()),
+            )
+
+    # --- raw 파일 (blob SHA) ---
+    def get_blob(self, sha: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT body FROM blobs WHERE sha = ?", (sha,)).fetchone()
+        if row is None:
+            self.blob_misses += 1
+            return None
+        self.blob_hits += 1
+        return row[0].decode("utf-8", errors="replace")
+
+    def put_blob(self, sha: str, text: str):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO blobs (sha, body) VALUES (?, ?)", (sha, text.encode("utf-8")))
+
+    # --- 리포트 ---
+    def stats(self) -> dict:
+        with self._lock:
+            n_resp = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            n_blob = self._db.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+        size = sum(os.path.getsize(p) for p in (self.path, self.path + "-wal") if os.path.exists(p))
+        api_total = self.revalidated + self.refetched + self.uncached
+        blob_total = self.blob_hits + self.blob_misses
+        return {
+            "api_304": self.revalidated,
+            "api_200_changed": self.refetched,
+            "api_uncached": self.uncached,
+            "api_hit_rate": round(self.revalidated / api_total, 4) if api_total else 0.0,
+            "blob_hits": self.blob_hits,
+            "blob_misses": self.blob_misses,
+            "blob_hit_rate": round(self.blob_hits / blob_total, 4) if blob_total else 0.0,
+            "responses": n_resp,
+            "blobs": n_blob,
+            "size_mb": round(size / (1024 * 1024), 2),
+        }
+
+    def report(self):
+        st = self.stats()
+        print(
+            f"🗄️ HTTP 캐시 ({self.path}, {st['size_mb']} MB, 응답 {st['responses']}개 / blob {st['blobs']}개)\n"
+            f"   API: 304 {st['api_304']} · 변경 {st['api_200_changed']} · 신규 {st['api_uncached']}"
+            f" → hit {st['api_hit_rate']:.1%}\n"
+            f"   raw: hit {st['blob_hits']} · miss {st['blob_misses']} → hit {st['blob_hit_rate']:.1%}"
+        )
+
+    def close(self):
+        self._db.close()
+
+
+def requests_response_from_cache(url, headers, body):
+    """304 → 캐시 본문으로 200 requests.Response 를 만들어 기존 호출부가 그대로 쓰게"""
+    import requests
+    from requests.structures import CaseInsensitiveDict
+
+    r = requests.models.Response()
+    r.status_code = 200
+    r.url = url
+    r.headers = CaseInsensitiveDict(headers)
+    r._content = body
+    r.encoding = "utf-8"
+    return r
+
+
+def open_default_cache() -> Optional[HttpCache]:
+    """GITHUB_CACHE_PATH 를 빈 문자열로 주면 캐시 끔"""
+    return HttpCache(GITHUB_CACHE_PATH) if GITHUB_CACHE_PATH else None
@@ -0,0 +1,77 @@
+# keyword_match.py
+# GitHub 크롤러 필터(is_artistic / is_pure_ui)용 다중 키워드 매처
+# - 파일 전체를 lower() 로 복사하지 않고 CHUNK 글자씩 소문자화 → 청크마다 키워드 확인 → 처음 걸린 청크에서 종료
+#   (수 MB 번들도 복사본은 청크 하나 크기, 앞쪽에 키워드가 있으면 나머지는 보지 않음)
+# - 청크 사이는 (가장 긴 키워드 길이 - 1) 글자를 겹쳐서 경계에 걸친 키워드도 찾음
+# - counts(): 키워드별 등장 횟수 (품질 점수용)
+# - 문자열 / 스트리밍 청크(파일·응답을 읽는 중) 둘 다
+# 정규식 하나(|)로 합치거나 Aho–Corasick 를 순수 파이썬으로 돌리는 것보다
+# str 의 `in` (C 구현) 을 청크 단위로 여러 번 하는 쪽이 CPython 에서 훨씬 빠름 → bench_keyword_match.py
+
+from collections import Counter
+
+CHUNK = 64 * 1024
+
+
+class KeywordMatcher:
+    """
+    m = KeywordMatcher(["@keyframes", "gradient", ...])
+    m.search(text)                 # 처음 찾은 키워드 또는 None
+    m.counts(text)                 # Counter({"gradient": 3, ...})
+    m.search_chunks(chunks)        # 스트리밍 (파일/응답을 청크로 읽으면서)
+    """
+
+    def __init__(self, keywords, chunk=CHUNK):
+        self.keywords = tuple(dict.fromkeys(k.lower() for k in keywords))
+        self.chunk = chunk
+        self._overlap = max(len(k) for k in self.keywords) - 1
+
+    def _windows(self, chunks):
+        """(소문자 창, 앞 창과 겹친 앞부분) — 겹친 부분 안에서 끝나는 매치는 이미 본 것"""
+        tail = ""
+        for chunk in chunks:
+            if not chunk:
+                continue
+            window = tail + chunk.lower()
+            yield window, tail
+            tail = window[-self._overlap:] if self._overlap else ""
+
+    def _split(self, text):
+        return (text[i:i + self.chunk] for i in range(0, len(text), self.chunk))
+
+    # --- 청크 스트리밍 ---
+    def search_chunks(self, chunks):
+        for window, _ in self._windows(chunks):
+            for k in self.keywords:
+                if k in window:
+                    return k  # 첫 매치에서 종료 (남은 청크는 읽지 않음)
+        return None
+
+    def counts_chunks(self, chunks) -> Counter:
+        hits = Counter()
+        for window, tail in self._windows(chunks):
+            for k in self.keywords:
+                n = window.count(k) - (tail.count(k) if tail else 0)
+                if n:
+                    hits[k] += n
+        return hits
+
+    # --- 문자열 전체 (청크 하나 이하면 제너레이터 없이 바로) ---
+    def search(self, text):
+        if not text:
+            return None
+        if len(text) > self.chunk:
+            return self.search_chunks(self._split(text))
+        lower = text.lower()
+        for k in self.keywords:
+            if k in lower:
+                return k
+        return None
+
+    def counts(self, text) -> Counter:
+        if not text:
+            return Counter()
+        if len(text) > self.chunk:
+            return self.counts_chunks(self._split(text))
+        lower = text.lower()
+        return Counter({k: n for k in self.keywords if (n := lower.count(k))})
@@ -0,0 +1,340 @@
+# near_dupe.py
+# 크롤러 공용 유사 중복(near-duplicate) 인덱스: 정규화 토큰 shingle → MinHash → LSH
+# - 포크된 CSS 레포처럼 공백/클래스명/색상만 다른 복사본을 저장·임베딩 전에 걸러냄
+# - 정규화: 주석 제거, 소문자, 색상(#hex / rgb() / hsl())·클래스/ID 이름 → 자리표시자
+#   (클래스/ID 이름은 CSS 규칙이 있는 코드에서만 — Tailwind 마크업은 클래스가 곧 스타일이라 그대로)
+#   숫자는 그대로 둠: CSS 아트는 box-shadow 픽셀, keyframe 오프셋, transform 값 자체가 작품이라
+#   숫자를 지우면 서로 다른 작품이 같은 shingle 이 됨
+# - MinHash NUM_PERM 개 (mod 2^31-1, uint32 로 보관 → 문서당 256바이트), LSH 는 BANDS 개 밴드
+#   후보는 서명 일치율(≈ Jaccard) 이 threshold 이상일 때만 중복으로 판정
+# - 서명은 public.component_minhash 에 namespace 별로 저장 → 다음 실행에서 다시 읽어 LSH 재구성
+#   follow(writer) 로 행 writer 에 묶으면 행이 commit 될 때마다 그 행들의 서명을 같이 저장
+#   (중간에 죽어도 commit 된 행의 서명은 남음, 아직 commit 안 된 행의 서명은 저장하지 않음)
+# - 정규화 규칙이 바뀌면 NORMALIZE_VERSION 을 올림 → 옛 규칙으로 만든 서명은 읽지 않음
+#   저장된 행의 서명은 python near_dupe.py components css_art ui 로 새 규칙으로 다시 계산
+# psycopg2 / psycopg(3) 커넥션 모두 사용 가능
+# pip install numpy
+
+import argparse
+import os
+import re
+import threading
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+from bulk_writer import BulkWriter
+from dedupe import SOURCES
+
+TABLE = "public.component_minhash"
+COLUMNS = ("namespace", "key", "signature")
+
+NUM_PERM = 64
+BANDS = 16            # 16 밴드 × 4 행 → Jaccard ~0.5 부터 후보, threshold 로 최종 판정
+SHINGLE = 5           # 토큰 5-gram
+THRESHOLD = 0.8
+NORMALIZE_VERSION = 3  # 2: 숫자 유지 / 3: Uiverse 는 합본 문서가 아니라 컴포넌트 원본(html + css)
+_PRIME = (1 << 31) - 1
+
+# 서명이 실행 간에 비교 가능해야 하므로 순열 계수는 고정 시드
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, _PRIME, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=NUM_PERM).astype(np.uint64)
+
+SQL_CREATE = f"""
+CREATE TABLE IF NOT EXISTS {TABLE} (
+    namespace  text NOT NULL,
+    key        text NOT NULL,
+    signature  bytea NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (namespace, key)
+);
+"""
+
+ON_CONFLICT = "ON CONFLICT (namespace, key) DO UPDATE SET signature = EXCLUDED.signature, created_at = now()"
+
+# ===================== 정규화 / shingle =====================
+_COMMENT_RE = re.compile(r"/\*.*?\*/|<!--.*?-->", re.S)
+_COLOR_RE = re.compile(r"#[0-9a-f]{3,8}\b|\b(?:rgba?|hsla?)\([^)]*\)")
+_CLASS_ATTR_RE = re.compile(r"\b(class|id)\s*=\s*([\"'])[^\"']*\2")
+_SELECTOR_RE = re.compile(r"(?<![\w-])[.#]-?[a-z_][\w-]*")
+_TOKEN_RE = re.compile(r"[a-z_][\w-]*|[.#@]c|-?\d*\.?\d+(?:[a-z]+|%)?|[{}():;<>/=,\[\]*+~>]")
+
+
+def normalize(code: str) -> str:
+    s = _COMMENT_RE.sub(" ", code.lower())
+    s = _COLOR_RE.sub(" color ", s)
+    if "<style" in s or "<" not in s:  # CSS 파일 / <style> 포함 문서 → 클래스명은 임의 이름
+        s = _CLASS_ATTR_RE.sub(r'\1="c"', s)
+        s = _SELECTOR_RE.sub(lambda m: m.group(0)[0] + "c", s)
+    return s
+
+
+def shingles(code: str, k: int = SHINGLE) -> set:
+    tokens = _TOKEN_RE.findall(normalize(code))
+    if len(tokens) <= k:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+
+def signature(code: str) -> np.ndarray:
+    """MinHash 서명 (uint32 × NUM_PERM). 토큰이 없으면 전부 최대값"""
+    sh = shingles(code)
+    if not sh:
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint32)
+    h = np.fromiter((zlib.crc32(s.encode()) % _PRIME for s in sh), dtype=np.uint64, count=len(sh))
+    phv = (np.outer(h, _A) + _B) % _PRIME          # (shingle 수, NUM_PERM)
+    return phv.min(axis=0).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+# ===================== 인덱스 =====================
+class NearDupIndex:
+    """
+    near = NearDupIndex.load(conn, "ui")            # 저장된 서명 읽어 LSH 구성
+    dup = near.claim(key, code)                     # 유사 중복이면 기존 key, 아니면 None (+ 등록)
+    near.update(key, code)                          # 이미 저장된 key 의 새 버전 → 검사 없이 서명 교체
+    near.follow(writer)                             # writer 가 commit 할 때마다 저장된 행의 서명도 저장
+    ...
+    writer.add(row); near.saved(key)                # 행을 writer 에 넘긴 뒤 (UPDATE 면 cur.execute 뒤)
+    ...
+    writer.close(); near.close()                    # 남은 서명 저장
+    """
+
+    def __init__(self, namespace, threshold=THRESHOLD, bands=BANDS):
+        assert NUM_PERM % bands == 0
+        self.namespace = namespace
+        self.threshold = threshold
+        self.bands = bands
+        self._rows = NUM_PERM // bands
+        self._keys = []                    # doc id → key
+        self._sigs = []                    # doc id → 서명
+        self._doc_of = {}                  # key → 현재 doc id (같은 key 의 새 버전이 오면 교체)
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+        self._ready = []                   # 행이 writer 에 넘어간 doc id (다음 flush 때 저장)
+        self._writer = None
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.near_dups = 0
+
+    @property
+    def _db_namespace(self):
+        return f"{self.namespace}:v{NORMALIZE_VERSION}"
+
+    @classmethod
+    def load(cls, conn, namespace, **kw):
+        index = cls(namespace, **kw)
+        try:
+            with conn.cursor() as cur:
+                cur.execute(SQL_CREATE)
+                cur.execute(f"SELECT key, signature FROM {TABLE} WHERE namespace = %s", (index._db_namespace,))
+                rows = cur.fetchall()
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"⚠️ [{namespace}] 유사 중복 서명 로드 실패 (빈 인덱스로 시작): {e}")
+            rows = []
+        for row in rows:
+            key, sig = (row["key"], row["signature"]) if isinstance(row, dict) else row
+            sig = np.frombuffer(bytes(sig), dtype=np.uint32)
+            if len(sig) == NUM_PERM:       # NUM_PERM 이 바뀌기 전 서명은 버림
+                index._insert(key, sig)
+        return index
+
+    def _band_keys(self, sig):
+        r = self._rows
+        return [sig[i * r:(i + 1) * r].tobytes() for i in range(self.bands)]
+
+    def _insert(self, key, sig) -> int:
+        old = self._doc_of.get(key)
+        if old is not None:  # 같은 key 의 옛 서명은 버킷에서 빼서 더 이상 후보로 안 나오게
+            for band, bk in zip(self._buckets, self._band_keys(self._sigs[old])):
+                band[bk].remove(old)
+        doc = len(self._keys)
+        self._keys.append(key)
+        self._sigs.append(sig)
+        self._doc_of[key] = doc
+        for band, bk in zip(self._buckets, self._band_keys(sig)):
+            band[bk].append(doc)
+        return doc
+
+    def _query(self, sig, exclude=None):
+        seen = {exclude}
+        best, best_sim = None, 0.0
+        for band, bk in zip(self._buckets, self._band_keys(sig)):
+            for doc in band.get(bk, ()):
+                if doc in seen:
+                    continue
+                seen.add(doc)
+                sim = similarity(sig, self._sigs[doc])
+                if sim > best_sim:
+                    best, best_sim = doc, sim
+        if best is not None and best_sim >= self.threshold:
+            return self._keys[best], best_sim
+        return None, best_sim
+
+    def find(self, code: str, key=None):
+        """(유사한 기존 key 또는 None, 추정 유사도) — 등록하지 않음. key 를 주면 자기 자신의 옛 서명은 제외"""
+        sig = signature(code)
+        with self._lock:
+            return self._query(sig, self._doc_of.get(key))
+
+    def claim(self, key: str, code: str):
+        """
+        유사 중복이면 기존 key 반환, 아니면 등록하고 None.
+        같은 key 가 이미 있으면 (재크롤에서 파일이 바뀐 경우) 자기 옛 서명과는 비교하지 않고 새 서명으로 교체.
+        """
+        sig = signature(code)  # 계산은 lock 밖에서 (여러 스레드 병렬)
+        with self._lock:
+            self.checked += 1
+            dup, _ = self._query(sig, self._doc_of.get(key))
+            if dup is not None:
+                self.near_dups += 1
+                return dup
+            self._insert(key, sig)
+            return None
+
+    def update(self, key: str, code: str):
+        """
+        이미 저장된 행의 새 버전 (재크롤에서 파일이 바뀜) → 비교 없이 서명만 교체.
+        행은 무조건 새 버전으로 UPDATE 되므로 여기서 중복 판정으로 건너뛰면 옛 내용이 DB 에 영영 남음.
+        """
+        sig = signature(code)
+        with self._lock:
+            self._insert(key, sig)
+
+    # --- 저장 ---
+    def follow(self, writer):
+        """행 writer 의 flush(commit) 직후마다 saved() 된 서명을 같은 커넥션으로 저장"""
+        self._writer = BulkWriter(writer.conn, TABLE, COLUMNS, on_conflict=ON_CONFLICT,
+                                  max_rows=1_000_000, max_seconds=float("inf"),  # flush 는 행 writer 따라서만
+                                  name=f"minhash:{self.namespace}")
+        writer.on_flush = self.flush
+        return self
+
+    def saved(self, key):
+        """key 의 행을 writer 에 넘겼음 → 그 행이 commit 되는 flush 뒤에 서명 저장"""
+        with self._lock:
+            doc = self._doc_of.get(key)
+            if doc is not None:
+                self._ready.append(doc)
+
+    def flush(self) -> int:
+        with self._lock:
+            ready, self._ready = self._ready, []
+        if self._writer is None or not ready:
+            return 0
+        for doc in dict.fromkeys(ready):
+            if self._doc_of.get(self._keys[doc]) != doc:
+                continue  # 이번 실행 중에 다시 교체된 옛 버전 (한 문장에 같은 key 두 번이면 ON CONFLICT 실패)
+            self._writer.add((self._db_namespace, self._keys[doc], self._sigs[doc].tobytes()))
+        return self._writer.flush()
+
+    def close(self):
+        """남은 서명 저장 (보통은 writer.close() 의 flush 에서 이미 저장됨)"""
+        self.flush()
+
+    # --- 리포트 ---
+    def memory_bytes(self) -> int:
+        # 서명 ndarray (데이터 + 객체 헤더) + 밴드 버킷 (밴드마다 문서당 bytes 키 + 리스트 + dict 슬롯 ≈ 185바이트)
+        # tracemalloc 으로 잰 값 기준의 추정치
+        n = len(self._sigs)
+        return n * (NUM_PERM * 4 + 112) + n * self.bands * 185 + sum(len(k) + 49 for k in self._keys)
+
+    def stats(self) -> dict:
+        return {
+            "indexed": len(self._doc_of),
+            "checked": self.checked,
+            "near_dups": self.near_dups,
+            "dedupe_ratio": round(self.near_dups / self.checked, 3) if self.checked else 0.0,
+            "memory_kb": round(self.memory_bytes() / 1024, 1),
+        }
+
+    def report(self):
+        st = self.stats()
+        print(
+            f"🧬 [{self.namespace}] 유사 중복: 검사 {st['checked']} · 중복 {st['near_dups']}"
+            f" ({st['dedupe_ratio']:.1%}) · 인덱스 {st['indexed']}개 · 메모리 ~{st['memory_kb']}KB"
+        )
+
+
+# ===================== 재계산 (NORMALIZE_VERSION 을 올린 뒤) =====================
+# namespace → 코드 컬럼 (테이블/키는 dedupe.SOURCES 와 같음)
+CODE_COLUMNS = {
+    "components": "components_code",
+    "css_art": "art_css",
+    "ui": "ui_full_code",
+}
+_STYLE_RE = re.compile(r"<style[^>]*>([\s\S]*?)</style>", re.I)
+_BODY_RE = re.compile(r"<body[^>]*>([\s\S]*?)</body>", re.I)
+_UIVERSE_SHELL_CSS = "html, body { margin:0; padding:16px; }"
+
+
+def uiverse_raw(doc: str) -> str:
+    """
+    button_crwal.build_combined_document 합본 → 컴포넌트 원본 (body + 컴포넌트 CSS).
+    크롤러가 claim 하는 html + "\n" + css 와 같은 모양 (모든 행에 같은 doctype/head/reset 은 빼야
+    짧은 컴포넌트끼리 boilerplate shingle 때문에 유사도가 부풀지 않음)
+    """
+    css = "\n".join(_STYLE_RE.findall(doc or "")).replace(_UIVERSE_SHELL_CSS, "")
+    body = _BODY_RE.search(doc or "")
+    return f"{body.group(1).strip() if body else ''}\n{css.strip()}"
+
+
+def rebuild(conn, namespace, batch=5_000) -> int:
+    """저장된 행의 서명을 현재 규칙으로 다시 계산해 저장, 옛 버전 서명은 삭제. 반환: 행 수"""
+    table, key_sql = SOURCES[namespace]
+    library_sql = "components_library" if namespace == "components" else "NULL"
+    index = NearDupIndex(namespace)
+    with conn.cursor() as cur:
+        cur.execute(SQL_CREATE)
+        cur.execute(
+            f"SELECT {key_sql}, {CODE_COLUMNS[namespace]}, {library_sql} FROM {table}"
+            f" WHERE {key_sql} IS NOT NULL AND {CODE_COLUMNS[namespace]} IS NOT NULL"
+        )
+        rows = cur.fetchall()
+    writer = BulkWriter(conn, TABLE, COLUMNS, on_conflict=ON_CONFLICT, max_rows=batch, max_seconds=float("inf"),
+                        name=f"minhash:{namespace}")
+    seen = set()
+    for row in rows:
+        key, code, library = row.values() if isinstance(row, dict) else row
+        if key in seen:  # 한 INSERT 문에 같은 key 가 두 번이면 ON CONFLICT 실패
+            continue
+        seen.add(key)
+        raw = uiverse_raw(code) if library == "universe" else code
+        writer.add((index._db_namespace, key, signature(raw).tobytes()))
+    writer.close()
+    with conn.cursor() as cur:
+        cur.execute(
+            f"DELETE FROM {TABLE} WHERE namespace = %s OR (namespace LIKE %s AND namespace <> %s)",
+            (namespace, f"{namespace}:v%", index._db_namespace),
+        )
+    conn.commit()
+    return writer.rows_written
+
+
+def main():
+    import psycopg2
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    ap = argparse.ArgumentParser(description="유사 중복 서명 재계산 (NORMALIZE_VERSION 을 올린 뒤)")
+    ap.add_argument("namespaces", nargs="+", choices=sorted(CODE_COLUMNS))
+    args = ap.parse_args()
+
+    dsn = os.getenv("PG_DSN") or "dbname=daelim user=admin password=qwe123 host=localhost port=5432"
+    conn = psycopg2.connect(dsn)
+    try:
+        for ns in args.namespaces:
+            n = rebuild(conn, ns)
+            print(f"🧬 [{ns}] 서명 {n}개 재계산 (v{NORMALIZE_VERSION})")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# pipeline.py
+# 스레드 + bounded queue 로 만든 단계별(producer/consumer) 크롤 파이프라인 도우미
+# - 단계마다 처리 수/에러 수/처리량 카운터
+# - 주기적으로 큐 깊이 + 단계별 처리량을 한 줄로 출력 (어느 단계가 병목인지 보이게)
+
+import threading
+import time
+
+STOP = object()  # 단계 종료 신호 (워커 수만큼 넣음)
+
+
+class Stage:
+    """단계 하나의 카운터. queue = 이 단계가 읽는 입력 큐 (깊이 표시용)"""
+
+    def __init__(self, name, queue=None):
+        self.name = name
+        self.queue = queue
+        self.done = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def tick(self, ok=True):
+        with self._lock:
+            if ok:
+                self.done += 1
+            else:
+                self.errors += 1
+
+    def rate(self) -> float:
+        return self.done / max(time.perf_counter() - self._started, 1e-9)
+
+    def describe(self) -> str:
+        s = f"{self.name} {self.done}"
+        if self.errors:
+            s += f"(err {self.errors})"
+        s += f" {self.rate() * 60:.0f}/min"
+        if self.queue is not None:
+            s += f" q={self.queue.qsize()}/{self.queue.maxsize}"
+        return s
+
+
+class ProgressMonitor(threading.Thread):
+    """interval 초마다 emit(단계 요약 한 줄). stop() 하면 마지막 줄 한 번 더 출력"""
+
+    def __init__(self, stages, interval=5.0, emit=print):
+        super().__init__(daemon=True)
+        self.stages = stages
+        self.interval = interval
+        self.emit = emit
+        self._stopped = threading.Event()
+
+    def line(self) -> str:
+        return " → ".join(s.describe() for s in self.stages)
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            self.emit(self.line())
+
+    def stop(self):
+        self._stopped.set()
+        self.emit(self.line())
@@ -0,0 +1,564 @@
+# preview_builder.py
+# 카드 미리보기용 iframe 문서를 저장 시점(크롤/백필)에 한 번만 만들기
+# - 예전 프론트 chooseSrcDoc (frontend/scripts/preview-builder.mjs) 과 같은 규칙을 서버에서:
+#   (test_preview_parity.py 가 JS 로 만든 preview_golden/ 과 비교)
+#   완전 문서 → CSS-only body 복구 / 부분 문서 보강 (버튼 마크업 합성, Press Start 2P 패턴)
+#   스니펫   → Tailwind 감지 시 CDN + grey→gray 호환 shim, 아이콘/폰트 CDN 링크를 head 에
+# - Tailwind 호환 shim 은 코드에 실제로 쓰인 클래스 규칙만 넣음 (전체 shim 은 수십 KB)
+# - 결과는 components_preview_html / components_needs_tailwind 에 저장 → /components 가 그대로 내려줌
+# - 카드 목록 필터(버튼 흔적 + "Button" 텍스트)도 여기서 한 번 → components_is_button
+#   (프론트는 이 플래그만 보고, 카드마다 정규식을 돌리거나 srcDoc 을 만들지 않음)
+# - tailwind_static.py 가 컴파일해 둔 CSS (components_tailwind_css) 는 PREVIEW_STATIC_TAILWIND=1 (또는 --static-tailwind)
+#   일 때만 CDN 대신 인라인 — tailwind_parity.py 로 CDN 렌더링과 같다는 게 확인되기 전엔 CDN 미리보기 유지
+# 사용법 (기존 행 백필): python preview_builder.py [--all] [--batch 500] [--static-tailwind]
+# psycopg2 / psycopg(3) 커넥션 모두 사용 가능 (ensure_preview_columns)
+
+import argparse
+import os
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+TABLE = "public.components_tbl_test"
+PREVIEW_COLUMN = "components_preview_html"
+NEEDS_TAILWIND_COLUMN = "components_needs_tailwind"
+BUTTON_COLUMN = "components_is_button"
+TAILWIND_CSS_COLUMN = "components_tailwind_css"
+# CDN 미리보기와 오프라인 컴파일(frontend/scripts/package.json) 이 같은 버전이어야 결과가 같음
+TAILWIND_VERSION = "3.4.17"
+# 정적 CSS 미리보기 사용 여부 (기본 off: 검증 안 된 CSS 가 CDN 미리보기를 대체하지 않게)
+STATIC_TAILWIND = os.getenv("PREVIEW_STATIC_TAILWIND", "0") == "1"
+
+SQL_ENSURE_COLUMNS = f"""
+ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS {NEEDS_TAILWIND_COLUMN} boolean;
+ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS {TAILWIND_CSS_COLUMN} text;
+ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS {BUTTON_COLUMN} boolean;
+"""
+
+
+class Preview(NamedTuple):
+    html: str
+    needs_tailwind: bool
+    is_button: bool
+
+
+def ensure_preview_columns(conn):
+    """components_needs_tailwind / components_tailwind_css / components_is_button 컬럼 보장 (크롤러가 COPY 하기 전에)"""
+    with conn.cursor() as cur:
+        cur.execute(SQL_ENSURE_COLUMNS)
+    conn.commit()
+
+
+# ===================== 공통 유틸 =====================
+def decode_entities(s: str) -> str:
+    return (s or "").replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&") \
+        .replace("&quot;", '"').replace("&#39;", "'")
+
+
+def is_full_html_document(s: str) -> bool:
+    s = (s or "").strip().lower()
+    return s.startswith("<!doctype") or "<html" in s or "<head" in s or "<body" in s
+
+
+def fix_common_css_typos(code: str) -> str:
+    return re.sub(r"0%\.\s*to", "0%, to", code or "")
+
+
+_CLASS_ATTR_RE = re.compile(r"""class\s*=\s*(["'])(.*?)\1""", re.I | re.S)
+_SCRIPT_RE = re.compile(r"<script[^>]*>([\s\S]*?)</script>", re.I)
+_STRING_RE = re.compile(r"""(["'`])((?:(?!\1)[^\\\n]|\\.)*)\1""")
+
+
+def class_tokens(html: str) -> set:
+    return {tok for m in _CLASS_ATTR_RE.finditer(html or "") for tok in m.group(2).split()}
+
+
+def used_class_tokens(html: str) -> set:
+    """class 속성 토큰 + <script> 안 문자열 토큰 (classList.add('bg-grey-200') 처럼 스크립트가 붙이는 클래스)"""
+    tokens = class_tokens(html)
+    for script in _SCRIPT_RE.findall(html or ""):
+        for _, literal in _STRING_RE.findall(script):
+            tokens.update(literal.split())
+    return tokens
+
+
+# ===================== 카드 목록 필터 =====================
+_BUTTON_SIGNATURE_RE = re.compile(r"""<(button)\b|role=["']button["']|class=["'][^"']*\b(btn|button)\b""", re.I)
+_BUTTON_TEXT_RE = re.compile(r">[^<]*Button[^<]*<", re.I)
+
+
+def looks_like_button(code: str, preview_html: str) -> bool:
+    """원본 코드에 버튼 흔적 + "Button" 텍스트, 미리보기 문서에도 버튼 흔적 (iframe 품질 검사는 여전히 브라우저에서)"""
+    return (_BUTTON_SIGNATURE_RE.search(code or "") is not None
+            and _BUTTON_TEXT_RE.search(code or "") is not None
+            and _BUTTON_SIGNATURE_RE.search(preview_html or "") is not None)
+
+
+# ===================== Tailwind 감지 / head =====================
+_TW_RE = re.compile(
+    r"\b(bg|text|border|shadow|rounded|p|px|py|m|mx|my|flex|grid|gap|justify|items|w|h|min-w|min-h|max-w|max-h"
+    r"|overflow|object|z|inset|top|left|right|bottom|translate|rotate|scale|skew)-[a-z0-9]",
+    re.I,
+)
+
+
+def looks_like_tailwind(html: str) -> bool:
+    classes = " ".join(m.group(2) for m in _CLASS_ATTR_RE.finditer(html or ""))
+    return bool(_TW_RE.search(classes))
+
+
+_SHIM_COLORS = [
+    "gray", "grey", "red", "orange", "amber", "yellow", "lime", "green", "emerald", "teal",
+    "cyan", "sky", "blue", "indigo", "violet", "purple", "fuchsia", "pink", "rose",
+]
+_SHIM_SHADES = [50, 100, 200, 300, 400, 500, 600, 700, 800, 900]
+_SHIM_VARIANTS = ["hover", "focus", "active"]
+_SHIM_PROPS = ["bg", "text", "border"]
+
+
+@lru_cache(maxsize=1)
+def _legacy_shim_rules() -> dict:
+    """옛 Tailwind 클래스 (grey-*, 색상-light/dark, rounded-0..3) → {클래스: @apply 규칙}"""
+    rules = {}
+
+    def add(cls, target):
+        rules[cls] = f".{cls} {{ @apply {target}; }}"
+        for v in _SHIM_VARIANTS:
+            rules[f"{v}:{cls}"] = f".{v}\\:{cls}:{v} {{ @apply {v}:{target}; }}"
+
+    for prop in _SHIM_PROPS:
+        for n in _SHIM_SHADES:
+            add(f"{prop}-grey-{n}", f"{prop}-gray-{n}")
+        add(f"{prop}-grey", f"{prop}-gray-500")
+        for c in _SHIM_COLORS:
+            base = "gray" if c == "grey" else c
+            add(f"{prop}-{c}", f"{prop}-{base}-500")
+            add(f"{prop}-{c}-light", f"{prop}-{base}-400")
+            add(f"{prop}-{c}-dark", f"{prop}-{base}-600")
+    for i, target in enumerate(["rounded-none", "rounded-sm", "rounded", "rounded-lg"]):
+        rules[f"rounded-{i}"] = f".rounded-{i} {{ @apply {target}; }}"
+    return rules
+
+
+def legacy_shim_rules(html: str, layer: bool = True) -> str:
+    """
+    코드에 쓰인 옛 클래스만 골라 만든 @apply 규칙, 없으면 빈 문자열.
+    layer=False: @layer 없이 (오프라인 컴파일 — 레이어 안 규칙은 content 에 클래스가 있어야만 남아서
+    hover:grey-* 같은 이름은 빠질 수 있음)
+    """
+    rules = _legacy_shim_rules()
+    used = sorted(tok for tok in used_class_tokens(html) if tok in rules)
+    if not used:
+        return ""
+    body = "\n".join(rules[tok] for tok in used)
+    return f"@layer utilities {{\n{body}\n}}" if layer else body
+
+
+def legacy_shim_css(html: str) -> str:
+    """CDN 용 shim (<style type="text/tailwindcss">), 없으면 빈 문자열"""
+    rules = legacy_shim_rules(html)
+    return f'<style type="text/tailwindcss">\n{rules}\n</style>' if rules else ""
+
+
+def external_deps(html: str) -> str:
+    html = html or ""
+    lines = []
+    if re.search(r"\bfa[srlb]?-", html) or re.search(r"font-awesome", html, re.I):
+        lines.append('<link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.2/css/all.min.css" referrerpolicy="no-referrer" />')
+    if re.search(r"\bri-[\w-]+", html):
+        lines.append('<link href="https://cdn.jsdelivr.net/npm/remixicon@4.3.0/fonts/remixicon.css" rel="stylesheet">')
+    if re.search(r"\bbx[sl]?-[\w-]+", html):
+        lines.append('<link href="https://unpkg.com/boxicons@2.1.4/css/boxicons.min.css" rel="stylesheet">')
+    if re.search(r"\bmaterial-symbols-(?:outlined|rounded|sharp)\b", html):
+        for fam in ("Outlined", "Rounded", "Sharp"):
+            lines.append(f'<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Material+Symbols+{fam}:opsz,wght,FILL,GRAD@20..48,200..700,0..1,-50..200" />')
+    if re.search(r"press\s*start\s*2p", html, re.I):
+        lines.append('<link href="https://fonts.googleapis.com/css2?family=Press+Start+2P&display=swap" rel="stylesheet">')
+    return "\n".join(lines)
+
+
+def extract_links(html: str) -> str:
+    return "\n".join(
+        tag for tag in re.findall(r"<link[^>]+>", html or "", re.I)
+        if re.search(r"fonts\.googleapis\.com|gstatic|font-awesome|remixicon|boxicons|material", tag, re.I)
+    )
+
+
+def build_snippet_document(code: str, tailwind_css: Optional[str] = None) -> Preview:
+    """스니펫 → 완전 문서 (Tailwind 면 컴파일된 CSS 인라인, 없으면 CDN + preflight off + 필요한 shim)"""
+    needs_tw = looks_like_tailwind(code)
+    head = []
+    if tailwind_css is not None:
+        head.append(f"<style>\n{tailwind_css}\n</style>")
+        needs_tw = False  # 스크립트 없이 렌더링
+    elif needs_tw:
+        head.append('<script>window.tailwind = { config: { corePlugins: { preflight: false } } };</script>')
+        head.append(f'<script src="https://cdn.tailwindcss.com/{TAILWIND_VERSION}"></script>')
+        shim = legacy_shim_css(code)
+        if shim:
+            head.append(shim)
+    deps = external_deps(code)
+    if deps:
+        head.append(deps)
+    links = extract_links(code)
+    if links:
+        head.append(links)
+    doc = f"""<!doctype html>
+<html>
+  <head>
+    <meta charset="utf-8"/>
+    <meta name="viewport" content="width=device-width, initial-scale=1"/>
+    {chr(10).join(head)}
+    <style>
+      html,body{{margin:0;padding:0}}
+      ._preview-root{{max-width:100%;padding:12px}}
+    </style>
+  </head>
+  <body>
+    <div class="_preview-root">
+      {fix_common_css_typos(code)}
+    </div>
+  </body>
+</html>"""
+    return Preview(doc, needs_tw, looks_like_button(code, doc))
+
+
+# ===================== 완전 문서 보강 =====================
+_BODY_RE = re.compile(r"<body[^>]*>([\s\S]*?)</body>", re.I)
+_HEAD_RE = re.compile(r"<head[^>]*>([\s\S]*?)</head>", re.I)
+_STYLE_RE = re.compile(r"<style[^>]*>([\s\S]*?)</style>", re.I)
+PREVIEW_BASE_CSS = "html,body{margin:0;padding:16px}button{display:inline-block}svg{display:block}"
+
+
+def body_inner(html: str) -> str:
+    m = _BODY_RE.search(html or "")
+    return m.group(1) if m else ""
+
+
+def _body_or_rest(html: str) -> str:
+    # <body> 가 없으면 브라우저 파서처럼 head 밖 나머지를 body 로 취급
+    m = _BODY_RE.search(html)
+    if m:
+        return m.group(1)
+    rest = _HEAD_RE.sub("", html)
+    return re.sub(r"<!doctype[^>]*>|</?html[^>]*>", "", rest, flags=re.I)
+
+
+def set_body_inner(html: str, inner: str) -> str:
+    if not re.search(r"<body", html, re.I):
+        return html
+    return _BODY_RE.sub(lambda _: f"<body>{inner}</body>", html, count=1)
+
+
+def add_head_styles(html: str, css: str) -> str:
+    extra = f"<style>{css}</style>"
+    if re.search(r"</head>", html, re.I):
+        return re.sub(r"</head>", lambda _: f"{extra}</head>", html, count=1, flags=re.I)
+    return re.sub(r"<html[^>]*>", lambda m: f"{m.group(0)}<head>{extra}</head>", html, count=1, flags=re.I)
+
+
+def _fix_style_blocks(html: str) -> str:
+    return re.sub(r"<style[^>]*>[\s\S]*?</style>", lambda m: fix_common_css_typos(m.group(0)), html, flags=re.I)
+
+
+def body_looks_like_css_only(html: str) -> bool:
+    t = _body_or_rest(html).strip()
+    return bool(t) and "{" in t and "}" in t and "<" not in t and ">" not in t
+
+
+def _rule(css, selector_re):
+    return re.search(r"(^|\})\s*" + selector_re + r"\s*\{", css) is not None
+
+
+def detect_css_features(css: str) -> dict:
+    s = css or ""
+    first = re.search(r"\.([A-Za-z_][\w-]*)\s*\{", s)
+    return {
+        "btn_base": _rule(s, r"button") or _rule(s, r"\.button"),
+        "btn_span": _rule(s, r"button\s+span"),
+        "pat_container": _rule(s, r"\.button-container"),
+        "pat_border": _rule(s, r"\.button-border"),
+        "pat_button": _rule(s, r"\.button"),
+        "pat_real_button": _rule(s, r"\.real-button"),
+        "pat_spin": re.search(r"(^|\})\s*\.spin(\b|:)", s) is not None,
+        "pat_uses_svg_filters": re.search(r"url\(#unopaq[23]?\)", s) is not None,
+        "play_pause_container": _rule(s, r"\.container")
+                                and re.search(r"input:checked\s*~\s*\.play", s) is not None
+                                and re.search(r"input:checked\s*~\s*\.pause", s) is not None,
+        "outer_cont": _rule(s, r"\.outer-cont"),
+        "gradient": _rule(s, r"\.gradient") or re.search(r"button\s+\.gradient", s) is not None,
+        "label": _rule(s, r"\.label") or re.search(r"button\s+\.label", s) is not None,
+        "transition": _rule(s, r"\.transition") or re.search(r"button\s+\.transition", s) is not None,
+        "hover_text": _rule(s, r"\.hover-text"),
+        "icon_series": re.search(r"\.icon-\d", s) is not None or re.search(r"\.fil-leaf-\d", s) is not None,
+        "scene": _rule(s, r"\.scene"),
+        "cube": _rule(s, r"\.cube"),
+        "side": _rule(s, r"\.side"),
+        "top": _rule(s, r"\.top"),
+        "front": _rule(s, r"\.front"),
+        "class_first": first.group(1) if first else "",
+    }
+
+
+_PLAY_PAUSE = """<label class="container" role="button" aria-label="play/pause toggle" style="display:inline-flex">
+  <input type="checkbox" aria-hidden="true"/>
+  <svg class="play" viewBox="0 0 64 64" width="1em" height="1em" aria-hidden="true">
+    <polygon points="22,16 50,32 22,48" />
+  </svg>
+  <svg class="pause" viewBox="0 0 64 64" width="1em" height="1em" aria-hidden="true">
+    <rect x="18" y="16" width="10" height="32" />
+    <rect x="36" y="16" width="10" height="32" />
+  </svg>
+</label>"""
+
+_UNOPAQ_FILTER = """    <filter id="{id}">
+      <feGaussianBlur stdDeviation="{std}"></feGaussianBlur>
+      <feColorMatrix type="matrix"
+        values="1 0 0 0 0
+                0 1 0 0 0
+                0 0 1 0 0
+                0 0 0 18 -8"></feColorMatrix>
+    </filter>"""
+
+_CONTAINER = """<div class="button-container" style="display:inline-block">
+  <button class="real-button" aria-label="button"></button>
+  <div class="button-border">
+    <div class="button">
+      <span>Button</span>
+      <div class="backdrop"></div>
+      <div class="spin spin-blur"></div>
+      <div class="spin spin-intense"></div>
+      <div class="spin spin-inside"></div>
+    </div>
+  </div>
+</div>"""
+
+_OUTER_CONT = """<button class="outer-cont" type="button" style="display:inline-block">
+  <span class="flex">
+    <span>Button</span>
+  </span>
+</button>"""
+
+
+def _container_pattern(with_filters: bool) -> str:
+    if not with_filters:
+        return _CONTAINER
+    filters = "\n".join(_UNOPAQ_FILTER.format(id=i, std=s)
+                        for i, s in (("unopaq", 8), ("unopaq2", 2), ("unopaq3", 1.5)))
+    return f'{_CONTAINER}\n<svg width="0" height="0" style="position:absolute">\n  <defs>\n{filters}\n  </defs>\n</svg>'
+
+
+def synthesize_from_css(css: str) -> str:
+    """CSS 만 있는 컴포넌트 → CSS 가 기대하는 데모 마크업"""
+    f = detect_css_features(css)
+    has_button_rule = f["btn_base"]
+
+    if f["play_pause_container"]:
+        return _PLAY_PAUSE
+    if f["pat_container"] and (f["pat_border"] or f["pat_button"] or f["pat_real_button"] or f["pat_spin"]):
+        return _container_pattern(f["pat_uses_svg_filters"])
+    if f["outer_cont"]:
+        return _OUTER_CONT
+    if has_button_rule and (f["gradient"] or f["label"] or f["transition"]):
+        return ('<button type="button">'
+                f'<span class="{"label" if f["label"] else ""}">Button</span>'
+                + ('<span class="transition"></span>' if f["transition"] else "")
+                + ('<span class="gradient"></span>' if f["gradient"] else "")
+                + "</button>")
+    if has_button_rule and f["btn_span"]:
+        return '<button type="button"><span>Button</span></button>'
+    if has_button_rule and f["icon_series"]:
+        leaf = lambda cls, fill: (f'<svg class="{cls}" viewBox="0 0 100 100" width="0" height="0" aria-hidden="true">'
+                                  f'<circle class="{fill}" cx="50" cy="50" r="45"></circle></svg>')
+        leaves = "".join(leaf(f"icon-{i}", f"fil-leaf-{i}") for i in range(1, 6))
+        return f'<button type="button"><span>Hover me</span>{leaves}</button>'
+    if f["scene"] and f["cube"] and (f["top"] or f["front"] or f["side"]):
+        return '<div class="scene"><div class="cube"><div class="side front">Front</div><div class="side top">Top</div></div></div>'
+    if f["hover_text"]:
+        return '<button class="button"><span class="hover-text" data-text="Button">Button</span></button>'
+    if has_button_rule:
+        return '<button type="button">Button</button>'
+    if f["class_first"]:
+        cls = f["class_first"]
+        return (f'<button class="{cls}">Button</button>' if re.search(r"btn|button", cls, re.I)
+                else f'<div class="{cls}">Preview</div>')
+    return '<button type="button">Button</button>'
+
+
+def repair_css_only_body(html: str) -> str:
+    """body 에 CSS 텍스트만 있는 문서 → CSS 는 head 로, body 는 합성 마크업"""
+    css = _body_or_rest(html).strip()
+    m = _HEAD_RE.search(html)
+    head = m.group(1) if m else ""
+    return ("<!doctype html>\n<html><head>"
+            f"{head}<style>{fix_common_css_typos(css)}</style><style>{PREVIEW_BASE_CSS}</style>"
+            f"</head><body>{synthesize_from_css(css)}</body></html>")
+
+
+_PRESS_STYLE = """
+:root{
+  --bdr: #ffae70;
+  --base: #75221c;
+  --face: #e64539;
+  --c1:   #e7b8b4;
+  --c2:   #f8c9c5;
+  --c3:   #4e1814;
+  --c4:   #79241e;
+  --text: #ffee83;
+}
+.btn-press{
+  position: relative;
+  display: inline-block;
+  font-family: "Press Start 2P", cursive;
+  font-size: 20px;
+  color: var(--text);
+  background: var(--face);
+  border: 4px solid;
+  border-left-color: var(--c1);
+  border-top-color: var(--c2);
+  border-bottom-color: var(--c3);
+  border-right-color: var(--c4);
+  border-radius: 100px;
+  padding: 18px 28px;
+  cursor: pointer;
+  outline: 2px solid black;
+  transform: translateY(-8px);
+  transition: transform .15s ease, box-shadow .15s ease;
+  box-shadow: 0 6px 0 0 var(--base), 0 10px 16px rgba(0,0,0,.25);
+}
+.btn-press::before{
+  content:"";
+  position:absolute; inset:-14px;
+  border:8px solid var(--bdr);
+  outline:4px solid currentColor;
+  border-radius:inherit;
+  pointer-events:none;
+}
+.btn-press:hover{ transform: translateY(-4px); }
+.btn-press:active{ transform: translateY(0); }
+html,body{ margin:0; padding:16px; }
+"""
+
+
+def _body_has_only_border_button(inner: str) -> bool:
+    # 예: <button class="button-border">Button</button> 만 있는 경우
+    clean = re.sub(r"\s+", " ", inner or "").lower()
+    has_border = re.search(r"""<[^>]+class=["'][^"']*\bbutton-border\b[^"']*["'][^>]*>""", clean) is not None
+    has_base = re.search(r"\bbutton-base\b", clean) is not None
+    has_face = re.search(r"""<[^>]+class=["'][^"']*\bbutton\b[^"']*["'][^>]*>""", clean) is not None
+    return has_border and not has_base and not has_face
+
+
+def _has_class(inner, cls):
+    return re.search(rf"""class=["'][^"']*\b{cls}\b[^"']*["']""", inner, re.I) is not None
+
+
+def normalize_partial_full_doc(html: str) -> str:
+    """완전 문서지만 CSS 가 기대하는 마크업이 body 에 없으면 합성 마크업으로 교체"""
+    css = fix_common_css_typos("\n".join(_STYLE_RE.findall(html)))
+    if not css:
+        return html
+
+    inner = body_inner(html).strip()
+    f = detect_css_features(css)
+
+    # Press Start 2P 3-겹 버튼 → 단일 요소 버튼
+    if _rule(css, r"\.button-border") and _rule(css, r"\.button") and _body_has_only_border_button(inner):
+        out = set_body_inner(html, '<button class="btn-press">Button</button>')
+        out = add_head_styles(out, _PRESS_STYLE)
+        if not re.search(r"Press\+Start\+2P", out, re.I):
+            out = re.sub(r"</head>", lambda _: '<link href="https://fonts.googleapis.com/css2?family=Press+Start+2P&display=swap" rel="stylesheet">\n</head>',
+                         out, count=1, flags=re.I)
+        return out
+
+    has_checkbox = re.search(r"""<input[^>]*type=["']checkbox["'][^>]*>""", inner, re.I) is not None
+    has_play_pause_dom = has_checkbox and _has_class(inner, "play") and _has_class(inner, "pause")
+    looks_like_preview_only = ("preview" in re.sub(r"\s+", " ", inner).lower()
+                               and not re.search(r"<(button|input|svg)\b", inner, re.I))
+    container_only = (_has_class(inner, "container") and not has_checkbox
+                      and not re.search(r"<svg\b", inner, re.I))
+
+    needs = (
+        (f["play_pause_container"] and (not has_play_pause_dom or looks_like_preview_only or container_only))
+        or (f["outer_cont"] and not _has_class(inner, "outer-cont"))
+        or (f["pat_container"] and not _has_class(inner, "button-container"))
+        or ((re.search(r"button\s*\{", css) or re.search(r"\.button\b", css)) and not re.search(r"<button\b", inner, re.I))
+        or (re.search(r"\.icon-\d", css) and not re.search(r"<svg\b", inner, re.I))
+    )
+    if not needs:
+        return _fix_style_blocks(html)
+
+    out = set_body_inner(html, synthesize_from_css(css))
+    out = add_head_styles(out, PREVIEW_BASE_CSS)
+    return _fix_style_blocks(out)
+
+
+# ===================== 진입점 =====================
+def build_preview(code: str, tailwind_css: Optional[str] = None) -> Preview:
+    """저장된 코드 (합본 문서 또는 스니펫) → 바로 iframe srcdoc 로 쓸 문서 + Tailwind CDN 필요 여부"""
+    decoded = decode_entities(code or "")
+    if is_full_html_document(decoded):
+        if body_looks_like_css_only(decoded):
+            html = repair_css_only_body(decoded)
+        else:
+            html = normalize_partial_full_doc(decoded)
+        return Preview(html, False, looks_like_button(decoded, html))
+    return build_snippet_document(decoded, tailwind_css)
+
+
+# ===================== 백필 =====================
+def backfill(conn, batch=500, rebuild_all=False, static_tailwind=STATIC_TAILWIND) -> int:
+    """
+    components_preview_html / components_is_button 이 비어 있는 행 (rebuild_all 이면 전부) 을 batch 씩 채움.
+    static_tailwind=False 면 저장된 정적 CSS 가 있어도 CDN 문서로
+    """
+    ensure_preview_columns(conn)
+    where = "TRUE" if rebuild_all else f"({PREVIEW_COLUMN} IS NULL OR {BUTTON_COLUMN} IS NULL)"
+    done, last_id = 0, 0
+    while True:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"SELECT components_id, COALESCE(components_code, ''), {TAILWIND_CSS_COLUMN} FROM {TABLE}"
+                f" WHERE {where} AND components_id > %s ORDER BY components_id LIMIT %s",
+                (last_id, batch),
+            )
+            rows = cur.fetchall()
+            if not rows:
+                break
+            for row_id, code, tailwind_css in rows:
+                p = build_preview(code, tailwind_css if static_tailwind else None)
+                cur.execute(
+                    f"UPDATE {TABLE} SET {PREVIEW_COLUMN} = %s, {NEEDS_TAILWIND_COLUMN} = %s, {BUTTON_COLUMN} = %s"
+                    f" WHERE components_id = %s",
+                    (p.html, p.needs_tailwind, p.is_button, row_id),
+                )
+            last_id = rows[-1][0]
+        conn.commit()
+        done += len(rows)
+        print(f"🖼️ 미리보기 {done}행 생성 (마지막 id {last_id})")
+    return done
+
+
+def main():
+    import psycopg2
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    ap = argparse.ArgumentParser(description="components_preview_html / components_needs_tailwind / components_is_button 백필")
+    ap.add_argument("--all", action="store_true", help="이미 있는 미리보기도 다시 생성 (빌더 규칙을 바꾼 뒤)")
+    ap.add_argument("--batch", type=int, default=500)
+    ap.add_argument("--static-tailwind", action="store_true", default=STATIC_TAILWIND,
+                    help="저장된 정적 Tailwind CSS 를 인라인 (tailwind_parity 통과 후, 기본: PREVIEW_STATIC_TAILWIND)")
+    args = ap.parse_args()
+
+    dsn = os.getenv("PG_DSN") or "dbname=daelim user=admin password=qwe123 host=localhost port=5432"
+    conn = psycopg2.connect(dsn)
+    try:
+        total = backfill(conn, batch=args.batch, rebuild_all=args.all, static_tailwind=args.static_tailwind)
+    finally:
+        conn.close()
+    print(f"🎉 완료! {total}행")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# tailwind_parity.py
+# tailwind_static.py 가 만든 정적 미리보기가 CDN 미리보기와 같게 렌더링되는지 표본 검사
+# - 컴파일된 행을 무작위로 N 개 뽑아 같은 코드를 두 문서로 렌더링 (headless Chrome)
+#   CDN:  build_preview(code)                 → cdn.tailwindcss.com/<TAILWIND_VERSION> 이 JIT
+#   정적: build_preview(code, tailwind_css)   → 저장된 CSS 인라인
+# - 미리보기 루트 아래 요소마다 크기 + 주요 computed style 을 비교 (스크린샷 대신 → 폰트 안티에일리어싱 등 잡음 없음)
+# - 불일치 행 id 와 달라진 속성을 출력, 일치율이 --min 보다 낮으면 exit 1 (빌드 후 게이트로)
+# 사용법: python tailwind_parity.py [--sample 50] [--min 0.98]
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from preview_builder import TABLE, TAILWIND_CSS_COLUMN, build_preview
+
+STYLE_PROPS = (
+    "display", "position", "box-sizing",
+    "margin-top", "margin-right", "margin-bottom", "margin-left",
+    "padding-top", "padding-right", "padding-bottom", "padding-left",
+    "border-top-width", "border-top-style", "border-top-color",
+    "border-top-left-radius", "border-bottom-right-radius",
+    "color", "background-color", "background-image", "opacity",
+    "box-shadow", "outline-style", "outline-width", "outline-color",
+    "font-size", "font-weight", "line-height", "letter-spacing", "text-align", "text-transform",
+    "transform", "filter", "backdrop-filter",
+    "gap", "justify-content", "align-items", "flex-direction", "grid-template-columns",
+)
+
+SNAPSHOT_JS = """
+const props = arguments[0];
+const root = document.querySelector('._preview-root') || document.body;
+return [root, ...root.querySelectorAll('*')].map(el => {
+  const cs = getComputedStyle(el);
+  const r = el.getBoundingClientRect();
+  return [el.tagName, Math.round(r.width), Math.round(r.height), ...props.map(p => cs.getPropertyValue(p))];
+});
+"""
+SETTLE_EVERY = 0.25   # CDN JIT 가 끝날 때까지: 스냅샷이 연속 두 번 같으면 안정된 것으로
+SETTLE_MAX = 8.0
+
+
+def make_driver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from driver_pool import chromedriver_path
+
+    opt = webdriver.ChromeOptions()
+    opt.add_argument("--headless=new")
+    opt.add_argument("--window-size=1280,2000")
+    opt.add_argument("--disable-gpu")
+    opt.add_argument("--no-sandbox")
+    opt.add_argument("--disable-dev-shm-usage")
+    driver = webdriver.Chrome(service=ChromeService(chromedriver_path()), options=opt)
+    driver.set_page_load_timeout(30)
+    return driver
+
+
+def snapshot(driver, path: Path):
+    driver.get(path.as_uri())
+    prev, deadline = None, time.monotonic() + SETTLE_MAX
+    while True:
+        cur = driver.execute_script(SNAPSHOT_JS, list(STYLE_PROPS))
+        if cur == prev or time.monotonic() > deadline:
+            return cur
+        prev = cur
+        time.sleep(SETTLE_EVERY)
+
+
+def diff(cdn, static) -> list:
+    """[(요소 순번, 태그, 속성, CDN 값, 정적 값), ...] — 요소 수가 다르면 구조 불일치 한 줄"""
+    if len(cdn) != len(static):
+        return [(-1, "*", "element count", len(cdn), len(static))]
+    names = ("tag", "width", "height") + STYLE_PROPS
+    out = []
+    for i, (a, b) in enumerate(zip(cdn, static)):
+        out += [(i, a[0], name, x, y) for name, x, y in zip(names, a, b) if x != y]
+    return out
+
+
+def check(conn, driver, sample=50):
+    with conn.cursor() as cur:
+        cur.execute(
+            f"SELECT components_id, COALESCE(components_code, ''), {TAILWIND_CSS_COLUMN} FROM {TABLE}"
+            f" WHERE {TAILWIND_CSS_COLUMN} IS NOT NULL ORDER BY random() LIMIT %s",
+            (sample,),
+        )
+        rows = cur.fetchall()
+    conn.rollback()
+
+    matched, mismatched = 0, []
+    with tempfile.TemporaryDirectory() as tmp:
+        cdn_file, static_file = Path(tmp) / "cdn.html", Path(tmp) / "static.html"
+        for row_id, code, css in rows:
+            cdn_file.write_text(build_preview(code).html, encoding="utf-8")
+            static_file.write_text(build_preview(code, css).html, encoding="utf-8")
+            d = diff(snapshot(driver, cdn_file), snapshot(driver, static_file))
+            if d:
+                mismatched.append((row_id, d))
+            else:
+                matched += 1
+    return matched, mismatched
+
+
+def main():
+    import psycopg2
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    ap = argparse.ArgumentParser(description="정적 Tailwind 미리보기 vs CDN 미리보기 렌더링 비교 (표본)")
+    ap.add_argument("--sample", type=int, default=50)
+    ap.add_argument("--min", type=float, default=0.98, help="이 일치율보다 낮으면 exit 1")
+    ap.add_argument("--seed", type=int, default=None, help="표본 고정 (setseed)")
+    args = ap.parse_args()
+
+    dsn = os.getenv("PG_DSN") or "dbname=daelim user=admin password=qwe123 host=localhost port=5432"
+    conn = psycopg2.connect(dsn)
+    if args.seed is not None:
+        with conn.cursor() as cur:
+            cur.execute("SELECT setseed(%s)", (random.Random(args.seed).random() * 2 - 1,))
+    driver = make_driver()
+    try:
+        matched, mismatched = check(conn, driver, args.sample)
+    finally:
+        driver.quit()
+        conn.close()
+
+    total = matched + len(mismatched)
+    for row_id, d in mismatched:
+        shown = ", ".join(f"#{i}<{tag.lower()}> {name}: {a!r} → {b!r}" for i, tag, name, a, b in d[:5])
+        more = f" (+{len(d) - 5})" if len(d) > 5 else ""
+        print(f"❌ id={row_id}: {shown}{more}")
+    rate = matched / total if total else 1.0
+    print(f"🔍 CDN 일치 {matched}/{total} ({rate:.1%}), 기준 {args.min:.0%}")
+    sys.exit(0 if rate >= args.min else 1)
+
+
+if __name__ == "__main__":
+    main()
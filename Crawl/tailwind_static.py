@@ -0,0 +1,170 @@
+# tailwind_static.py
+# Tailwind 컴포넌트 미리보기를 스크립트 없이 렌더링하도록 컴포넌트별 최소 CSS 를 오프라인 빌드
+# - 지금: 미리보기 iframe 마다 cdn.tailwindcss.com 을 받아 JIT 컴파일 (카테고리 한 페이지 = 24번)
+# - 여기서: 행마다 쓰인 클래스만 뽑아 Tailwind 로 컴파일 (+ grey→gray 등 옛 클래스 shim 을 @apply 로)
+#   → components_tailwind_css 에 저장
+# - 미리보기 교체(components_preview_html 을 CSS 인라인 문서로, needs_tailwind = false) 는 --apply
+#   (또는 PREVIEW_STATIC_TAILWIND=1) 일 때만: 먼저 CSS 만 저장 → tailwind_parity.py 통과 → --apply
+#   --apply 만 다시 돌리면 이미 저장된 CSS 로 문서만 바꿈 (재컴파일 없음)
+# - 컴파일은 frontend/scripts/tailwind-static.mjs 를 node 로 한 번 띄워 한 줄씩 요청
+#   CDN 미리보기와 같은 Tailwind v3 (preview_builder.TAILWIND_VERSION = frontend/scripts/package.json 고정 버전)
+#   → 앱의 v4 로 컴파일하면 shadow/rounded/ring/border 등 이름·스케일이 바뀐 유틸이 조용히 다르게 나옴
+# - 결과가 CDN 렌더링과 같은지는 tailwind_parity.py 로 표본 검사
+# 사용법: npm install --prefix frontend/scripts 후  python tailwind_static.py [--all] [--batch 200] [--apply]
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+from preview_builder import (
+    BUTTON_COLUMN, NEEDS_TAILWIND_COLUMN, PREVIEW_COLUMN, STATIC_TAILWIND, TABLE, TAILWIND_CSS_COLUMN,
+    build_preview, decode_entities, ensure_preview_columns,
+    is_full_html_document, legacy_shim_rules, looks_like_tailwind, used_class_tokens,
+)
+
+COMPILER_SCRIPT = Path(__file__).resolve().parents[1] / "frontend" / "scripts" / "tailwind-static.mjs"
+LIBRARY = "Tailwind"
+
+
+def candidates(html: str) -> list:
+    """class 속성 토큰 + <script> 안 문자열 토큰 (CDN 은 DOM 의 class 를 보므로 스크립트가 붙이는 것까지)"""
+    return sorted(used_class_tokens(html))
+
+
+class TailwindCompiler:
+    """
+    with TailwindCompiler() as tw:
+        css = tw.compile(["px-4", "bg-gray-200"], shim_rules)
+    node 프로세스는 한 번만 띄움 (컴포넌트마다 프로세스를 띄우면 기동 비용이 컴파일보다 큼)
+    """
+
+    def __init__(self, script: Path = COMPILER_SCRIPT, node: Optional[str] = None):
+        node = node or os.getenv("NODE") or shutil.which("node")
+        if not node:
+            raise RuntimeError("node 를 찾을 수 없습니다 (NODE 환경변수 또는 PATH)")
+        if not script.exists():
+            raise RuntimeError(f"컴파일 스크립트 없음: {script}")
+        self.proc = subprocess.Popen(
+            [node, str(script)], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            text=True, encoding="utf-8", bufsize=1,
+        )
+        self._seq = 0
+
+    def compile(self, classes, css: str = "") -> str:
+        self._seq += 1
+        self.proc.stdin.write(json.dumps({"id": self._seq, "candidates": list(classes), "css": css}) + "\n")
+        self.proc.stdin.flush()
+        line = self.proc.stdout.readline()
+        if not line:
+            raise RuntimeError(f"tailwind-static.mjs 가 종료됨 (exit {self.proc.poll()})")
+        out = json.loads(line)
+        if out.get("error"):
+            raise ValueError(out["error"])
+        return out["css"]
+
+    def close(self):
+        if self.proc.stdin and not self.proc.stdin.closed:
+            self.proc.stdin.close()
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def static_css(code: str, compiler: TailwindCompiler) -> Optional[str]:
+    """Tailwind 스니펫이면 최소 CSS, 아니면(완전 문서/Tailwind 아님) None"""
+    decoded = decode_entities(code or "")
+    if is_full_html_document(decoded) or not looks_like_tailwind(decoded):
+        return None
+    return compiler.compile(candidates(decoded), legacy_shim_rules(decoded, layer=False))
+
+
+def build_all(conn, compiler: TailwindCompiler, batch=200, rebuild_all=False, apply=STATIC_TAILWIND) -> dict:
+    """
+    Tailwind 행(라이브러리 또는 needs_tailwind) 을 batch 씩 컴파일해서 CSS 저장.
+    apply 면 미리보기 문서도 CSS 인라인으로 교체 (이미 컴파일된 행은 저장된 CSS 재사용)
+    """
+    ensure_preview_columns(conn)
+    where = f"(components_library = %s OR {NEEDS_TAILWIND_COLUMN})"
+    if not rebuild_all:
+        where += f" AND ({TAILWIND_CSS_COLUMN} IS NULL" + (f" OR {NEEDS_TAILWIND_COLUMN})" if apply else ")")
+    stats = {"compiled": 0, "applied": 0, "skipped": 0, "errors": 0, "css_bytes": 0}
+    last_id = 0
+    while True:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"SELECT components_id, COALESCE(components_code, ''), {TAILWIND_CSS_COLUMN} FROM {TABLE}"
+                f" WHERE {where} AND components_id > %s ORDER BY components_id LIMIT %s",
+                (LIBRARY, last_id, batch),
+            )
+            rows = cur.fetchall()
+            if not rows:
+                break
+            for row_id, code, css in rows:
+                if css is None or rebuild_all:
+                    try:
+                        css = static_css(code, compiler)
+                    except ValueError as e:
+                        stats["errors"] += 1
+                        print(f"❌ 컴파일 실패 id={row_id}: {e}")
+                        continue
+                    if css is None:
+                        stats["skipped"] += 1
+                        continue
+                    stats["compiled"] += 1
+                    stats["css_bytes"] += len(css.encode("utf-8"))
+                if not apply:
+                    cur.execute(f"UPDATE {TABLE} SET {TAILWIND_CSS_COLUMN} = %s WHERE components_id = %s", (css, row_id))
+                    continue
+                p = build_preview(code, css)
+                cur.execute(
+                    f"UPDATE {TABLE} SET {TAILWIND_CSS_COLUMN} = %s, {PREVIEW_COLUMN} = %s, {NEEDS_TAILWIND_COLUMN} = %s,"
+                    f" {BUTTON_COLUMN} = %s WHERE components_id = %s",
+                    (css, p.html, p.needs_tailwind, p.is_button, row_id),
+                )
+                stats["applied"] += 1
+            last_id = rows[-1][0]
+        conn.commit()
+        print(f"🎨 컴파일 {stats['compiled']} / 미리보기 교체 {stats['applied']} / CDN 유지 {stats['skipped']}"
+              f" / 실패 {stats['errors']} (마지막 id {last_id})")
+    return stats
+
+
+def main():
+    import psycopg2
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    ap = argparse.ArgumentParser(description="Tailwind 컴포넌트별 정적 CSS 빌드 → components_tailwind_css / components_preview_html")
+    ap.add_argument("--all", action="store_true", help="이미 컴파일된 행도 다시 (Tailwind 버전/shim 을 바꾼 뒤)")
+    ap.add_argument("--batch", type=int, default=200)
+    ap.add_argument("--apply", action="store_true", default=STATIC_TAILWIND,
+                    help="미리보기 문서도 정적 CSS 로 교체 (tailwind_parity 통과 후, 기본: PREVIEW_STATIC_TAILWIND)")
+    args = ap.parse_args()
+
+    dsn = os.getenv("PG_DSN") or "dbname=daelim user=admin password=qwe123 host=localhost port=5432"
+    conn = psycopg2.connect(dsn)
+    try:
+        with TailwindCompiler() as compiler:
+            stats = build_all(conn, compiler, batch=args.batch, rebuild_all=args.all, apply=args.apply)
+    finally:
+        conn.close()
+    avg = stats["css_bytes"] / stats["compiled"] / 1024 if stats["compiled"] else 0.0
+    print(f"🎉 완료! 정적 CSS {stats['compiled']}행 (평균 {avg:.1f} KB), 미리보기 교체 {stats['applied']}행,"
+          f" CDN 유지 {stats['skipped']}행, 실패 {stats['errors']}행")
+    if not args.apply:
+        print("ℹ️ 미리보기는 CDN 그대로 — python tailwind_parity.py 통과 후 --apply")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# test_preview_parity.py
+# preview_builder(파이썬 포팅) 결과를 예전 프론트 규칙(frontend/scripts/preview-builder.mjs) 의 golden 과 비교
+# - golden 생성: node frontend/scripts/preview-golden.mjs  (preview_golden/*.input.html → *.golden.html / *.synth.html)
+# - 의도한 차이만 정규화해서 비교:
+#   Tailwind CDN 버전 고정 (cdn.tailwindcss.com/<TAILWIND_VERSION>), shim 은 코드에 쓰인 클래스 규칙만, 태그 사이 공백
+# 사용법: (Crawl 디렉터리에서) python -m pytest -q test_preview_parity.py
+
+import re
+from pathlib import Path
+
+import pytest
+
+from preview_builder import (
+    TAILWIND_VERSION, build_preview, fix_common_css_typos, synthesize_from_css, used_class_tokens,
+)
+
+GOLDEN_DIR = Path(__file__).resolve().parent / "preview_golden"
+_SHIM_RE = re.compile(r'(<style type="text/tailwindcss">\s*@layer utilities \{\n)([\s\S]*?)(\n\}\s*</style>)')
+_SHIM_CLASS_RE = re.compile(r"^\.((?:\w+\\:)?[\w-]+)")
+
+
+def _names(suffix):
+    return sorted(p.name[: -len(suffix)] for p in GOLDEN_DIR.glob(f"*{suffix}"))
+
+
+def _read(name):
+    return (GOLDEN_DIR / name).read_text(encoding="utf-8")
+
+
+def _normalize(doc: str, used: set) -> str:
+    doc = doc.replace(f"cdn.tailwindcss.com/{TAILWIND_VERSION}", "cdn.tailwindcss.com")
+
+    def shim(m):
+        lines = []
+        for line in m.group(2).splitlines():
+            cls = _SHIM_CLASS_RE.match(line.strip())
+            if cls and cls.group(1).replace("\\:", ":") in used:
+                lines.append(line.strip())
+        return m.group(1) + "\n".join(sorted(lines)) + m.group(3)
+
+    doc = _SHIM_RE.sub(shim, doc)
+    return re.sub(r">\s+<", "><", doc.strip())
+
+
+@pytest.mark.parametrize("name", _names(".golden.html"))
+def test_build_preview_matches_js(name):
+    code = _read(f"{name}.input.html")
+    used = used_class_tokens(code)
+    expected = _normalize(_read(f"{name}.golden.html"), used)
+    assert _normalize(build_preview(code).html, used) == expected
+
+
+@pytest.mark.parametrize("name", _names(".synth.html"))
+def test_css_only_body_matches_js(name):
+    # JS 는 DOMParser 로 body 를 다시 직렬화하므로 문서 전체 대신 합성 마크업 + CSS 위치를 비교
+    code = _read(f"{name}.input.html")
+    css = re.search(r"<body[^>]*>([\s\S]*?)</body>", code, re.I).group(1).strip()
+    synth = _read(f"{name}.synth.html")
+    assert synthesize_from_css(css) == synth
+
+    html = build_preview(code).html
+    head, body = re.search(r"<head>([\s\S]*)</head><body>([\s\S]*)</body>", html).groups()
+    assert f"<style>{fix_common_css_typos(css)}</style>" in head
+    assert body == synth
+
+
+def test_golden_inputs_present():
+    assert _names(".golden.html") and _names(".synth.html")
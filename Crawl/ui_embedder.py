@@ -0,0 +1,225 @@
+# ui_embedder.py
+# ui_tbl 임베딩 단계 (크롤과 분리)
+# - ui_git_api 는 embedding 을 NULL 로 저장 (= 임베딩 필요 표시) 하고 다운로드만 계속
+# - 여기서 NULL 행을 EMBED_BATCH 개씩 읽어 한 번에 encode → UPDATE ... FROM (VALUES ...) 한 번으로 기록
+# - 배치 encode 가 실패하면 한 행씩 다시 → 그래도 실패한 행은 ui_embedding_errors 에 (url, name, 코드 md5) 기록,
+#   같은 코드인 동안은 다시 고르지 않음 (코드가 바뀌면 md5 가 달라져서 자동으로 재시도)
+# - 크롤과 같이 돌릴 때: EmbeddingWorker (백그라운드 스레드, 자기 커넥션) 가 DB 를 큐 삼아 따라감
+#   따로 돌릴 때:       python ui_embedder.py  (남은 NULL 행 전부 처리 후 종료, 다른 머신/GPU 에서도 가능)
+# pip install sentence-transformers psycopg2
+
+import argparse
+import hashlib
+import os
+import threading
+import time
+
+import psycopg2
+from psycopg2.extras import execute_values
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PG_DSN = os.getenv("PG_DSN") or "dbname=daelim user=admin password=qwe123 host=localhost port=5432"
+MODEL_NAME = "jhgan/ko-sroberta-multitask"
+EMBED_BATCH = 64      # 한 번에 encode 하는 행 수
+IDLE_WAIT = 2.0       # 크롤과 같이 돌 때 NULL 행이 없으면 이만큼 쉬었다가 다시 확인
+MAX_DB_ERRORS = 5     # DB 오류가 연속 이만큼이면 포기 (그 전에는 IDLE_WAIT 쉬고 재시도)
+
+# 폴링 쿼리용 부분 인덱스 (임베딩 안 된 행만)
+SQL_PENDING_INDEX = """
+CREATE INDEX IF NOT EXISTS ui_tbl_needs_embedding
+    ON ui_tbl (ui_source_url, ui_name) WHERE embedding IS NULL;
+"""
+SQL_CREATE_ERRORS = """
+CREATE TABLE IF NOT EXISTS ui_embedding_errors (
+    ui_source_url TEXT NOT NULL,
+    ui_name       TEXT NOT NULL,
+    code_md5      TEXT NOT NULL,     -- 실패한 코드 버전 (재크롤로 코드가 바뀌면 다시 시도)
+    error         TEXT,
+    failed_at     TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (ui_source_url, ui_name)
+);
+"""
+# 실패 기록이 있는 같은 코드 버전은 건너뜀 → 같은 행을 계속 다시 고르지 않음
+SQL_PENDING = """
+SELECT t.ui_source_url, t.ui_name, t.ui_full_code
+FROM ui_tbl AS t
+WHERE t.embedding IS NULL
+  AND NOT EXISTS (
+      SELECT 1 FROM ui_embedding_errors AS e
+      WHERE e.ui_source_url = t.ui_source_url AND e.ui_name = t.ui_name
+        AND e.code_md5 = md5(COALESCE(t.ui_full_code, ''))
+  )
+ORDER BY t.ui_source_url, t.ui_name
+LIMIT %s
+FOR UPDATE OF t SKIP LOCKED;
+"""
+SQL_UPDATE_EMBEDDINGS = """
+UPDATE ui_tbl AS t
+SET embedding = data.emb
+FROM (VALUES %s) AS data(url, name, emb)
+WHERE t.ui_source_url = data.url AND t.ui_name = data.name AND t.embedding IS NULL;
+"""
+SQL_MARK_FAILED = """
+INSERT INTO ui_embedding_errors (ui_source_url, ui_name, code_md5, error)
+VALUES %s
+ON CONFLICT (ui_source_url, ui_name) DO UPDATE SET
+    code_md5 = EXCLUDED.code_md5, error = EXCLUDED.error, failed_at = now();
+"""
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    # 처음 쓸 때 로드 (크롤만 할 때는 모델을 메모리에 올리지 않음)
+    global _model
+    with _model_lock:
+        if _model is None:
+            from sentence_transformers import SentenceTransformer
+            print(f"🧩 임베딩 모델 로딩 중... ({MODEL_NAME})")
+            _model = SentenceTransformer(MODEL_NAME)
+        return _model
+
+
+def ensure_pending_index(conn):
+    with conn.cursor() as cur:
+        cur.execute(SQL_CREATE_ERRORS)
+    conn.commit()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(SQL_PENDING_INDEX)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ ui_tbl 부분 인덱스 생성 실패 (무시): {e}")
+
+
+def _encode(rows):
+    """반환: ([(url, name, emb)], [(url, name, code_md5, error)]) — 배치가 실패하면 한 행씩 다시"""
+    model = get_model()
+    codes = [code for _, _, code in rows]
+    try:
+        embs = model.encode(codes, batch_size=len(codes), show_progress_bar=False)
+        return [(url, name, emb.tolist()) for (url, name, _), emb in zip(rows, embs)], []
+    except Exception as e:
+        print(f"⚠️ 배치 encode 실패 ({len(rows)}행) → 한 행씩 재시도: {e}")
+    done, failed = [], []
+    for url, name, code in rows:
+        try:
+            emb = model.encode([code], batch_size=1, show_progress_bar=False)[0]
+            done.append((url, name, emb.tolist()))
+        except Exception as e:
+            print(f"❌ 임베딩 실패, 행 스킵: {url} {name}: {e}")
+            failed.append((url, name, hashlib.md5((code or "").encode("utf-8")).hexdigest(), str(e)[:500]))
+    return done, failed
+
+
+def embed_batch(conn, batch_size=EMBED_BATCH):
+    """
+    NULL 행 batch_size 개 → encode → UPDATE. 반환: (임베딩한 행 수, 실패로 기록한 행 수)
+    둘 다 0 이면 처리할 행 없음
+    """
+    with conn.cursor() as cur:
+        cur.execute(SQL_PENDING, (batch_size,))
+        rows = cur.fetchall()
+        if not rows:
+            conn.rollback()
+            return 0, 0
+        done, failed = _encode(rows)
+        if done:
+            execute_values(cur, SQL_UPDATE_EMBEDDINGS, done,
+                           template="(%s, %s, %s::float4[])", page_size=len(done))
+        if failed:
+            execute_values(cur, SQL_MARK_FAILED, failed, page_size=len(failed))
+    conn.commit()
+    return len(done), len(failed)
+
+
+class EmbeddingWorker(threading.Thread):
+    """
+    worker = EmbeddingWorker(); worker.start()   # 크롤 시작 때
+    ...크롤 (embedding NULL 로 저장)...
+    worker.stop(); worker.join()                 # 남은 NULL 행까지 처리하고 종료
+    (DB 오류는 IDLE_WAIT 쉬고 재시도 → stop 된 뒤에도 남은 행을 두고 바로 끝나지 않음)
+    """
+
+    def __init__(self, dsn=PG_DSN, batch_size=EMBED_BATCH, idle_wait=IDLE_WAIT):
+        super().__init__(daemon=True, name="ui-embedder")
+        self.dsn = dsn
+        self.batch_size = batch_size
+        self.idle_wait = idle_wait
+        self._stopping = threading.Event()
+        self.embedded = 0
+        self.batches = 0
+        self.busy_s = 0.0
+        self.failed = 0   # 임베딩 실패로 기록한 행
+        self.errors = 0   # DB 오류로 실패한 배치
+
+    def stop(self):
+        self._stopping.set()
+
+    def run(self):
+        conn = psycopg2.connect(self.dsn)
+        ensure_pending_index(conn)
+        db_errors = 0
+        try:
+            while True:
+                t0 = time.perf_counter()
+                try:
+                    done, failed = embed_batch(conn, self.batch_size)
+                    db_errors = 0
+                except Exception as e:
+                    self.errors += 1
+                    db_errors += 1
+                    print(f"❌ 임베딩 배치 실패 ({db_errors}/{MAX_DB_ERRORS}): {e}")
+                    if db_errors >= MAX_DB_ERRORS:
+                        print("🛑 DB 오류가 계속되어 임베딩 중단 (남은 행은 다음 실행에)")
+                        break
+                    conn = self._recover(conn)
+                    time.sleep(self.idle_wait)
+                    continue
+                if done or failed:
+                    self.embedded += done
+                    self.failed += failed
+                    self.batches += 1
+                    self.busy_s += time.perf_counter() - t0
+                    continue
+                # 남은 행 없음: 크롤이 끝났으면 종료, 아니면 새 행이 commit 될 때까지 대기
+                if self._stopping.is_set():
+                    break
+                self._stopping.wait(self.idle_wait)
+        finally:
+            conn.close()
+
+    def _recover(self, conn):
+        # 트랜잭션만 깨졌으면 rollback, 연결이 끊겼으면 새로 연결
+        if not conn.closed:
+            try:
+                conn.rollback()
+                return conn
+            except psycopg2.Error:
+                conn.close()
+        return psycopg2.connect(self.dsn)
+
+    def report(self):
+        rate = self.embedded / self.busy_s if self.busy_s else 0.0
+        print(f"🧠 임베딩 {self.embedded}행 / {self.batches}배치 ({rate:.1f} rows/s,"
+              f" 실패 행 {self.failed} · DB 오류 배치 {self.errors})")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="ui_tbl 의 embedding NULL 행 임베딩")
+    ap.add_argument("--batch", type=int, default=EMBED_BATCH)
+    args = ap.parse_args()
+
+    worker = EmbeddingWorker(batch_size=args.batch)
+    worker.stop()  # 기다리지 않고 남은 행만 처리
+    worker.start()
+    worker.join()
+    worker.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,19 @@ Author: Hyunbin + ChatGPT
 Goal: Collect clean, non-duplicate pure HTML/CSS UI components for RAG/embedding
 """
 
-import os, time, requests, psycopg2
+import os, sys, time, tarfile, requests, psycopg2
 from datetime import datetime
 from dotenv import load_dotenv
-from sentence_transformers import SentenceTransformer
+
+from bulk_writer import BulkWriter
+from crawl_state import CrawlState, seen_blobs
+from dedupe import UrlIndex, file_key
+from near_dupe import NearDupIndex
+from ui_embedder import EmbeddingWorker
+from github_archive import FETCH_MODES, changed_entries, code_entries, read_archive, should_use_archive
+from github_client import API_BASE, RAW_BASE
+from keyword_match import KeywordMatcher
+from http_cache import cache_key, open_default_cache, requests_response_from_cache
 
 # ========= 환경설정 =========
 load_dotenv()
@@ -40,15 +49,19 @@ UI_KEYWORDS = [
 
 BRANCH_CANDIDATES = ["main", "master", "gh-pages", "source"]
 
-# ========= 모델 =========
-model = SentenceTransformer("jhgan/ko-sroberta-multitask")
+# 디스크 HTTP 캐시 (ETag 조건부 요청 + blob SHA 별 raw 본문)
+HTTP_CACHE = open_default_cache()
 
 # ========= GitHub GET with retry & rate limit =========
-def github_get(url, params=None, max_retries=5, timeout=20):
+def github_get(url, params=None, max_retries=5, timeout=20, stream=False):
     retries = 0
+    # API 응답만 조건부 요청 (raw 는 blob SHA 로 따로 캐시, tarball 스트림은 캐시 안 함)
+    key = cache_key(url, params)
+    use_cache = HTTP_CACHE is not None and url.startswith(API_BASE) and not stream
+    cond = HTTP_CACHE.conditional_headers(key) if use_cache else {}
     while True:
         try:
-            r = requests.get(url, headers=HEADERS, params=params, timeout=timeout)
+            r = requests.get(url, headers={**HEADERS, **cond}, params=params, timeout=timeout, stream=stream)
         except requests.exceptions.ConnectionError:
             retries += 1
             if retries > max_retries:
@@ -77,25 +90,44 @@ def github_get(url, params=None, max_retries=5, timeout=20):
             time.sleep(wait)
             continue
 
+        if use_cache:
+            if r.status_code == 304:
+                cached = HTTP_CACHE.load(key)
+                if cached is not None:
+                    return requests_response_from_cache(url, *cached)
+                cond = {}  # 캐시 항목이 없어졌으면 조건 없이 다시
+                continue
+            if r.status_code == 200:
+                HTTP_CACHE.store(key, r.headers, r.content, bool(cond))
+
         return r
 
 # ========= DB =========
 def db():
     return psycopg2.connect(PG_DSN)
 
-def save_ui(cur, name, code, author, url, lib, emb):
-    cur.execute("""
-        INSERT INTO ui_tbl (
-            ui_name, ui_full_code, ui_author,
-            ui_source_url, ui_library, embedding
-        )
-        VALUES (%s, %s, %s, %s, %s, %s)
-        ON CONFLICT DO NOTHING;
-    """, (name, code, author, url, lib, emb))
+# embedding 은 NULL 로 저장 (= 임베딩 필요) → ui_embedder 가 배치로 채움
+UI_COLUMNS = ("ui_name", "ui_full_code", "ui_author", "ui_source_url", "ui_library")
+
+def ui_writer(conn):
+    # 행마다 INSERT 하지 않고 모아서 multi-row INSERT (flush 가 crawl_state upsert 까지 같이 commit)
+    return BulkWriter(conn, "ui_tbl", UI_COLUMNS, on_conflict="ON CONFLICT DO NOTHING")
+
+def save_ui(writer, name, code, author, url, lib):
+    writer.add((name, code, author, url, lib))
+
+# 재크롤에서 blob 이 바뀐 기존 파일 → 새 코드로 바꾸고 embedding 을 NULL 로 (ui_embedder 가 다시 임베딩)
+SQL_UPDATE_UI = """
+UPDATE ui_tbl SET ui_full_code = %s, ui_author = %s, ui_library = %s, embedding = NULL
+WHERE ui_source_url = %s AND ui_name = %s;
+"""
+
+def update_ui(cur, name, code, author, url, lib):
+    cur.execute(SQL_UPDATE_UI, (code, author, lib, url, name))
 
 # ========= 도우미 =========
 def get_default_or_fallback_branch(owner, repo):
-    info = github_get(f"https://api.github.com/repos/{owner}/{repo}")
+    info = github_get(f"{API_BASE}/repos/{owner}/{repo}")
     if info and info.status_code == 200:
         default_branch = info.json().get("default_branch")
         candidates = [default_branch] + BRANCH_CANDIDATES
@@ -107,33 +139,96 @@ def get_default_or_fallback_branch(owner, repo):
         if not b or b in seen:
             continue
         seen.add(b)
-        resp = github_get(f"https://api.github.com/repos/{owner}/{repo}/branches/{b}")
+        resp = github_get(f"{API_BASE}/repos/{owner}/{repo}/branches/{b}")
         if resp and resp.status_code == 200:
             return b
     return None
 
-def list_code_paths(owner, repo, branch):
-    r = github_get(f"https://api.github.com/repos/{owner}/{repo}/git/trees/{branch}?recursive=1")
+def fetch_tree(owner, repo, branch):
+    # 반환: (tree sha, tree) / 브랜치가 없으면 None
+    r = github_get(f"{API_BASE}/repos/{owner}/{repo}/git/trees/{branch}?recursive=1")
     if not r or r.status_code != 200:
-        return []
-    tree = r.json().get("tree", [])
-    return [item["path"] for item in tree if item.get("path", "").endswith(FILE_EXTS)]
+        return None
+    data = r.json()
+    return data.get("sha"), data.get("tree", [])
+
+def get_tree(owner, repo, branch):
+    found = fetch_tree(owner, repo, branch)
+    return found[1] if found else []
+
+def resolve_branch_and_tree(owner, repo, default_branch=None):
+    # 검색 결과의 default_branch 로 트리를 바로 조회 (요청 1회). 실패할 때만 브랜치 probing
+    # 반환: (branch, tree sha, tree)
+    if default_branch:
+        found = fetch_tree(owner, repo, default_branch)
+        if found is not None:
+            return (default_branch,) + found
+    branch = get_default_or_fallback_branch(owner, repo)
+    if not branch:
+        return None, None, []
+    found = fetch_tree(owner, repo, branch)
+    return (branch,) + found if found else (branch, None, [])
+
+def list_code_entries(owner, repo, branch):
+    return code_entries(get_tree(owner, repo, branch), FILE_EXTS)
 
-def download_raw(owner, repo, branch, path):
-    raw = f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/{path}"
+def list_code_paths(owner, repo, branch):
+    return [path for path, _ in list_code_entries(owner, repo, branch)]
+
+def download_raw(owner, repo, branch, path, sha=None):
+    # 같은 blob SHA 를 이미 받아둔 적 있으면 다운로드 생략
+    if sha and HTTP_CACHE is not None:
+        cached = HTTP_CACHE.get_blob(sha)
+        if cached is not None:
+            return cached
+    raw = f"{RAW_BASE}/{owner}/{repo}/{branch}/{path}"
     r = github_get(raw)
     if not r or r.status_code != 200:
         return None
     try:
-        return r.text
+        text = r.text
     except Exception:
         return None
+    if sha and HTTP_CACHE is not None:
+        HTTP_CACHE.put_blob(sha, text)
+    return text
+
+def download_archive(owner, repo, branch, entries):
+    # tarball 한 번 받아서 entries 경로만 스트리밍으로 풀기. 실패하면 None → 파일별로 폴백
+    r = github_get(f"{API_BASE}/repos/{owner}/{repo}/tarball/{branch}", stream=True)
+    if not r or r.status_code != 200:
+        return None
+    try:
+        with r:
+            return read_archive(r.raw, entries, HTTP_CACHE)
+    except (tarfile.TarError, OSError, EOFError) as e:
+        print(f"⚠️ tarball 읽기 실패 ({owner}/{repo}): {e} — 파일별 다운로드로 전환")
+        return None
+
+def fetch_repo_files(owner, repo, branch, tree, known=None):
+    # 매칭 파일이 많으면 tarball 1회, 적으면 파일별 raw → [(path, code), ...]
+    # known: 지난 크롤의 {path: blob sha} → SHA 가 그대로인 파일은 안 받음
+    entries = changed_entries(code_entries(tree, FILE_EXTS), known)
+    if should_use_archive(tree, len(entries)):
+        files = download_archive(owner, repo, branch, entries)
+        if files is not None:
+            FETCH_MODES["archive"] += 1
+            return files
+    FETCH_MODES["per_file"] += 1
+    files = []
+    for path, sha in entries:
+        code = download_raw(owner, repo, branch, path, sha)
+        if code:
+            files.append((path, code))
+    return files
+
+FORBIDDEN_MATCHER = KeywordMatcher(FORBIDDEN_TERMS)
 
 def is_pure_ui(code):
     if not code:
         return False
-    lower = code.lower()
-    return not any(term in lower for term in FORBIDDEN_TERMS)
+    # 금지어 하나라도 나오면 바로 제외 (파일 전체를 소문자 복사하지 않음)
+    return FORBIDDEN_MATCHER.search(code) is None
 
 # ========= 레포 검색 =========
 def search_repositories(queries, pages=20):
@@ -141,7 +236,7 @@ def search_repositories(queries, pages=20):
     for q in queries:
         for page in range(1, pages + 1):
             params = {"q": q, "sort": "stars", "order": "desc", "per_page": 100, "page": page}
-            r = github_get("https://api.github.com/search/repositories", params=params)
+            r = github_get(f"{API_BASE}/search/repositories", params=params)
             if not r or r.status_code != 200:
                 break
             items = r.json().get("items", [])
@@ -154,14 +249,18 @@ def search_repositories(queries, pages=20):
                     "owner": repo["owner"]["login"],
                     "name": repo["name"],
                     "url": repo["html_url"],
-                    "license": lic
+                    "license": lic,
+                    # 검색 응답에 이미 있는 메타데이터 — 브랜치 probing/증분 크롤에 씀
+                    "default_branch": repo.get("default_branch"),
+                    "pushed_at": repo.get("pushed_at"),
+                    "size": repo.get("size"),
                 }
             print(f"🔎 {q} (p{page}) — 누적 {len(repos)}개 레포")
             time.sleep(1.0)
     return list(repos.values())
 
 # ========= 메인 =========
-def run():
+def run(embed=True):
     queries = [
         "pure html ui component language:html stars:>10",
         "simple ui layout language:html stars:>10",
@@ -180,29 +279,51 @@ def run():
     conn = db()
     cur = conn.cursor()
     saved_total = 0
-    seen_codes = set()  # ✅ 중복 방지용 set
+
+    # 임베딩은 별도 스레드(자기 커넥션)가 commit 된 NULL 행을 배치로 처리 → 다운로드가 encode 를 기다리지 않음
+    embedder = EmbeddingWorker(PG_DSN) if embed else None
+    if embedder:
+        embedder.start()
+
+    # 이어받기: 레포별 pushed_at / tree SHA / blob SHA
+    state = CrawlState(conn, "ui")
+    writer = ui_writer(conn)
+    writer.on_failed = state.forget_rows  # insert 실패한 파일은 blob 기록에서 빼서 다음 실행에 재시도
+    dedupe = UrlIndex.from_db(conn, "ui")  # 이미 저장된 (레포 URL, 경로)
+    near = NearDupIndex.load(conn, "ui").follow(writer)   # ✅ 유사 중복 (공백/클래스명/색상만 다른 포크 복사본) — 이전 실행분 포함
+    print(f"↪️ 이어받기: 지난 크롤 상태 {len(state.repos)}개 레포")
 
     for repo in repos:
         owner, name, url, lic = repo["owner"], repo["name"], repo["url"], repo["license"]
 
+        if state.unchanged_push(owner, name, repo.get("pushed_at")):
+            continue
+
         if lic not in ALLOWED_LICENSES:
             print(f"⛔ 라이선스 제외: {owner}/{name} ({lic})")
             continue
 
-        branch = get_default_or_fallback_branch(owner, name)
-        if not branch:
+        branch, tree_sha, tree = resolve_branch_and_tree(owner, name, repo.get("default_branch"))
+        if not branch or tree_sha is None:
             print(f"⚪ 브랜치 확인 실패: {owner}/{name}")
             continue
 
-        paths = list_code_paths(owner, name, branch)
-        if not paths:
-            print(f"⚪ 코드 없음: {owner}/{name}")
+        entries = code_entries(tree, FILE_EXTS)
+        if not entries or state.unchanged_tree(owner, name, tree_sha):
+            if not entries:
+                print(f"⚪ 코드 없음: {owner}/{name}")
+            state.record(cur, owner, name, branch, tree_sha, repo.get("pushed_at"), dict(entries))
+            writer.maybe_flush()
             continue
 
+        known = state.known_blobs(owner, name)
+        files = fetch_repo_files(owner, name, branch, tree, known)
+        state.count_reused(len(entries) - len(changed_entries(entries, known)))
+        blobs = seen_blobs(entries, known, {p for p, _ in files})
+
         kept = 0
-        for path in paths:
-            code = download_raw(owner, name, branch, path)
-            if not code or not is_pure_ui(code):
+        for path, code in files:
+            if not is_pure_ui(code):
                 continue
 
             # ⚙️ 필터링 로직
@@ -210,31 +331,49 @@ def run():
                 continue
             if path.lower().startswith(("index", "demo", "example")):
                 continue
-            normalized = code.strip()
-            if normalized in seen_codes:
-                continue
-            seen_codes.add(normalized)
-
-            emb = model.encode(code).tolist()
-
-            try:
-                save_ui(cur, path, code, owner, url, "pure_html_css", emb)
-                kept += 1
-                saved_total += 1
-            except Exception as e:
-                print(f"❌ DB 저장 실패 ({owner}/{name}:{path}) → {e}")
-                continue
-
-        conn.commit()
+            # 이미 저장된 경로인데 다시 받았다 = blob SHA 가 바뀐 새 버전 → 유사 중복 검사 없이 항상 UPDATE
+            # (건너뛰면 blob SHA 는 기록되는데 행은 옛 내용 그대로 남음)
+            key = file_key(url, path)
+            if key in dedupe:
+                near.update(key, code)
+                update_ui(cur, path, code, owner, url, "pure_html_css")
+            elif near.claim(key, code) is not None:
+                continue  # 임베딩 전에 스킵
+            else:
+                dedupe.add(key)
+                # DB 저장 실패 행은 writer 가 flush 때 건너뜀
+                save_ui(writer, path, code, owner, url, "pure_html_css")
+            near.saved(key)
+            kept += 1
+            saved_total += 1
+
+        state.record(cur, owner, name, branch, tree_sha, repo.get("pushed_at"), blobs, kept,
+                     complete=len(blobs) == len(entries))
+        writer.maybe_flush()
         if kept > 0:
             print(f"💾 {owner}/{name}@{branch} → {kept}개 저장 (총 {saved_total})")
         else:
             print(f"⚪ {owner}/{name} → 저장된 코드 없음")
         time.sleep(0.8)
 
+    writer.close()
+    near.close()
     cur.close()
     conn.close()
     print(f"🎉 완료! 총 {saved_total}개의 고유 UI 컴포넌트가 수집되었습니다.")
+    if embedder:
+        print("⏳ 남은 임베딩 처리 중...")
+        embedder.stop()
+        embedder.join()
+        embedder.report()
+    writer.report()
+    state.report()
+    dedupe.report()
+    near.report()
+    print(f"📦 다운로드 모드: tarball {FETCH_MODES['archive']} · 파일별 {FETCH_MODES['per_file']}")
+    if HTTP_CACHE is not None:
+        HTTP_CACHE.report()
 
 if __name__ == "__main__":
-    run()
+    # --no-embed: 크롤만 (임베딩은 나중에 python ui_embedder.py 로)
+    run(embed="--no-embed" not in sys.argv)
@@ -0,0 +1,288 @@
+# uiverse_http.py
+# 브라우저 없이 Uiverse 상세/목록 페이지에서 코드 뽑기 (button_crwal 의 fast path)
+# - 서버 렌더링된 HTML 의 textarea(codeArea2=HTML, codeArea1=CSS) / pre>code
+# - 페이지에 실린 JSON 페이로드 (__remixContext, __NEXT_DATA__, React Router turbo-stream)
+#   에서 html/css 필드를 가진 객체 탐색
+# 못 찾으면 None → 호출 측이 Selenium 경로로 폴백
+# pip install requests
+
+import json
+import re
+import threading
+import time
+from html.parser import HTMLParser
+from typing import Optional, Tuple
+
+import requests
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+TIMEOUT = 15
+
+_local = threading.local()
+
+
+def _session() -> requests.Session:
+    # 스레드별 세션 (keep-alive 재사용, requests.Session 은 스레드 간 공유 비권장)
+    s = getattr(_local, "session", None)
+    if s is None:
+        s = requests.Session()
+        s.headers.update({"User-Agent": USER_AGENT, "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8"})
+        _local.session = s
+    return s
+
+
+def fetch_html(url: str) -> Optional[str]:
+    r = _session().get(url, timeout=TIMEOUT)
+    if r.status_code != 200:
+        return None
+    return r.text
+
+
+# ===================== HTML 파싱 =====================
+class _PageParser(HTMLParser):
+    """textarea / pre>code / script 본문 / card__nickname 텍스트 수집"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.textareas = []   # [(id, class, text)]
+        self.codes = []       # pre > code 텍스트
+        self.scripts = []     # [(type, id, text)]
+        self.nickname = None
+        self._capture = None  # ("textarea", id, cls) / ("code",) / ("script", type, id) / ("nick",)
+        self._buf = []
+        self._in_pre = 0
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        if tag == "pre":
+            self._in_pre += 1
+        if self._capture is not None:
+            return
+        if tag == "textarea":
+            self._start(("textarea", a.get("id") or "", a.get("class") or ""))
+        elif tag == "code" and self._in_pre:
+            self._start(("code",))
+        elif tag == "script":
+            self._start(("script", a.get("type") or "", a.get("id") or ""))
+        elif self.nickname is None and "card__nickname" in (a.get("class") or ""):
+            self._start(("nick",))
+
+    def handle_endtag(self, tag):
+        if tag == "pre" and self._in_pre:
+            self._in_pre -= 1
+        if self._capture is None:
+            return
+        kind = self._capture[0]
+        if (kind, tag) in (("textarea", "textarea"), ("code", "code"), ("script", "script")) or kind == "nick":
+            text = "".join(self._buf)
+            if kind == "textarea":
+                self.textareas.append((self._capture[1], self._capture[2], text))
+            elif kind == "code":
+                self.codes.append(text)
+            elif kind == "script":
+                self.scripts.append((self._capture[1], self._capture[2], text))
+            elif text.strip():
+                self.nickname = text.strip().lstrip("@")
+            self._capture = None
+
+    def handle_data(self, data):
+        if self._capture is not None:
+            self._buf.append(data)
+
+    def _start(self, capture):
+        self._capture = capture
+        self._buf = []
+
+
+# ===================== JSON 페이로드 =====================
+REMIX_RE = re.compile(r"window\.__remixContext\s*=\s*(\{.*?\});?\s*$", re.S)
+ENQUEUE_RE = re.compile(r"streamController\.enqueue\((\"(?:[^\"\\]|\\.)*\")\)")
+
+
+def _hydrate_turbo(arr):
+    """React Router turbo-stream 평탄화 배열 → 일반 객체 ({"_3": 4} = arr[3] 키에 arr[4] 값)"""
+    memo = {}
+
+    def walk(i, depth):
+        if not isinstance(i, int) or i < 0 or i >= len(arr) or depth > 80:
+            return None
+        if i in memo:
+            return memo[i]
+        v = arr[i]
+        if isinstance(v, dict):
+            out = {}
+            memo[i] = out
+            for k, vi in v.items():
+                if k.startswith("_") and k[1:].isdigit() and int(k[1:]) < len(arr):
+                    out[str(arr[int(k[1:])])] = walk(vi, depth + 1)
+            return out
+        if isinstance(v, list):
+            if v and isinstance(v[0], str):
+                return v  # 타입 태그 값 (Date 등) → 그대로
+            out = []
+            memo[i] = out
+            out.extend(walk(x, depth + 1) for x in v)
+            return out
+        return v
+
+    return walk(0, 0)
+
+
+def _json_payloads(scripts):
+    for typ, sid, text in scripts:
+        text = text.strip()
+        if not text:
+            continue
+        try:
+            if sid == "__NEXT_DATA__" or typ in ("application/json", "application/ld+json"):
+                yield json.loads(text)
+                continue
+            m = REMIX_RE.search(text)
+            if m:
+                yield json.loads(m.group(1))
+                continue
+            for m in ENQUEUE_RE.finditer(text):
+                chunk = json.loads(m.group(1))  # JS 문자열 리터럴 → 내부 JSON 텍스트
+                for line in chunk.splitlines():
+                    line = line.strip()
+                    if line.startswith("["):
+                        yield _hydrate_turbo(json.loads(line))
+        except (ValueError, RecursionError):
+            continue
+
+
+def _find_code_object(obj, depth=0):
+    """html/css 문자열 필드를 가진 dict 를 DFS 로 탐색 → (html, css, author)"""
+    if depth > 40:
+        return None
+    if isinstance(obj, dict):
+        html = obj.get("html")
+        css = obj.get("css")
+        if isinstance(html, str) and isinstance(css, str) and (html.strip() or css.strip()):
+            user = obj.get("user") or obj.get("author") or {}
+            author = (user.get("username") if isinstance(user, dict) else user) or obj.get("username")
+            return html, css, author if isinstance(author, str) else None
+        values = obj.values()
+    elif isinstance(obj, list):
+        values = obj
+    else:
+        return None
+    for v in values:
+        found = _find_code_object(v, depth + 1)
+        if found:
+            return found
+    return None
+
+
+# ===================== 공개 함수 =====================
+def extract_component(page: str) -> Optional[Tuple[str, str, Optional[str]]]:
+    """상세 페이지 HTML 텍스트 → (html, css, author) / 못 찾으면 None"""
+    p = _PageParser()
+    p.feed(page)
+    p.close()
+
+    # 1) SSR textarea (Selenium 경로와 같은 id)
+    by_id = {tid: text.strip() for tid, _, text in p.textareas if tid}
+    html, css = by_id.get("codeArea2", ""), by_id.get("codeArea1", "")
+    if not (html and css):
+        for _, cls, text in p.textareas:
+            t = text.strip()
+            if not t:
+                continue
+            if not html and "<" in t and ">" in t and "{" not in t[:200]:
+                html = t
+            elif not css and "{" in t and "}" in t and "</" not in t:
+                css = t
+    if html or css:
+        return html, css, p.nickname
+
+    # 2) JSON 페이로드
+    for payload in _json_payloads(p.scripts):
+        found = _find_code_object(payload)
+        if found:
+            h, c, author = found
+            return h, c, p.nickname or author
+
+    # 3) pre > code
+    for t in (c.strip() for c in p.codes):
+        if not html and "<" in t and ">" in t:
+            html = t
+        elif not css and "{" in t and "}" in t:
+            css = t
+    if html or css:
+        return html, css, p.nickname
+    return None
+
+
+def fetch_component(url: str) -> Optional[Tuple[str, str, Optional[str]]]:
+    page = fetch_html(url)
+    return extract_component(page) if page else None
+
+
+HREF_RE = re.compile(r"""href=["']([^"'#?]+)["']""")
+
+
+def fetch_list_links(url: str, pattern: re.Pattern, base: str) -> list:
+    """목록 페이지 SSR HTML 에서 상세 링크 (pattern 은 /author/slug-123 같은 상대경로용)"""
+    page = fetch_html(url)
+    if not page:
+        return []
+    links = set()
+    for href in HREF_RE.findall(page):
+        rel = "/" + href.split("/", 3)[-1] if href.startswith("http") else href
+        if pattern.match(rel):
+            links.add(base + rel)
+    return sorted(links)
+
+
+# ===================== 모드별 통계 =====================
+class ModeStats:
+    """추출 모드(http/selenium)별 시도·성공·소요시간 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def record(self, mode: str, ok: bool, seconds: float):
+        with self._lock:
+            d = self._data.setdefault(mode, {"tried": 0, "ok": 0, "seconds": 0.0})
+            d["tried"] += 1
+            d["ok"] += int(ok)
+            d["seconds"] += seconds
+
+    def timed(self, mode: str):
+        return _Timer(self, mode)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                mode: {
+                    "tried": d["tried"],
+                    "ok": d["ok"],
+                    "success_rate": round(d["ok"] / d["tried"], 3) if d["tried"] else 0.0,
+                    "avg_s": round(d["seconds"] / d["tried"], 3) if d["tried"] else 0.0,
+                }
+                for mode, d in self._data.items()
+            }
+
+    def summary(self) -> str:
+        return " | ".join(
+            f"{mode}: {s['ok']}/{s['tried']} ({s['success_rate']:.0%}, avg {s['avg_s']}s)"
+            for mode, s in self.stats().items()
+        ) or "no attempts"
+
+
+class _Timer:
+    def __init__(self, stats, mode):
+        self.stats, self.mode, self.ok = stats, mode, False
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.record(self.mode, self.ok, time.perf_counter() - self.t0)
+        return False
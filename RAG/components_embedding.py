@@ -1,53 +1,328 @@
-import psycopg2
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
+import os
 import time
+import psycopg2
+from psycopg2.extras import RealDictCursor, execute_values
 from sentence_transformers import SentenceTransformer
 
 # ====== 🧠 모델 로드 ======
-print("🧩 임베딩 모델 로딩 중... (1회만 다운로드됨)")
-model = SentenceTransformer('multi-qa-mpnet-base-dot-v1')
-print("✅ 모델 로드 완료!")
+# 처음 쓸 때 로드 (멀티프로세스 모드에서는 워커마다 1번씩)
+MODEL_NAME = 'multi-qa-mpnet-base-dot-v1'
+_model = None
+
+def get_model():
+    global _model
+    if _model is None:
+        print(f"🧩 [pid {os.getpid()}] 임베딩 모델 로딩 중... (1회만 다운로드됨)")
+        _model = SentenceTransformer(MODEL_NAME)
+        print(f"✅ [pid {os.getpid()}] 모델 로드 완료!")
+    return _model
 
 # ====== 🔧 DB 연결 설정 ======
 DB_DSN = "dbname=daelim user=admin password=qwe123 host=localhost port=5432"
 
-conn = psycopg2.connect(DB_DSN)
-cur = conn.cursor()
+BATCH_SIZE = 256           # DB 에서 읽고/encode 하고/커밋하는 단위
+CHECKPOINT_FILE = "embedding_checkpoint.json"
+
+# 텍스트 빌더가 쓰는 컬럼만 읽음 (embedding 벡터 자체는 안 가져옴)
+TEXT_COLUMNS = {
+    "components_tbl_test": [
+        "components_name", "components_category", "components_library",
+        "components_description", "components_code",
+    ],
+    "css_art_tbl": ["art_name", "art_css"],
+}
+
+# ====== 📍 체크포인트 (테이블별 마지막 커밋 id) ======
+def load_checkpoint():
+    if not os.path.exists(CHECKPOINT_FILE):
+        return {}
+    with open(CHECKPOINT_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_checkpoint(state):
+    tmp = CHECKPOINT_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, CHECKPOINT_FILE)  # 중간에 죽어도 파일이 깨지지 않게
+
+# ====== 🔑 콘텐츠 지문 ======
+# 텍스트 빌더 결과(+모델명)의 해시를 embedding 옆에 저장 → 바뀐 행만 다시 encode
+def fingerprint(text):
+    return hashlib.sha256(f"{MODEL_NAME}\n{text}".encode("utf-8")).hexdigest()
+
+def ensure_hash_column(conn, table_name):
+    with conn.cursor() as cur:
+        cur.execute(f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS embedding_hash TEXT;")
+    conn.commit()
+
+def select_sql(table_name, id_col, where):
+    cols = ", ".join(TEXT_COLUMNS[table_name])
+    return (
+        f"SELECT {id_col}, {cols}, embedding IS NULL AS no_embedding, embedding_hash "
+        f"FROM {table_name} WHERE {where} ORDER BY {id_col};"
+    )
+
+def plan_batch(records, id_col, text_builder, adopt_existing=False, force=False):
+    """
+    반환: (encode 대상 [(id, text, hash)], 해시만 채울 [(id, hash)], 변경없음 수, 빈 텍스트 수)
+    adopt_existing: 해시 없이 embedding 만 있는 기존 행은 다시 encode 하지 않고 해시만 기록
+    force: 지문과 상관없이 전부 encode
+    """
+    to_encode, hash_only = [], []
+    unchanged = skipped = 0
+    for r in records:
+        text = text_builder(r)
+        if not text.strip():
+            skipped += 1
+            continue
+        h = fingerprint(text)
+        if not force and not r["no_embedding"]:
+            if r["embedding_hash"] == h:
+                unchanged += 1
+                continue
+            if adopt_existing and r["embedding_hash"] is None:
+                hash_only.append((r[id_col], h))
+                continue
+        to_encode.append((r[id_col], text, h))
+    return to_encode, hash_only, unchanged, skipped
 
 # ====== 🧠 임베딩 생성 함수 ======
-def generate_embedding_local(text: str):
-    """SentenceTransformer 로컬 임베딩 생성"""
+def generate_embeddings_local(texts):
+    """SentenceTransformer 배치 임베딩 생성"""
     try:
-        return model.encode(text).tolist()
+        return get_model().encode(texts, batch_size=len(texts), show_progress_bar=False)
     except Exception as e:
         print(f"❌ 임베딩 오류: {e}")
         return None
 
+def encode_planned(to_encode):
+    """[(id, text, hash)] → [(id, embedding, hash)], 실패 시 None"""
+    if not to_encode:
+        return []
+    embs = generate_embeddings_local([text for _, text, _ in to_encode])
+    if embs is None:
+        return None
+    return [(row_id, emb, h) for (row_id, _, h), emb in zip(to_encode, embs)]
+
+# ====== 💾 배치 저장 ======
+def write_embeddings(cur, table_name, id_col, rows):
+    """rows: [(id, embedding, hash), ...] → UPDATE ... FROM (VALUES ...) 한 번으로"""
+    execute_values(
+        cur,
+        f"""
+        UPDATE {table_name} AS t
+        SET embedding = data.emb::vector, embedding_hash = data.hash
+        FROM (VALUES %s) AS data(id, emb, hash)
+        WHERE t.{id_col} = data.id;
+        """,
+        [(row_id, emb.tolist(), h) for row_id, emb, h in rows],
+        template="(%s, %s::float4[], %s)",
+        page_size=len(rows),
+    )
+
+def write_hashes(cur, table_name, id_col, rows):
+    """rows: [(id, hash), ...] — 기존 embedding 을 그대로 인정하고 지문만 기록"""
+    execute_values(
+        cur,
+        f"""
+        UPDATE {table_name} AS t
+        SET embedding_hash = data.hash
+        FROM (VALUES %s) AS data(id, hash)
+        WHERE t.{id_col} = data.id;
+        """,
+        rows,
+        page_size=len(rows),
+    )
+
+class Progress:
+    def __init__(self, table_name, total):
+        self.table_name = table_name
+        self.total = total
+        self.done = self.encoded = self.unchanged = self.adopted = self.skipped = self.failed = 0
+        self.start = time.perf_counter()
+
+    def rate(self):
+        elapsed = time.perf_counter() - self.start
+        return self.done / elapsed if elapsed else 0.0
+
+    def line(self):
+        return (f"✅ {self.done}/{self.total} (encode {self.encoded}, 변경없음 {self.unchanged}, "
+                f"지문만 {self.adopted}, 스킵 {self.skipped}, 실패 {self.failed}) — {self.rate():.1f} rows/s")
+
 # ====== 💾 테이블 처리 함수 ======
-def process_table(table_name, id_col, text_builder):
-    cur.execute(f"SELECT {id_col} FROM {table_name} WHERE embedding IS NULL;")
-    rows = cur.fetchall()
-    total = len(rows)
-    print(f"\n🧱 {table_name}: {total}개 처리 예정")
-
-    for idx, (row_id,) in enumerate(rows, start=1):
-        cur.execute(f"SELECT * FROM {table_name} WHERE {id_col} = %s;", (row_id,))
-        data = cur.fetchone()
-        colnames = [desc[0] for desc in cur.description]
-        record = dict(zip(colnames, data))
-
-        text = text_builder(record)
-        if not text.strip():
-            print(f"⚪ {idx}/{total} {row_id} — 내용 없음, 스킵")
-            continue
+def process_table(table_name, id_col, text_builder, batch_size=BATCH_SIZE, checkpoint=None,
+                  adopt_existing=False, force=False):
+    checkpoint = checkpoint if checkpoint is not None else {}
+    last_id = checkpoint.get(table_name, 0)
 
-        emb = generate_embedding_local(text)
-        if emb:
-            cur.execute(f"UPDATE {table_name} SET embedding = %s WHERE {id_col} = %s;", (emb, row_id))
-            conn.commit()
-            print(f"✅ {idx}/{total} {row_id} 저장 완료")
-        else:
-            print(f"❌ {idx}/{total} {row_id} 실패")
-        time.sleep(0.05)  # 약간의 대기
+    # 읽기용(서버 사이드 커서)과 쓰기용 커넥션 분리: 배치마다 커밋해도 읽기 커서는 유지
+    read_conn = psycopg2.connect(DB_DSN)
+    write_conn = psycopg2.connect(DB_DSN)
+    try:
+        ensure_hash_column(write_conn, table_name)
+        with read_conn.cursor() as cur:
+            cur.execute(f"SELECT COUNT(*) FROM {table_name} WHERE {id_col} > %s;", (last_id,))
+            total = cur.fetchone()[0]
+        print(f"\n🧱 {table_name}: {total}개 검사 예정 (체크포인트 id > {last_id})")
+
+        reader = read_conn.cursor(name=f"embed_{table_name}", cursor_factory=RealDictCursor)
+        reader.itersize = batch_size
+        reader.execute(select_sql(table_name, id_col, f"{id_col} > %s"), (last_id,))
+
+        prog = Progress(table_name, total)
+        while True:
+            records = reader.fetchmany(batch_size)
+            if not records:
+                break
+
+            to_encode, hash_only, unchanged, skipped = plan_batch(
+                records, id_col, text_builder, adopt_existing, force
+            )
+            rows = encode_planned(to_encode)
+            with write_conn.cursor() as wcur:
+                if rows:
+                    write_embeddings(wcur, table_name, id_col, rows)
+                if hash_only:
+                    write_hashes(wcur, table_name, id_col, hash_only)
+            write_conn.commit()
+
+            # 커밋 후에만 체크포인트 이동 → 죽으면 이 배치 다음부터 재개
+            prog.done += len(records)
+            prog.encoded += len(rows or [])
+            prog.failed += len(to_encode) if rows is None else 0
+            prog.unchanged += unchanged
+            prog.adopted += len(hash_only)
+            prog.skipped += skipped
+            checkpoint[table_name] = records[-1][id_col]
+            save_checkpoint(checkpoint)
+            print(prog.line())
+
+        reader.close()
+        # 테이블을 끝까지 돌았으면 체크포인트 해제 → 다음 실행은 처음부터 지문 비교
+        checkpoint.pop(table_name, None)
+        save_checkpoint(checkpoint)
+        print(f"🏁 {table_name}: {prog.done}개 검사, {prog.encoded}개 encode — 평균 {prog.rate():.1f} rows/s")
+    finally:
+        read_conn.close()
+        write_conn.close()
+
+# ====== 🧵 멀티프로세스 모드 ======
+# 워커 N개가 각자 모델을 1번 로드하고 서로 겹치지 않는 id 구간을 encode,
+# DB 쓰기는 메인 프로세스(단일 writer)가 모아서 처리
+_worker_conn = None
+
+def _init_worker(torch_threads):
+    global _worker_conn
+    import torch
+    torch.set_num_threads(torch_threads)  # 워커끼리 코어 나눠쓰기 (oversubscription 방지)
+    get_model()
+    _worker_conn = psycopg2.connect(DB_DSN)
+    _worker_conn.autocommit = True
+
+def _ready(_):
+    return os.getpid()
+
+def _embed_range(task):
+    idx, table_name, id_col, text_builder, lo, hi, adopt_existing, force = task
+    with _worker_conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(select_sql(table_name, id_col, f"{id_col} BETWEEN %s AND %s"), (lo, hi))
+        records = cur.fetchall()
+
+    to_encode, hash_only, unchanged, skipped = plan_batch(
+        records, id_col, text_builder, adopt_existing, force
+    )
+    rows = encode_planned(to_encode)
+    failed = len(to_encode) if rows is None else 0
+    return idx, rows or [], hash_only, unchanged, skipped, failed
+
+def process_table_parallel(table_name, id_col, text_builder, workers, batch_size=BATCH_SIZE,
+                           checkpoint=None, adopt_existing=False, force=False, limit=None, write=True):
+    """
+    limit/write=False 는 스케일링 측정용 (앞쪽 limit 개만 encode, DB 에는 안 씀).
+    반환: {"rows": 처리 행 수, "seconds": 걸린 시간, "rate": rows/s}
+    """
+    checkpoint = checkpoint if checkpoint is not None else {}
+    last_id = checkpoint.get(table_name, 0)
+
+    write_conn = psycopg2.connect(DB_DSN)
+    try:
+        ensure_hash_column(write_conn, table_name)
+        with write_conn.cursor() as cur:
+            cur.execute(f"SELECT {id_col} FROM {table_name} WHERE {id_col} > %s ORDER BY {id_col};", (last_id,))
+            ids = [row[0] for row in cur.fetchall()]
+        write_conn.commit()
+        if limit:
+            ids = ids[:limit]
+
+        # batch_size 개씩 연속 id 구간으로 나눔 → 워커끼리 겹치지 않음
+        ranges = [(ids[i], ids[min(i + batch_size, len(ids)) - 1]) for i in range(0, len(ids), batch_size)]
+        sizes = [min(batch_size, len(ids) - i) for i in range(0, len(ids), batch_size)]
+        print(f"\n🧱 {table_name}: {len(ids)}개 검사 예정 — 워커 {workers}개, 구간 {len(ranges)}개")
+        if not ranges:
+            return {"rows": 0, "seconds": 0.0, "rate": 0.0}
+
+        torch_threads = max(1, (os.cpu_count() or 1) // workers)
+        tasks = [(i, table_name, id_col, text_builder, lo, hi, adopt_existing, force)
+                 for i, (lo, hi) in enumerate(ranges)]
+
+        finished = [False] * len(ranges)
+        watermark = 0  # 여기 미만 구간은 전부 커밋됨 → 체크포인트로 안전
+        ctx = mp.get_context("spawn")
+        with ctx.Pool(workers, initializer=_init_worker, initargs=(torch_threads,)) as pool:
+            # 워커 모델 로딩(동시 진행)이 끝난 뒤부터 측정
+            pool.map(_ready, range(workers), chunksize=1)
+            prog = Progress(table_name, len(ids))
+            for idx, rows, hash_only, unchanged, skipped, failed in pool.imap_unordered(_embed_range, tasks):
+                if write and (rows or hash_only):
+                    with write_conn.cursor() as wcur:
+                        if rows:
+                            write_embeddings(wcur, table_name, id_col, rows)
+                        if hash_only:
+                            write_hashes(wcur, table_name, id_col, hash_only)
+                    write_conn.commit()
+                prog.done += sizes[idx]
+                prog.encoded += len(rows)
+                prog.unchanged += unchanged
+                prog.adopted += len(hash_only)
+                prog.skipped += skipped
+                prog.failed += failed
+
+                finished[idx] = True
+                while watermark < len(ranges) and finished[watermark]:
+                    watermark += 1
+                if write and watermark:
+                    checkpoint[table_name] = ranges[watermark - 1][1]
+                    save_checkpoint(checkpoint)
+                print(prog.line())
+
+        elapsed = time.perf_counter() - prog.start
+        rate = prog.rate()
+        if write:
+            checkpoint.pop(table_name, None)
+            save_checkpoint(checkpoint)
+        print(f"🏁 {table_name}: {prog.done}개 검사, {prog.encoded}개 encode {elapsed:.1f}s "
+              f"— 워커 {workers}개 평균 {rate:.1f} rows/s")
+        return {"rows": prog.done, "seconds": elapsed, "rate": rate}
+    finally:
+        write_conn.close()
+
+def scaling_report(table_name, id_col, text_builder, worker_counts, batch_size, sample):
+    """같은 샘플(앞쪽 sample 개)을 워커 수별로 encode 만 해서 rows/s 비교 (DB 쓰기 없음)"""
+    results = []
+    for n in worker_counts:
+        r = process_table_parallel(table_name, id_col, text_builder, n, batch_size,
+                                   checkpoint={}, force=True, limit=sample, write=False)
+        results.append((n, r))
+
+    base = results[0][1]["rate"] or 1.0
+    print(f"\n📈 스케일링 리포트 — {table_name}, 샘플 {sample}행, batch {batch_size}")
+    print(f"{'workers':>8} | {'rows/s':>9} | {'speedup':>7}")
+    for n, r in results:
+        print(f"{n:>8} | {r['rate']:>9.1f} | {r['rate'] / base:>6.2f}x")
 
 # ====== 🧩 UI 기반 텍스트 빌더 ======
 def build_ui_text(r):
@@ -69,11 +344,42 @@ def build_art_text(r):
     """
 
 # ====== 🚀 실행 ======
+TABLES = [
+    ("components_tbl_test", "components_id", build_ui_text),
+    ("css_art_tbl", "art_id", build_art_text),
+]
+
 if __name__ == "__main__":
-    try:
-        process_table("components_tbl_test", "components_id", build_ui_text)
-        process_table("css_art_tbl", "art_id", build_art_text)
-    finally:
-        cur.close()
-        conn.close()
-        print("\n🎉 모든 임베딩 생성 완료!")
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    ap.add_argument("--workers", type=int, default=1, help="1 이면 단일 프로세스 스트리밍 모드")
+    ap.add_argument("--reset", action="store_true", help="체크포인트 무시하고 처음부터")
+    ap.add_argument("--adopt-existing", action="store_true",
+                    help="지문 없는 기존 embedding 은 다시 encode 하지 않고 지문만 기록 (최초 1회 마이그레이션용)")
+    ap.add_argument("--force", action="store_true", help="지문 무시하고 전부 다시 encode")
+    ap.add_argument("--scaling", type=int, nargs="+", metavar="N",
+                    help="워커 수별 rows/s 측정만 (예: --scaling 1 2 4 8), DB 에 쓰지 않음")
+    ap.add_argument("--scaling-sample", type=int, default=2048)
+    args = ap.parse_args()
+
+    if args.scaling:
+        table_name, id_col, builder = TABLES[0]
+        scaling_report(table_name, id_col, builder, args.scaling, args.batch_size, args.scaling_sample)
+        raise SystemExit(0)
+
+    checkpoint = {} if args.reset else load_checkpoint()
+    report = []
+    for table_name, id_col, builder in TABLES:
+        if args.workers > 1:
+            r = process_table_parallel(table_name, id_col, builder, args.workers, args.batch_size,
+                                       checkpoint, args.adopt_existing, args.force)
+            report.append((table_name, r))
+        else:
+            process_table(table_name, id_col, builder, args.batch_size, checkpoint,
+                          args.adopt_existing, args.force)
+
+    if report:
+        print(f"\n📈 워커 {args.workers}개 (코어 {os.cpu_count()}) 결과")
+        for table_name, r in report:
+            print(f"   {table_name}: {r['rows']}행 / {r['seconds']:.1f}s = {r['rate']:.1f} rows/s")
+    print("\n🎉 모든 임베딩 생성 완료!")
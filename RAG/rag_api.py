@@ -5,15 +5,28 @@ from pydantic import BaseModel
 from sentence_transformers import SentenceTransformer
 from openai import OpenAI
 import psycopg2
-import os, json, requests
+import os, sys, json, requests
+
+# 질의 임베딩 캐시는 backend 와 공유
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from embedding_cache import EmbeddingCache
 
 # ======== ⚙️ 기본 설정 ========
 app = FastAPI()
 
 # 임베딩 모델 (질의 → 벡터 변환용)
-model = SentenceTransformer("jhgan/ko-sroberta-multitask")
+EMBED_MODEL_NAME = "jhgan/ko-sroberta-multitask"
+model = SentenceTransformer(EMBED_MODEL_NAME)
 chat_sessions = {}
 
+# 질의 임베딩 캐시 (EMBED_CACHE_PATH 지정 시 디스크 계층도 사용)
+embed_cache = EmbeddingCache(
+    model.encode,
+    model_name=EMBED_MODEL_NAME,
+    max_bytes=int(float(os.getenv("EMBED_CACHE_MAX_MB", "64")) * 1024 * 1024),
+    disk_path=os.getenv("EMBED_CACHE_PATH") or None,
+)
+
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 DB_CONFIG = {
@@ -34,6 +47,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ======== 📈 메트릭 ========
+@app.get("/metrics")
+def metrics():
+    return {"embedding_cache": embed_cache.stats()}
+
 # ======== 💬 요청 스키마 ========
 class ChatRequest(BaseModel):
     query: str
@@ -41,7 +59,7 @@ class ChatRequest(BaseModel):
 
 # ======== 🔍 DB 검색 (RAG) ========
 def retrieve_similar(query, top_k=3):
-    emb = model.encode(query).tolist()
+    emb = embed_cache.encode(query).tolist()
     with psycopg2.connect(**DB_CONFIG) as conn:
         with conn.cursor() as cur:
             cur.execute("""
@@ -0,0 +1,82 @@
+# bench_embedding_batcher.py
+# 동시 질의 임베딩 부하 테스트: 요청마다 encode vs EmbeddingBatcher (배치 encode)
+# 사용법: (backend 디렉터리에서) python bench_embedding_batcher.py --requests 400 --concurrency 1 8 32
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi.concurrency import run_in_threadpool
+from sentence_transformers import SentenceTransformer
+
+from embedding_batcher import EmbeddingBatcher
+
+MODEL_NAME = "jhgan/ko-sroberta-multitask"
+WORDS = ["neon", "glass", "button", "card", "gradient", "login", "form", "glow",
+         "버튼", "카드", "애니메이션", "그림자", "다크", "입력창", "모달", "배지"]
+
+
+def make_queries(n: int):
+    # 캐시 효과가 섞이지 않도록 모두 다른 문장
+    return [f"{WORDS[i % len(WORDS)]} {WORDS[(i * 7) % len(WORDS)]} style #{i}" for i in range(n)]
+
+
+async def run_load(encode, queries, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(q):
+        async with sem:
+            t0 = time.perf_counter()
+            await encode(q)
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(q) for q in queries))
+    wall = time.perf_counter() - t0
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    return len(queries) / wall, statistics.median(latencies), p95
+
+
+async def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=400)
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    ap.add_argument("--wait-ms", type=float, default=5.0)
+    ap.add_argument("--max-batch", type=int, default=32)
+    args = ap.parse_args()
+
+    print("🧩 모델 로딩 중...")
+    model = SentenceTransformer(MODEL_NAME)
+    model.encode(["warm up"])
+    queries = make_queries(args.requests)
+
+    async def single(q):
+        return await run_in_threadpool(model.encode, q)
+
+    batcher = EmbeddingBatcher(
+        lambda texts: model.encode(texts, batch_size=len(texts)),
+        max_wait_ms=args.wait_ms,
+        max_batch=args.max_batch,
+    )
+    await batcher.start()
+
+    print(f"📏 requests={args.requests} wait={args.wait_ms}ms max_batch={args.max_batch}")
+    print(f"{'conc':>5} | {'mode':>8} | {'QPS':>8} | {'p50 ms':>8} | {'p95 ms':>8} | avg batch")
+    try:
+        for c in args.concurrency:
+            qps, p50, p95 = await run_load(single, queries, c)
+            print(f"{c:>5} | {'single':>8} | {qps:>8.1f} | {p50:>8.1f} | {p95:>8.1f} | 1.00")
+
+            b0, i0 = batcher.batches, batcher.items
+            qps, p50, p95 = await run_load(batcher.encode, queries, c)
+            avg = (batcher.items - i0) / max(batcher.batches - b0, 1)
+            print(f"{c:>5} | {'batched':>8} | {qps:>8.1f} | {p50:>8.1f} | {p95:>8.1f} | {avg:.2f}")
+    finally:
+        await batcher.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
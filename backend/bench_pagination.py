@@ -0,0 +1,96 @@
+# bench_pagination.py
+# OFFSET 페이지네이션 vs 커서(keyset) 페이지네이션 지연시간 비교
+# 사용법: (backend 디렉터리에서) python migrate.py 로 인덱스를 만든 뒤
+#        python bench_pagination.py Buttons --pages 1 500 --repeat 20
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import db
+from db import (
+    init_pool, close_pool,
+    list_by_category, list_by_category_after,
+)
+
+SQL_ID_AT_OFFSET_BY_CATEGORY = """
+SELECT components_id
+FROM public.components_tbl_test
+WHERE LOWER(components_category) = LOWER($1)
+ORDER BY components_id DESC
+OFFSET $2
+LIMIT 1;
+"""
+
+SQL_ID_AT_OFFSET_OTHERS = """
+SELECT components_id
+FROM public.components_tbl_test
+WHERE
+  COALESCE(TRIM(components_category),'') <> ''
+  AND LOWER(components_category) NOT IN (
+    SELECT LOWER(x) FROM UNNEST($1::text[]) AS x
+  )
+ORDER BY components_id DESC
+OFFSET $2
+LIMIT 1;
+"""
+
+
+async def _cursor_id_before_page(category: str, page: int, page_size: int):
+    """page 번째 페이지를 커서로 요청할 때 클라이언트가 들고 있을 마지막 id (측정 제외)"""
+    if page <= 1:
+        return None
+    async with db._pool.acquire() as conn:
+        if category.lower() == "others":
+            return await conn.fetchval(
+                SQL_ID_AT_OFFSET_OTHERS, db.PRIMARY_CATEGORIES, (page - 1) * page_size - 1
+            )
+        return await conn.fetchval(SQL_ID_AT_OFFSET_BY_CATEGORY, category, (page - 1) * page_size - 1)
+
+
+async def _time_ms(coro_fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await coro_fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+async def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("category", nargs="?", default="Buttons")
+    ap.add_argument("--pages", type=int, nargs="+", default=[1, 500])
+    ap.add_argument("--page-size", type=int, default=24)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    await init_pool()
+    try:
+        print(f"📏 category={args.category} page_size={args.page_size} repeat={args.repeat}")
+        print(f"{'page':>6} | {'offset p50/max (ms)':>22} | {'cursor p50/max (ms)':>22}")
+        for page in args.pages:
+            offset = (page - 1) * args.page_size
+            off_p50, off_max = await _time_ms(
+                lambda: list_by_category(args.category, offset, args.page_size), args.repeat
+            )
+
+            after_id = await _cursor_id_before_page(args.category, page, args.page_size)
+            if page > 1 and after_id is None:
+                print(f"{page:>6} | 데이터가 부족해서 스킵")
+                continue
+            if after_id is None:
+                # 1페이지: 커서 없음 → OFFSET 0 과 동일한 쿼리
+                cur_p50, cur_max = off_p50, off_max
+            else:
+                cur_p50, cur_max = await _time_ms(
+                    lambda: list_by_category_after(args.category, after_id, args.page_size), args.repeat
+                )
+            print(f"{page:>6} | {off_p50:>10.2f} / {off_max:<9.2f} | {cur_p50:>10.2f} / {cur_max:<9.2f}")
+    finally:
+        await close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
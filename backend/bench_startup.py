@@ -0,0 +1,59 @@
+# bench_startup.py
+# main.py import(=워커 기동) 시간 측정. 새 인터프리터로 여러 번 띄워 중앙값 출력.
+# --with-model 이면 임베딩 모델 첫 로드 시간도 같이 측정
+# 사용법: (backend 디렉터리에서) python bench_startup.py --repeat 5 --with-model
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+IMPORT_SNIPPET = """
+import time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+print(f"import {t1 - t0:.6f}")
+if {with_model}:
+    main.model_provider.get()
+    print(f"model {time.perf_counter() - t1:.6f}")
+"""
+
+
+def run_once(with_model: bool, env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET.replace("{with_model}", str(with_model))],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    result = {}
+    for line in out.splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[0] in ("import", "model"):
+            result[parts[0]] = float(parts[1])
+    return result
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--with-model", action="store_true")
+    args = ap.parse_args()
+
+    # import 만 재는 것이므로 DB/키는 더미여도 됨 (연결은 lifespan 에서)
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "postgresql://bench@localhost/bench")
+    env.setdefault("PG_DSN", "postgresql://bench@localhost/bench")
+    env.setdefault("OPENAI_API_KEY", "bench")
+
+    runs = [run_once(args.with_model, env) for _ in range(args.repeat)]
+    imports = [r["import"] * 1000 for r in runs]
+    print(f"📏 import main: p50 {statistics.median(imports):.1f} ms / max {max(imports):.1f} ms ({args.repeat}회)")
+    if args.with_model:
+        models = [r["model"] * 1000 for r in runs]
+        print(f"🧠 첫 모델 로드: p50 {statistics.median(models):.1f} ms / max {max(models):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
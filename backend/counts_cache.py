@@ -0,0 +1,76 @@
+# counts_cache.py
+# 카테고리 total 카운트용 in-process TTL 캐시 (hit/miss 메트릭 포함)
+
+import time
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+
+class TTLCache:
+    """
+    key → (value, 만료시각). 만료 전이면 hit, 아니면 loader 를 불러 채움.
+    같은 key 에 대한 동시 miss 는 하나의 loader 호출만 기다리게 함 (thundering herd 방지).
+    로딩 중에 invalidate() 가 오면 그 로딩 결과는 (무효화 전에 읽은 값이므로) 캐시에 넣지 않음.
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._data: Dict[str, Tuple[int, float]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._generation = 0  # invalidate() 마다 +1
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[int]]) -> int:
+        now = time.monotonic()
+        entry = self._data.get(key)
+        if entry is not None and entry[1] > now:
+            self.hits += 1
+            return entry[0]
+
+        # 이미 누가 로딩 중이면 그 결과를 같이 기다림
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        generation = self._generation
+        try:
+            value = await loader()
+            if generation == self._generation:
+                self._data[key] = (value, time.monotonic() + self.ttl)
+            fut.set_result(value)
+            return value
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()  # 기다리는 쪽이 없어도 경고 안 뜨게
+            raise
+        finally:
+            if self._inflight.get(key) is fut:
+                self._inflight.pop(key, None)
+
+    def invalidate(self, key: Optional[str] = None):
+        """key 가 없으면 전체 비우기"""
+        self.invalidations += 1
+        self._generation += 1
+        if key is None:
+            self._data.clear()
+            self._inflight.clear()  # 이후 요청은 진행 중인(오래된) 로딩을 기다리지 않고 새로 읽음
+        else:
+            self._data.pop(key, None)
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "invalidations": self.invalidations,
+            "size": len(self._data),
+            "ttl_seconds": self.ttl,
+        }
@@ -1,15 +1,26 @@
 # backend/db.py
 import os
+import json
+import base64
+import asyncio
 import asyncpg
-from typing import List, Dict
+from pgvector.asyncpg import register_vector
+from typing import Callable, List, Dict, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL not set")
+# RAG(unified_components_v3, pgvector) 는 PG_DSN 의 DB 에서 읽음 (카탈로그 DB 와 다를 수 있음)
+PG_DSN = os.getenv("PG_DSN")
+if not PG_DSN:
+    raise RuntimeError("PG_DSN not set")
 
 _pool: asyncpg.Pool | None = None
+_rag_pool: asyncpg.Pool | None = None
+_rag_pool_lock = asyncio.Lock()
+_listen_conn: asyncpg.Connection | None = None
 
 # 기준 카테고리 집합 (Others 제외 기준)
 # 필요 시 자유롭게 수정/추가. 오타 방지용으로 Logins/Loings 둘 다 포함.
@@ -18,6 +29,25 @@ PRIMARY_CATEGORIES = [
     "Logins", "Loings"  # 둘 중 하나만 쓰면 된다면 한쪽 삭제 가능
 ]
 
+async def _init_rag_connection(conn: asyncpg.Connection):
+    # pgvector 타입을 바이너리 코덱으로 등록 → 벡터를 텍스트 리터럴로 주고받지 않음
+    await register_vector(conn)
+
+def _connect_kwargs(dsn: str) -> dict:
+    """
+    asyncpg 는 URL 형식 DSN 만 받음. 크롤러들이 쓰는 libpq 키워드 형식
+    ("dbname=daelim user=admin host=...") 이면 connect 인자로 변환.
+    """
+    if "://" in dsn:
+        return {"dsn": dsn}
+    keys = {"host": "host", "port": "port", "user": "user", "password": "password", "dbname": "database"}
+    out = {}
+    for part in dsn.split():
+        k, _, v = part.partition("=")
+        if k in keys:
+            out[keys[k]] = int(v) if k == "port" else v
+    return out
+
 async def init_pool():
     global _pool
     if _pool is None:
@@ -28,30 +58,70 @@ async def init_pool():
             command_timeout=30,
         )
 
+async def _get_rag_pool() -> asyncpg.Pool:
+    """
+    RAG 전용 풀 (PG_DSN). 처음 검색할 때 생성 → pgvector 가 없거나 PG_DSN DB 가 죽어 있어도
+    /components 등 카탈로그 엔드포인트는 영향 없음 (/chat 만 실패).
+    """
+    global _rag_pool
+    async with _rag_pool_lock:
+        if _rag_pool is None:
+            _rag_pool = await asyncpg.create_pool(
+                **_connect_kwargs(PG_DSN),
+                min_size=1,
+                max_size=5,
+                command_timeout=30,
+                init=_init_rag_connection,
+            )
+        return _rag_pool
+
+async def listen_counts_changed(callback: Callable[[], None]):
+    """
+    카운트 트리거가 NOTIFY 하면 (크롤러 insert 커밋 시) callback() 호출 → 캐시 무효화.
+    LISTEN 은 커넥션 단위라 풀에서 하나를 전용으로 잡아둔다.
+    """
+    global _listen_conn
+    assert _pool is not None, "Pool not initialized"
+    if _listen_conn is not None:
+        return
+    _listen_conn = await _pool.acquire()
+    await _listen_conn.add_listener(COUNTS_CHANNEL, lambda *_: callback())
+
 async def close_pool():
-    global _pool
+    global _pool, _rag_pool, _listen_conn
+    if _listen_conn is not None and _pool is not None:
+        # release 시 UNLISTEN * 로 리셋됨
+        await _pool.release(_listen_conn)
+        _listen_conn = None
     if _pool is not None:
         await _pool.close()
         _pool = None
+    if _rag_pool is not None:
+        await _rag_pool.close()
+        _rag_pool = None
 
 # --- SQL ---
 
+# 0) 카테고리별 카운트 테이블
+#    COUNT(*) 풀스캔을 매 요청마다 돌리지 않도록 트리거가 insert/delete 때마다 +n/-n 으로 유지.
+#    테이블/트리거/인덱스는 migrate.py 가 만듦 (API 기동 시에는 DDL 없음)
+COUNTS_TABLE = "public.components_category_counts"
+COUNTS_CHANNEL = "components_counts_changed"
+
 # 1) 특정 카테고리 카운트
-SQL_COUNT_BY_CATEGORY = """
-SELECT COUNT(*) AS total
-FROM public.components_tbl_test
-WHERE LOWER(components_category) = LOWER($1);
+SQL_COUNT_BY_CATEGORY = f"""
+SELECT COALESCE(SUM(total), 0) AS total
+FROM {COUNTS_TABLE}
+WHERE category = LOWER($1);
 """
 
 # 2) OTHERS 카운트: 기준 카테고리에 속하지 않는 모든 항목
-SQL_COUNT_OTHERS = """
-SELECT COUNT(*) AS total
-FROM public.components_tbl_test
-WHERE
-  COALESCE(TRIM(components_category),'') <> ''
-  AND LOWER(components_category) NOT IN (
-    SELECT LOWER(x) FROM UNNEST($1::text[]) AS x
-  );
+SQL_COUNT_OTHERS = f"""
+SELECT COALESCE(SUM(total), 0) AS total
+FROM {COUNTS_TABLE}
+WHERE category NOT IN (
+  SELECT LOWER(x) FROM UNNEST($1::text[]) AS x
+);
 """
 
 # 3) 특정 카테고리 리스트
@@ -64,7 +134,8 @@ SELECT
   components_author             AS author,
   COALESCE(components_code, '') AS code,   -- 합본 HTML
   NULL                          AS css,
-  NULL                          AS preview,
+  components_preview_html       AS preview,   -- 저장 시점에 만든 iframe 문서 (없으면 NULL → 백필 전, 카드 미표시)
+  COALESCE(components_is_button, false) AS is_button,   -- 카드 목록 필터 (preview_builder 가 저장 시점에 계산)
   components_library            AS library,
   components_source_url         AS source_url,
   COALESCE(components_category,'') AS category          -- ✅ 추가!
@@ -82,7 +153,8 @@ SELECT
   components_author             AS author,
   COALESCE(components_code, '') AS code,
   NULL                          AS css,
-  NULL                          AS preview,
+  components_preview_html       AS preview,   -- 저장 시점에 만든 iframe 문서 (없으면 NULL → 백필 전, 카드 미표시)
+  COALESCE(components_is_button, false) AS is_button,   -- 카드 목록 필터 (preview_builder 가 저장 시점에 계산)
   components_library            AS library,
   components_source_url         AS source_url,
   COALESCE(components_category,'') AS category          -- ✅ 추가!
@@ -98,6 +170,83 @@ LIMIT $3;
 """
 
 
+# 4) 커서(keyset) 리스트: 마지막으로 본 components_id 보다 작은 것만
+#    → OFFSET 처럼 앞 행을 읽고 버리지 않으므로 깊은 페이지도 1페이지와 비용 동일
+SQL_LIST_BY_CATEGORY_AFTER = """
+SELECT
+  components_id                 AS id,
+  components_name               AS name,
+  components_author             AS author,
+  COALESCE(components_code, '') AS code,
+  NULL                          AS css,
+  components_preview_html       AS preview,   -- 저장 시점에 만든 iframe 문서 (없으면 NULL → 백필 전, 카드 미표시)
+  COALESCE(components_is_button, false) AS is_button,   -- 카드 목록 필터 (preview_builder 가 저장 시점에 계산)
+  components_library            AS library,
+  components_source_url         AS source_url,
+  COALESCE(components_category,'') AS category
+FROM public.components_tbl_test
+WHERE LOWER(components_category) = LOWER($1)
+  AND components_id < $2
+ORDER BY components_id DESC
+LIMIT $3;
+"""
+
+SQL_LIST_OTHERS_AFTER = """
+SELECT
+  components_id                 AS id,
+  components_name               AS name,
+  components_author             AS author,
+  COALESCE(components_code, '') AS code,
+  NULL                          AS css,
+  components_preview_html       AS preview,   -- 저장 시점에 만든 iframe 문서 (없으면 NULL → 백필 전, 카드 미표시)
+  COALESCE(components_is_button, false) AS is_button,   -- 카드 목록 필터 (preview_builder 가 저장 시점에 계산)
+  components_library            AS library,
+  components_source_url         AS source_url,
+  COALESCE(components_category,'') AS category
+FROM public.components_tbl_test
+WHERE
+  COALESCE(TRIM(components_category),'') <> ''
+  AND LOWER(components_category) NOT IN (
+    SELECT LOWER(x) FROM UNNEST($1::text[]) AS x
+  )
+  AND components_id < $2
+ORDER BY components_id DESC
+LIMIT $3;
+"""
+
+# 6) RAG 유사도 검색: 벡터는 $1 한 번만 바인딩 (바이너리 전송)
+#    asyncpg 가 커넥션별로 prepared statement 를 캐시하므로 parse/plan 도 1회
+SQL_SEARCH_SIMILAR = """
+SELECT name, html, css, full_code, author, source_type,
+       1 - (embedding <=> $1) AS similarity
+FROM unified_components_v3
+WHERE embedding IS NOT NULL
+ORDER BY embedding <=> $1
+LIMIT $2;
+"""
+
+
+# --- 커서 인코딩 ---
+# 클라이언트에는 불투명(opaque) 문자열로만 노출. 내부 구조는 언제든 바꿀 수 있음.
+
+def encode_cursor(category_or_bucket: str, last_id: int) -> str:
+    raw = json.dumps({"c": category_or_bucket.lower(), "id": int(last_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(category_or_bucket: str, cursor: str) -> Optional[int]:
+    """
+    잘못된 커서거나 다른 카테고리에서 발급된 커서면 None.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if data.get("c") != category_or_bucket.lower():
+            return None
+        return int(data["id"])
+    except Exception:
+        return None
+
+
 # --- 공개 함수 ---
 
 async def count_by_category_or_others(category_or_bucket: str) -> int:
@@ -128,9 +277,34 @@ async def list_by_category_or_others(category_or_bucket: str, offset: int, limit
             rows = await conn.fetch(SQL_LIST_BY_CATEGORY, category_or_bucket, offset, limit)
         return [dict(r) for r in rows]
 
+async def list_by_category_or_others_after(category_or_bucket: str, after_id: int, limit: int) -> List[Dict]:
+    """
+    커서 모드: after_id(마지막으로 본 id) 다음부터 limit 개.
+    """
+    assert _pool is not None, "Pool not initialized"
+    is_others = category_or_bucket.lower() == "others"
+    async with _pool.acquire() as conn:
+        if is_others:
+            rows = await conn.fetch(SQL_LIST_OTHERS_AFTER, PRIMARY_CATEGORIES, after_id, limit)
+        else:
+            rows = await conn.fetch(SQL_LIST_BY_CATEGORY_AFTER, category_or_bucket, after_id, limit)
+        return [dict(r) for r in rows]
+
+async def search_similar(embedding, top_k: int = 3) -> List[asyncpg.Record]:
+    """
+    embedding: numpy 배열 또는 float 리스트.
+    반환 Record 는 (name, html, css, full_code, author, source_type, similarity) 순서로 인덱싱 가능.
+    """
+    pool = await _get_rag_pool()
+    async with pool.acquire() as conn:
+        return await conn.fetch(SQL_SEARCH_SIMILAR, embedding, top_k)
+
 # --- (하위 호환) 기존 함수 명 유지가 필요하면 아래처럼 래핑 가능 ---
 async def count_by_category(category: str) -> int:
     return await count_by_category_or_others(category)
 
 async def list_by_category(category: str, offset: int, limit: int) -> List[Dict]:
     return await list_by_category_or_others(category, offset, limit)
+
+async def list_by_category_after(category: str, after_id: int, limit: int) -> List[Dict]:
+    return await list_by_category_or_others_after(category, after_id, limit)
@@ -0,0 +1,188 @@
+# embedding_cache.py
+# 질의 임베딩 LRU 캐시 (메모리 용량 제한 + 선택적 디스크(sqlite) 계층)
+# "neon button" / " Neon  Button " 같은 반복 질의는 model.encode 를 다시 돌리지 않음
+
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """캐시 키: NFKC + 소문자 + 공백 정리"""
+    t = unicodedata.normalize("NFKC", text or "")
+    return _WS_RE.sub(" ", t).strip().lower()
+
+
+class EmbeddingCache:
+    """
+    encode_fn(text) → 벡터 를 감싸는 LRU 캐시.
+    - 메모리: max_bytes 를 넘으면 가장 오래 안 쓴 항목부터 제거
+    - 디스크: disk_path 가 있으면 sqlite 에 write-through, 재시작 후에도 재사용
+    스레드풀에서 동시에 불려도 되도록 lock 으로 보호 (메모리/디스크 lock 분리 → 디스크 I/O 중에도 메모리 hit 는 안 막힘).
+    async 코드에서는 aget/aput → 메모리 hit 는 바로, 디스크는 스레드풀에서 (이벤트 루프에서 sqlite 안 돌림).
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[str], np.ndarray],
+        model_name: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        disk_path: Optional[str] = None,
+    ):
+        self.encode_fn = encode_fn
+        self.model_name = model_name
+        self.max_bytes = max_bytes
+        self._mem: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._disk: Optional[sqlite3.Connection] = None
+        if disk_path:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                " model TEXT NOT NULL, query TEXT NOT NULL, vec BLOB NOT NULL,"
+                " PRIMARY KEY (model, query))"
+            )
+            self._disk.commit()
+
+    # --- 내부 ---
+    def _entry_size(self, key: str, vec: np.ndarray) -> int:
+        return vec.nbytes + len(key.encode())
+
+    def _put_mem(self, key: str, vec: np.ndarray):
+        size = self._entry_size(key, vec)
+        if size > self.max_bytes:
+            return
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._bytes -= self._entry_size(key, old)
+        self._mem[key] = vec
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            k, v = self._mem.popitem(last=False)
+            self._bytes -= self._entry_size(k, v)
+            self.evictions += 1
+
+    def _get_disk(self, key: str) -> Optional[np.ndarray]:
+        if self._disk is None:
+            return None
+        with self._disk_lock:
+            row = self._disk.execute(
+                "SELECT vec FROM query_embeddings WHERE model = ? AND query = ?",
+                (self.model_name, key),
+            ).fetchone()
+        if row is None:
+            return None
+        vec = np.frombuffer(row[0], dtype=np.float32)
+        vec.flags.writeable = False
+        return vec
+
+    def _put_disk(self, key: str, vec: np.ndarray):
+        if self._disk is None:
+            return
+        with self._disk_lock:
+            self._disk.execute(
+                "INSERT OR REPLACE INTO query_embeddings (model, query, vec) VALUES (?, ?, ?)",
+                (self.model_name, key, vec.tobytes()),
+            )
+            self._disk.commit()
+
+    def _lookup_mem(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vec = self._mem.get(key)
+            if vec is not None:
+                self._mem.move_to_end(key)
+                self.memory_hits += 1
+            elif self._disk is None:
+                self.misses += 1
+            return vec
+
+    def _lookup_disk(self, key: str) -> Optional[np.ndarray]:
+        vec = self._get_disk(key)
+        with self._lock:
+            if vec is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._put_mem(key, vec)
+        return vec
+
+    def _store_mem(self, query: str, vec):
+        key = normalize_query(query)
+        vec = np.asarray(vec, dtype=np.float32)
+        vec.flags.writeable = False
+        with self._lock:
+            self._put_mem(key, vec)
+        return key, vec
+
+    # --- 공개 ---
+    def get(self, query: str) -> Optional[np.ndarray]:
+        """캐시에 있으면 벡터, 없으면 None (miss 로 집계)"""
+        key = normalize_query(query)
+        vec = self._lookup_mem(key)
+        if vec is not None or self._disk is None:
+            return vec
+        return self._lookup_disk(key)
+
+    def put(self, query: str, vec) -> np.ndarray:
+        key, vec = self._store_mem(query, vec)
+        self._put_disk(key, vec)
+        return vec
+
+    async def aget(self, query: str) -> Optional[np.ndarray]:
+        """get 과 같지만 메모리 miss 일 때만 디스크 조회를 스레드풀에서"""
+        key = normalize_query(query)
+        vec = self._lookup_mem(key)
+        if vec is not None or self._disk is None:
+            return vec
+        return await run_in_threadpool(self._lookup_disk, key)
+
+    async def aput(self, query: str, vec) -> np.ndarray:
+        """put 과 같지만 디스크 쓰기는 스레드풀에서"""
+        key, vec = self._store_mem(query, vec)
+        if self._disk is not None:
+            await run_in_threadpool(self._put_disk, key, vec)
+        return vec
+
+    def encode(self, query: str) -> np.ndarray:
+        vec = self.get(query)
+        if vec is not None:
+            return vec
+        # encode 는 lock 밖에서 (느린 CPU 작업이 다른 hit 를 막지 않도록)
+        return self.put(query, self.encode_fn(normalize_query(query)))
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / total, 4) if total else 0.0,
+                "entries": len(self._mem),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "disk_enabled": self._disk is not None,
+            }
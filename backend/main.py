@@ -1,38 +1,96 @@
 # main.py
+from contextlib import asynccontextmanager
 from typing import List, Optional
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
-from sentence_transformers import SentenceTransformer
-from openai import OpenAI
-import psycopg2
-import os, json, requests
-
-from db import init_pool, close_pool, count_by_category, list_by_category
+import os, asyncio
+
+from counts_cache import TTLCache
+from embedding_batcher import EmbeddingBatcher
+from embedding_cache import EmbeddingCache, normalize_query
+from providers import LazyProvider
+from db import (
+    init_pool, close_pool, listen_counts_changed,
+    count_by_category, list_by_category, list_by_category_after,
+    encode_cursor, decode_cursor, search_similar,
+)
 
 # ======== ⚙️ ENV 로드 ========
 load_dotenv()
 
 # ✅ 환경변수에서 값 읽기
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-PG_DSN = os.getenv("PG_DSN")  # or 개별 DB_* 로 조합해도 됨
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:5173")
 
 # ✅ 필수 값 검증 (서버 켜질 때 바로 실패시켜서 실수 방지)
 assert OPENAI_API_KEY, "OPENAI_API_KEY 환경변수를 설정하세요."
-assert PG_DSN, "PG_DSN 환경변수를 설정하세요."
+
+# ✅ WARMUP_MODELS=1 이면 기동 직후 백그라운드에서 모델 미리 로드 (기동 자체는 안 막음)
+WARMUP_MODELS = os.getenv("WARMUP_MODELS", "0") == "1"
 
 # ======== 🧠 모델/세션 ========
-model = SentenceTransformer("jhgan/ko-sroberta-multitask")
+# 모델/클라이언트는 처음 필요할 때 로드 (sentence_transformers/torch import 포함)
+EMBED_MODEL_NAME = "jhgan/ko-sroberta-multitask"
+
+
+def _load_embedding_model():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBED_MODEL_NAME)
+
+
+def _load_openai_client():
+    from openai import OpenAI
+    return OpenAI(api_key=OPENAI_API_KEY)  # ✅ 하드코딩 제거
+
+
+model_provider = LazyProvider("embedding model", _load_embedding_model)
+openai_provider = LazyProvider("OpenAI client", _load_openai_client)
 chat_sessions = {}
 
-# ✅ OpenAI 클라이언트 (하드코딩 제거)
-client = OpenAI(api_key=OPENAI_API_KEY)
+# ✅ 질의 임베딩 캐시 (EMBED_CACHE_PATH 지정 시 디스크 계층도 사용)
+embed_cache = EmbeddingCache(
+    lambda text: model_provider.get().encode(text),
+    model_name=EMBED_MODEL_NAME,
+    max_bytes=int(float(os.getenv("EMBED_CACHE_MAX_MB", "64")) * 1024 * 1024),
+    disk_path=os.getenv("EMBED_CACHE_PATH") or None,
+)
+
+# ✅ 캐시 miss 는 짧은 창 동안 모아서 배치 encode
+embed_batcher = EmbeddingBatcher(
+    lambda texts: model_provider.get().encode(texts, batch_size=len(texts)),
+    max_wait_ms=float(os.getenv("EMBED_BATCH_WAIT_MS", "5")),
+    max_batch=int(os.getenv("EMBED_BATCH_MAX", "32")),
+)
+
+# ✅ 카테고리 total 캐시 (카운트 트리거 NOTIFY 로 즉시 무효화, 아니면 TTL 만료)
+COUNTS_CACHE_TTL = float(os.getenv("COUNTS_CACHE_TTL", "300"))
+counts_cache = TTLCache(ttl=COUNTS_CACHE_TTL)
+
+# ======== ✅ Lifespan ========
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_pool()  # 스키마(인덱스/카운트 트리거)는 migrate.py 로 배포 시 한 번 → 기동은 읽기만
+    await listen_counts_changed(counts_cache.invalidate)
+    await embed_batcher.start()
+    if WARMUP_MODELS:
+        app.state.warmup_task = asyncio.create_task(_warmup())  # 참조 유지 (GC 방지)
+    try:
+        yield
+    finally:
+        await embed_batcher.stop()
+        await close_pool()
+
+
+async def _warmup():
+    await model_provider.aget()
+    await openai_provider.aget()
+
 
 # ✅ app 생성
-app = FastAPI(title="CSS Components API (async)")
+app = FastAPI(title="CSS Components API (async)", lifespan=lifespan)
 
 # ======== 🌐 CORS ========
 origins = [o.strip() for o in ALLOWED_ORIGINS.split(",") if o.strip()]
@@ -51,6 +109,8 @@ class ComponentOut(BaseModel):
     author: Optional[str] = None
     code: str
     category: Optional[str] = None  # Others에서 사용
+    preview: Optional[str] = None   # 저장 시점에 만든 iframe 문서 (백필 전 행은 None)
+    is_button: bool = False         # 버튼 흔적 + "Button" 텍스트 (프론트 카드 필터, 저장 시점에 계산)
 
 
 class PaginatedResponse(BaseModel):
@@ -58,17 +118,7 @@ class PaginatedResponse(BaseModel):
     total: int
     page: int
     page_size: int
-
-
-# ======== ✅ Lifespan ========
-@app.on_event("startup")
-async def _startup():
-    await init_pool()
-
-
-@app.on_event("shutdown")
-async def _shutdown():
-    await close_pool()
+    next_cursor: Optional[str] = None  # 다음 요청에 cursor= 로 그대로 넘기면 됨 (없으면 끝)
 
 
 @app.get("/health")
@@ -76,18 +126,46 @@ async def health():
     return {"ok": True}
 
 
+@app.get("/metrics")
+async def metrics():
+    return {
+        "counts_cache": counts_cache.stats(),
+        "embedding_cache": embed_cache.stats(),
+        "embedding_batcher": embed_batcher.stats(),
+        "providers": {
+            p.name: p.stats() for p in (model_provider, openai_provider)
+        },
+    }
+
+
 # ======== 📚 Components API ========
 @app.get("/components", response_model=PaginatedResponse)
 async def get_components(
     category: str = Query(..., description="예: buttons/cards/inputs"),
     page: int = Query(1, ge=1),
     page_size: int = Query(24, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (있으면 page 무시)"),
 ):
-    total = await count_by_category(category)
-    offset = (page - 1) * page_size
-    rows = await list_by_category(category, offset, page_size)
+    total = await counts_cache.get_or_load(category.lower(), lambda: count_by_category(category))
+
+    # 한 개 더 읽어서 다음 페이지 존재 여부 판단
+    if cursor:
+        after_id = decode_cursor(category, cursor)
+        if after_id is None:
+            raise HTTPException(status_code=400, detail="invalid cursor")
+        rows = await list_by_category_after(category, after_id, page_size + 1)
+    else:
+        offset = (page - 1) * page_size
+        rows = await list_by_category(category, offset, page_size + 1)
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = encode_cursor(category, rows[-1]["id"]) if has_more else None
+
     items = [ComponentOut(**row) for row in rows]
-    return PaginatedResponse(items=items, total=total, page=page, page_size=page_size)
+    return PaginatedResponse(
+        items=items, total=total, page=page, page_size=page_size, next_cursor=next_cursor
+    )
 
 
 # ======== 💬 Chat Request ========
@@ -97,25 +175,17 @@ class ChatRequest(BaseModel):
 
 
 # ======== 🔍 DB 검색 (RAG) ========
-def retrieve_similar(query, top_k=3):
-    emb = model.encode(query).tolist()
-    with psycopg2.connect(PG_DSN) as conn:   # ✅ PG_DSN 사용
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT name, html, css, full_code, author, source_type,
-                       1 - (embedding <=> %s::vector) AS similarity
-                FROM unified_components_v3
-                WHERE embedding IS NOT NULL
-                ORDER BY embedding <=> %s::vector
-                LIMIT %s;
-            """, (emb, emb, top_k))
-            rows = cur.fetchall()
-    return rows
+async def retrieve_similar(query, top_k=3):
+    emb = await embed_cache.aget(query)  # 디스크 계층(sqlite)은 스레드풀에서 → 이벤트 루프 안 막음
+    if emb is None:
+        # 동시 요청들과 묶어서 한 번의 forward 로 (스레드풀에서 실행)
+        emb = await embed_cache.aput(query, await embed_batcher.encode(normalize_query(query)))
+    return await search_similar(emb, top_k)   # ✅ PG_DSN 전용 asyncpg 풀 (pgvector 코덱 등록)
 
 
 # ======== 🧠 Prompt ========
-def build_prompt_with_history(history, query):
-    examples = retrieve_similar(query, top_k=3)
+async def build_prompt_with_history(history, query):
+    examples = await retrieve_similar(query, top_k=3)
     examples_text = "\n\n".join([
         f"[{ex[5]}] 예시 (by {ex[4]}):\nHTML:\n{ex[1]}\n\nCSS:\n{ex[2]}"
         for ex in examples if ex[1] and ex[2]
@@ -146,7 +216,7 @@ def build_prompt_with_history(history, query):
 
 # ======== 🚀 GPT-4o mini Streaming ========
 @app.post("/chat/stream")
-def chat_stream(req: ChatRequest):
+async def chat_stream(req: ChatRequest):
     session_id = req.session_id
     query = req.query
 
@@ -154,43 +224,30 @@ def chat_stream(req: ChatRequest):
         chat_sessions[session_id] = []
 
     history = chat_sessions[session_id]
-    prompt = build_prompt_with_history(history, query)
+    prompt = await build_prompt_with_history(history, query)
 
     def stream_generator():
-        with requests.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {OPENAI_API_KEY}",  # ✅ 하드코딩 제거
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "gpt-4o-mini",
-                "messages": [
-                    {"role": "system", "content": "You are a creative web designer."},
-                    {"role": "user", "content": prompt}
-                ],
-                "stream": True
-            },
-            stream=True
-        ) as r:
-            full_response = ""
-            for line in r.iter_lines():
-                if not line or not line.decode().startswith("data: "):
-                    continue
-                data = line.decode()[6:]
-                if data.strip() == "[DONE]":
-                    break
-                try:
-                    json_data = json.loads(data)
-                    delta = json_data["choices"][0]["delta"]
-                    if "content" in delta:
-                        chunk = delta["content"]
-                        full_response += chunk
-                        yield chunk
-                except Exception:
+        # 동기 제너레이터 → StreamingResponse 가 스레드풀에서 돌림 (첫 요청이면 클라이언트 로드도 거기서)
+        client = openai_provider.get()
+        stream = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are a creative web designer."},
+                {"role": "user", "content": prompt}
+            ],
+            stream=True,
+        )
+        full_response = ""
+        with stream:
+            for event in stream:
+                if not event.choices:
                     continue
+                chunk = event.choices[0].delta.content
+                if chunk:
+                    full_response += chunk
+                    yield chunk
 
-            history.append({"role": "user", "content": query})
-            history.append({"role": "assistant", "content": full_response})
+        history.append({"role": "user", "content": query})
+        history.append({"role": "assistant", "content": full_response})
 
     return StreamingResponse(stream_generator(), media_type="text/event-stream")
@@ -0,0 +1,126 @@
+# migrate.py
+# 백엔드가 쓰는 스키마(인덱스/컬럼/카테고리 카운트 테이블+트리거) 를 한 번 적용하는 스크립트
+# - API 프로세스는 기동 시 DDL 을 돌리지 않음 (워커 여러 개가 동시에 떠도 락 경합 없음) → 배포 때 한 번 실행
+# - 인덱스는 CREATE INDEX CONCURRENTLY (크롤러 insert 를 막지 않음, 트랜잭션 밖에서 하나씩)
+# - 카테고리 카운트는 트리거가 insert/delete 문장마다 +n/-n upsert → 전체 재집계 없음
+#   (카운트 재계산은 이 스크립트를 다시 돌리면 됨: 트리거 설치 + 재집계를 같은 트랜잭션에서)
+# 사용법: (backend 디렉터리에서) python migrate.py
+
+import asyncio
+import time
+
+import asyncpg
+
+from db import COUNTS_CHANNEL, COUNTS_TABLE, DATABASE_URL
+
+TABLE = "public.components_tbl_test"
+
+# 미리보기 문서는 크롤러(preview_builder)가 components_preview_html 에 저장, 부가 플래그는 아래 컬럼
+SQL_ENSURE_PREVIEW_COLUMNS = f"""
+ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS components_needs_tailwind boolean;
+ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS components_is_button boolean;
+"""
+
+# keyset 스캔용 인덱스: (LOWER(category), id DESC) 로 바로 시작 위치를 찾음
+# CONCURRENTLY 는 트랜잭션 블록 안에서 못 돌리므로 문장 하나씩 execute
+SQL_CREATE_INDEXES = [
+    f"""
+CREATE INDEX CONCURRENTLY IF NOT EXISTS components_tbl_test_lower_category_id_idx
+  ON {TABLE} (LOWER(components_category), components_id DESC);
+""",
+]
+
+# 카테고리별 카운트 테이블 + 증분 유지 트리거
+# - insert/delete: 문장 단위 트리거 (transition table) → COPY/멀티 VALUES 한 번에 카테고리당 upsert 1회
+# - 카테고리 변경 update: 행 단위 (드묾) → 옛 카테고리 -1, 새 카테고리 +1
+# - pg_notify 는 커밋 시점에 전달되고 트랜잭션 안에서 중복은 합쳐짐 → 백엔드 캐시 무효화
+SQL_COUNTS_SCHEMA = f"""
+-- 예전 materialized view 가 있으면 같은 이름의 테이블로 교체
+DO $$
+BEGIN
+  IF (SELECT relkind FROM pg_class WHERE oid = to_regclass('{COUNTS_TABLE}')) = 'm' THEN
+    DROP MATERIALIZED VIEW {COUNTS_TABLE};
+  END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS {COUNTS_TABLE} (
+  category text PRIMARY KEY,
+  total bigint NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION public.components_category_counts_bump() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  INSERT INTO {COUNTS_TABLE} AS c (category, total)
+  SELECT LOWER(components_category),
+         CASE TG_OP WHEN 'DELETE' THEN -COUNT(*) ELSE COUNT(*) END
+  FROM changed_rows
+  WHERE COALESCE(TRIM(components_category),'') <> ''
+  GROUP BY LOWER(components_category)
+  ON CONFLICT (category) DO UPDATE SET total = c.total + EXCLUDED.total;
+  PERFORM pg_notify('{COUNTS_CHANNEL}', '');
+  RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION public.components_category_counts_move() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  INSERT INTO {COUNTS_TABLE} AS c (category, total)
+  SELECT category, n
+  FROM (VALUES (LOWER(OLD.components_category), -1), (LOWER(NEW.components_category), 1)) AS v(category, n)
+  WHERE COALESCE(TRIM(category),'') <> ''
+  ON CONFLICT (category) DO UPDATE SET total = c.total + EXCLUDED.total;
+  PERFORM pg_notify('{COUNTS_CHANNEL}', '');
+  RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS components_category_counts_ins ON {TABLE};
+CREATE TRIGGER components_category_counts_ins
+  AFTER INSERT ON {TABLE}
+  REFERENCING NEW TABLE AS changed_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.components_category_counts_bump();
+
+DROP TRIGGER IF EXISTS components_category_counts_del ON {TABLE};
+CREATE TRIGGER components_category_counts_del
+  AFTER DELETE ON {TABLE}
+  REFERENCING OLD TABLE AS changed_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION public.components_category_counts_bump();
+
+DROP TRIGGER IF EXISTS components_category_counts_upd ON {TABLE};
+CREATE TRIGGER components_category_counts_upd
+  AFTER UPDATE OF components_category ON {TABLE}
+  FOR EACH ROW
+  WHEN (LOWER(OLD.components_category) IS DISTINCT FROM LOWER(NEW.components_category))
+  EXECUTE FUNCTION public.components_category_counts_move();
+"""
+
+# 트리거를 만든 트랜잭션 안에서(테이블 쓰기 잠금 유지 중) 재집계 → 그 사이 insert 가 빠지거나 두 번 세지지 않음
+SQL_RECOUNT = f"""
+DELETE FROM {COUNTS_TABLE};
+INSERT INTO {COUNTS_TABLE} (category, total)
+SELECT LOWER(components_category), COUNT(*)
+FROM {TABLE}
+WHERE COALESCE(TRIM(components_category),'') <> ''
+GROUP BY LOWER(components_category);
+NOTIFY {COUNTS_CHANNEL};
+"""
+
+
+async def migrate():
+    conn = await asyncpg.connect(DATABASE_URL)
+    try:
+        t0 = time.perf_counter()
+        await conn.execute(SQL_ENSURE_PREVIEW_COLUMNS)
+        for sql in SQL_CREATE_INDEXES:
+            await conn.execute(sql)
+        async with conn.transaction():
+            await conn.execute(SQL_COUNTS_SCHEMA)
+            await conn.execute(SQL_RECOUNT)
+        n = await conn.fetchval(f"SELECT COUNT(*) FROM {COUNTS_TABLE}")
+        print(f"✅ 마이그레이션 완료 ({time.perf_counter() - t0:.2f}s), 카테고리 {n}개 카운트")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,50 @@
+# providers.py
+# 무거운 객체(임베딩 모델, OpenAI 클라이언트)를 import 시점이 아니라 처음 쓸 때 만들기
+# → /components, /health 만 쓰는 워커는 모델 로딩 없이 바로 뜸
+
+import threading
+import time
+from typing import Callable, Generic, Optional, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+
+T = TypeVar("T")
+
+
+class LazyProvider(Generic[T]):
+    """
+    factory() 를 최초 get() 때 한 번만 호출 (스레드 안전, double-checked lock).
+    async 코드에서는 aget() 으로 → 로딩이 스레드풀에서 돌아 이벤트 루프를 막지 않음.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self.name = name
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._lock = threading.Lock()
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._value is not None
+
+    def get(self) -> T:
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    t0 = time.perf_counter()
+                    self._value = self._factory()
+                    self.load_seconds = time.perf_counter() - t0
+                    print(f"✅ {self.name} 로드 완료 ({self.load_seconds:.2f}s)")
+        return self._value
+
+    async def aget(self) -> T:
+        if self._value is not None:
+            return self._value
+        return await run_in_threadpool(self.get)
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+        }
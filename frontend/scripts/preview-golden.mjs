@@ -0,0 +1,31 @@
+// preview-golden.mjs
+// preview-builder.mjs (예전 프론트 srcDoc 규칙) 로 Crawl/preview_golden/*.input.html 의 기준 결과를 만듦
+// - <name>.golden.html : chooseSrcDoc(입력) — Crawl/test_preview_parity.py 가 preview_builder.build_preview 와 비교
+// - css_only*          : body 가 CSS 텍스트뿐인 문서는 브라우저 DOMParser 가 필요해서
+//                        합성 마크업 synthesizeFromCss(body) 만 <name>.synth.html 로
+// 사용법: node scripts/preview-golden.mjs   (의존성 없음, 규칙을 바꾼 뒤 다시 실행해서 golden 갱신)
+
+import { readdirSync, readFileSync, writeFileSync } from "node:fs";
+import { dirname, join } from "node:path";
+import { fileURLToPath } from "node:url";
+
+import { chooseSrcDoc, decodeEntities, synthesizeFromCss } from "./preview-builder.mjs";
+
+const GOLDEN_DIR = join(dirname(fileURLToPath(import.meta.url)), "..", "..", "Crawl", "preview_golden");
+
+function cssOnlyBody(html = "") {
+  const m = decodeEntities(html).match(/<body[^>]*>([\s\S]*?)<\/body>/i);
+  return m ? m[1].trim() : "";
+}
+
+for (const file of readdirSync(GOLDEN_DIR).filter((f) => f.endsWith(".input.html")).sort()) {
+  const name = file.slice(0, -".input.html".length);
+  const input = readFileSync(join(GOLDEN_DIR, file), "utf-8");
+  if (name.startsWith("css_only")) {
+    writeFileSync(join(GOLDEN_DIR, `${name}.synth.html`), synthesizeFromCss(cssOnlyBody(input)));
+    console.log(`✅ ${name}.synth.html`);
+  } else {
+    writeFileSync(join(GOLDEN_DIR, `${name}.golden.html`), chooseSrcDoc(input));
+    console.log(`✅ ${name}.golden.html`);
+  }
+}
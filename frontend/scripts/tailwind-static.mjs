@@ -0,0 +1,37 @@
+// tailwind-static.mjs
+// 컴포넌트별 최소 Tailwind CSS 를 오프라인으로 컴파일 (미리보기 iframe 에서 CDN JIT 를 없애기 위함)
+// - Crawl/tailwind_static.py 가 띄워서 JSON 한 줄씩 주고받음
+//   stdin : {"id": 1, "candidates": ["px-4", "hover:bg-blue-600", ...], "css": ".bg-grey-200 { @apply bg-gray-200; }"}
+//   stdout: {"id": 1, "css": "..."}  또는  {"id": 1, "error": "..."}
+// - 미리보기 CDN(cdn.tailwindcss.com, v3) 과 같은 결과가 나와야 하므로 앱의 tailwindcss(v4) 가 아니라
+//   scripts/package.json 에 고정한 v3 로 컴파일 (Node 는 scripts/node_modules 를 먼저 찾음)
+// - CDN 설정과 동일: base/components/utilities, corePlugins.preflight=false
+//   (base 는 preflight 없이 --tw-* 변수 기본값만 — shadow/ring/transform 유틸이 이 변수에 의존)
+// 사용법: npm install --prefix scripts && node scripts/tailwind-static.mjs
+
+import readline from "node:readline";
+import postcss from "postcss";
+import tailwindcss from "tailwindcss";
+
+const INPUT_CSS = "@tailwind base;\n@tailwind components;\n@tailwind utilities;\n";
+
+async function buildOne({ candidates = [], css = "" }) {
+  const config = {
+    content: [{ raw: candidates.join(" "), extension: "html" }],
+    corePlugins: { preflight: false },
+  };
+  const result = await postcss([tailwindcss(config)]).process(INPUT_CSS + css, { from: undefined });
+  return result.css;
+}
+
+const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+for await (const line of rl) {
+  if (!line.trim()) continue;
+  let req = {};
+  try {
+    req = JSON.parse(line);
+    process.stdout.write(JSON.stringify({ id: req.id, css: await buildOne(req) }) + "\n");
+  } catch (e) {
+    process.stdout.write(JSON.stringify({ id: req.id ?? null, error: String(e?.message || e) }) + "\n");
+  }
+}
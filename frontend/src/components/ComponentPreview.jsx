@@ -27,11 +27,6 @@ const guessLanguage = (code = "") => {
 const keyOf = (item, idx) => String(item?.id ?? item?._id ?? item?.slug ?? `row-${idx}`);
 const normalizeCategoryLabel = (s = "") => (s ? s.charAt(0).toUpperCase() + s.slice(1).toLowerCase() : s);
 
-/* 빠른 정적 필터 */
-const hasButtonSignatureFast = (html = "") =>
-  /<(button)\b|role=["']button["']|class=["'][^"']*\b(btn|button)\b/i.test(html || "");
-const includesButtonText = (html = "") => />[^<]*Button[^<]*</i.test(html || "");
-
 export default function ComponentPreview() {
   const { category } = useParams();
   const navigate = useNavigate();
@@ -43,6 +38,9 @@ export default function ComponentPreview() {
   const [err, setErr] = useState(null);
 
   const sentinelRef = useRef(null);
+  // 서버가 준 next_cursor (keyset 페이지네이션) — 있으면 page 대신 사용
+  const cursorRef = useRef(null);
+  const [hasNext, setHasNext] = useState(false);
   const [openCodeIds, setOpenCodeIds] = useState(() => new Set());
   const [expandedItem, setExpandedItem] = useState(null);
   const isOthers = (category || "").toLowerCase() === "others";
@@ -52,6 +50,7 @@ export default function ComponentPreview() {
 
   useEffect(() => {
     setItems([]); setTotal(0); setPage(1); setErr(null);
+    cursorRef.current = null; setHasNext(false);
     setOpenCodeIds(new Set()); setExpandedItem(null);
     setHiddenIds(new Set());
   }, [category]);
@@ -67,6 +66,7 @@ export default function ComponentPreview() {
     url.searchParams.set("category", normalizedCategory);
     url.searchParams.set("page", String(page));
     url.searchParams.set("page_size", String(PAGE_SIZE));
+    if (page > 1 && cursorRef.current) url.searchParams.set("cursor", cursorRef.current);
 
     fetch(url.toString())
       .then(async (res) => {
@@ -80,6 +80,8 @@ export default function ComponentPreview() {
         if (ignore) return;
         const nextItems = Array.isArray(data.items) ? data.items : [];
         setTotal(Number(data.total || 0));
+        cursorRef.current = data.next_cursor || null;
+        setHasNext(Boolean(data.next_cursor));
         setItems((prev) => {
           if (page === 1) return nextItems;
           const seen = new Set(prev.map((x) => x.id ?? x._id ?? x.slug));
@@ -97,7 +99,7 @@ export default function ComponentPreview() {
     return () => { ignore = true; };
   }, [category, page]);
 
-  const hasMore = items.length < total;
+  const hasMore = hasNext;
 
   const subcatCounts = useMemo(() => {
     if (!isOthers) return [];
@@ -135,10 +137,7 @@ export default function ComponentPreview() {
     return () => window.removeEventListener("keydown", onKey);
   }, []);
 
-  const openFull = (item) => {
-    const safe = decodeEntities(item.code || "");
-    setExpandedItem({ ...item, _safeCode: safe });
-  };
+  const openFull = (item) => setExpandedItem(item);
   const closeFull = () => setExpandedItem(null);
 
   return (
@@ -228,9 +227,9 @@ export default function ComponentPreview() {
           const key = keyOf(item, idx);
           if (hiddenIds.has(key)) return null; // 프리플라이트 실패 → 카드 자체 미표시
 
+          // 1차 컷 (버튼 흔적 + "Button" 텍스트) 은 저장 시점에 계산된 is_button, 미리보기 백필 전 행도 생략
+          if (!item.is_button || !item.preview) return null;
           const safeCode = decodeEntities(item.code || "");
-          // 1차 빠른 정적 컷: 버튼 흔적 + "Button" 텍스트
-          if (!hasButtonSignatureFast(safeCode) || !includesButtonText(safeCode)) return null;
 
           const lang = guessLanguage(safeCode);
           const codeOpen = openCodeIds.has(key);
@@ -268,7 +267,7 @@ export default function ComponentPreview() {
               {/* 미리보기 (여기서 최종 프리플라이트 실패 시 카드 숨김) */}
               <div className="cmp-preview">
                 <IframePreview
-                  code={safeCode}
+                  preview={item.preview}
                   maxHeight={10000}
                   onDecide={(ok) => {
                     if (!ok) {
@@ -344,7 +343,7 @@ export default function ComponentPreview() {
             </div>
             <div className="full-body">
               <div style={{ borderRadius: 12, overflow: "hidden", border: "1px solid rgba(255,255,255,.1)" }}>
-                <IframePreview code={expandedItem._safeCode} maxHeight={20000} />
+                <IframePreview preview={expandedItem.preview} maxHeight={20000} />
               </div>
             </div>
           </div>